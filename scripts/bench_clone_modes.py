@@ -0,0 +1,95 @@
+"""
+Benchmark clone_repo history modes (shallow, treeless, full) on a synthetic repository.
+Builds a local repo with N commits (default 10,000) via git fast-import, serves it over
+file:// with partial-clone filters allowed, then reports wall time, .git size and the number
+of commits extract_git_history sees for each mode.
+
+Usage: uv run python scripts/bench_clone_modes.py [--commits 10000] [--files 50] [--blob-bytes 2048]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import shutil
+import string
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.tools.repo_tools import clone_repo, extract_git_history  # noqa: E402
+
+
+def build_synthetic_repo(path: Path, commits: int, files: int, blob_bytes: int) -> None:
+    """Create a repo where each commit rewrites one of `files` files with fresh content."""
+    subprocess.run(["git", "init", "-q", "-b", "main", str(path)], check=True)
+    rng = random.Random(42)
+    alphabet = string.ascii_letters + string.digits + " \n"
+    proc = subprocess.Popen(["git", "fast-import", "--quiet"], cwd=path, stdin=subprocess.PIPE)
+    assert proc.stdin is not None
+    ts = 1_700_000_000
+    for i in range(1, commits + 1):
+        content = "".join(rng.choices(alphabet, k=blob_bytes)).encode()
+        msg = f"commit {i}: update module_{i % files}.py".encode()
+        out = [
+            b"commit refs/heads/main\n",
+            f"mark :{i}\n".encode(),
+            f"committer Bench <bench@example.com> {ts + i * 60} +0000\n".encode(),
+            f"data {len(msg)}\n".encode(), msg, b"\n",
+        ]
+        if i > 1:
+            out.append(f"from :{i - 1}\n".encode())
+        out += [
+            f"M 100644 inline src/module_{i % files}.py\n".encode(),
+            f"data {len(content)}\n".encode(), content, b"\n",
+        ]
+        proc.stdin.write(b"".join(out))
+    proc.stdin.close()
+    if proc.wait() != 0:
+        raise RuntimeError("git fast-import failed")
+    subprocess.run(["git", "checkout", "-q", "main"], cwd=path, check=True)
+    subprocess.run(["git", "config", "uploadpack.allowFilter", "true"], cwd=path, check=True)
+    subprocess.run(["git", "gc", "-q"], cwd=path, check=True)
+
+
+def dir_size(path: Path) -> int:
+    return sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--commits", type=int, default=10_000)
+    parser.add_argument("--files", type=int, default=50)
+    parser.add_argument("--blob-bytes", type=int, default=2048)
+    args = parser.parse_args()
+
+    work = Path(tempfile.mkdtemp(prefix="automaton_auditor_bench_"))
+    try:
+        origin = work / "origin"
+        t0 = time.perf_counter()
+        build_synthetic_repo(origin, args.commits, args.files, args.blob_bytes)
+        print(f"Built synthetic repo: {args.commits} commits in {time.perf_counter() - t0:.1f}s "
+              f"(origin .git {dir_size(origin / '.git') / 1e6:.1f} MB)")
+        print(f"{'mode':<10} {'clone s':>9} {'.git MB':>9} {'history s':>10} {'commits':>8}")
+        for mode in ("shallow", "treeless", "full"):
+            t0 = time.perf_counter()
+            repo = clone_repo(origin.as_uri(), history=mode)
+            clone_s = time.perf_counter() - t0
+            t0 = time.perf_counter()
+            history = extract_git_history(repo)
+            history_s = time.perf_counter() - t0
+            size_mb = dir_size(Path(repo) / ".git") / 1e6
+            print(f"{mode:<10} {clone_s:>9.2f} {size_mb:>9.2f} {history_s:>10.2f} {len(history):>8}")
+            shutil.rmtree(repo, ignore_errors=True)
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    os.environ.setdefault("GIT_TERMINAL_PROMPT", "0")
+    main()
@@ -0,0 +1,200 @@
+"""
+Benchmark judging modes: per-criterion (one structured call per judge and criterion) against
+batched (one call per judge returning every criterion's opinion) on recorded evidence. Reports
+LLM calls, input/output tokens and judicial wall-clock time per mode (three personas in
+parallel, as in the audit graph), then score agreement between the modes per (judge, criterion).
+
+Evidence is recorded once by running the detective graph on a local checkout and PDF (--record,
+default: this repository and reports/final_report.pdf) and replayed from JSON with --evidence.
+With OPENAI_API_KEY set the real judge model is called and usage is read from the responses;
+otherwise (or with --offline) a simulated model estimates tokens locally and sleeps a latency
+model (--base-latency plus output tokens at --output-tps), so agreement is not measured.
+
+Usage: uv run python scripts/bench_judging.py [--record evidence.json] [--evidence evidence.json] [--runs 1]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.nodes import judges  # noqa: E402
+from src.state import Evidence, JudicialOpinion  # noqa: E402
+from src.tools.chunking import estimate_tokens  # noqa: E402
+
+_ROOT = Path(__file__).resolve().parent.parent
+_MODES = ("per_criterion", "batched")
+
+
+def record_evidence(path: Path, repo_path: str, pdf_path: str, rubric_path: str) -> None:
+    from src.graph import build_detective_graph, create_initial_state
+
+    state = create_initial_state(repo_url=repo_path, pdf_path=pdf_path, rubric_path=rubric_path, repo_path=repo_path)
+    final = build_detective_graph().compile().invoke(state)
+    payload = {
+        "rubric_path": state["rubric_path"],
+        "rubric_dimensions": state["rubric_dimensions"],
+        "evidences": {
+            dim_id: [e.model_dump() if isinstance(e, Evidence) else e for e in evs]
+            for dim_id, evs in final["evidences"].items()
+        },
+    }
+    path.write_text(json.dumps(payload, indent=1), encoding="utf-8")
+
+
+class Usage:
+    """Thread-safe call and token counters shared by every judge call of one mode."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.calls = self.input_tokens = self.output_tokens = 0
+
+    def add(self, input_tokens: int, output_tokens: int) -> None:
+        with self.lock:
+            self.calls += 1
+            self.input_tokens += input_tokens
+            self.output_tokens += output_tokens
+
+
+class RecordingLLM:
+    """Real structured-output model with include_raw=True; records usage_metadata, returns the parsed object."""
+
+    def __init__(self, schema, usage: Usage):
+        from langchain_openai import ChatOpenAI
+
+        llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.1)
+        self.runnable = llm.with_structured_output(schema, include_raw=True)
+        self.usage = usage
+
+    def invoke(self, messages):
+        return self._parsed(self.runnable.invoke(messages))
+
+    async def ainvoke(self, messages):
+        return self._parsed(await self.runnable.ainvoke(messages))
+
+    def _parsed(self, out):
+        meta = getattr(out["raw"], "usage_metadata", None) or {}
+        self.usage.add(meta.get("input_tokens", 0), meta.get("output_tokens", 0))
+        if out.get("parsing_error") is not None:
+            raise out["parsing_error"]
+        return out["parsed"]
+
+
+class SimulatedLLM:
+    """Offline stand-in: evidence-derived scores, locally estimated tokens, sleeps a latency model."""
+
+    def __init__(self, schema, usage: Usage, base_latency: float, output_tps: float):
+        self.schema, self.usage = schema, usage
+        self.base_latency, self.output_tps = base_latency, output_tps
+
+    def invoke(self, messages):
+        result, latency = self._respond(messages)
+        time.sleep(latency)
+        return result
+
+    async def ainvoke(self, messages):
+        import asyncio
+
+        result, latency = self._respond(messages)
+        await asyncio.sleep(latency)
+        return result
+
+    def _respond(self, messages) -> tuple[object, float]:
+        sections = messages[1].content.split("Criterion being evaluated — id: ")[1:]
+        opinions = [self._opinion(section) for section in sections]
+        result = opinions[0] if self.schema is JudicialOpinion else self.schema(opinions=opinions)
+        output_tokens = estimate_tokens(result.model_dump_json())
+        self.usage.add(sum(estimate_tokens(m.content) for m in messages), output_tokens)
+        return result, self.base_latency + output_tokens / self.output_tps
+
+    @staticmethod
+    def _opinion(section: str) -> JudicialOpinion:
+        criterion = section.split(",")[0]
+        found = section.count("found=True")
+        score = max(1, min(5, 1 + 2 * found))
+        argument = f"{found} supporting evidence item(s) for {criterion}; " + "rationale " * 60
+        return JudicialOpinion(judge="Defense", criterion_id=criterion, score=score, argument=argument,
+                               cited_evidence=[f"[{i + 1}]" for i in range(found)])
+
+
+def judge_all(state: dict, mode: str, make_llm) -> tuple[list[JudicialOpinion], float, Usage]:
+    """All three personas in parallel (as the graph runs them) in one mode; returns opinions, seconds, usage."""
+    usage = Usage()
+    os.environ["AUDITOR_JUDGE_MODE"] = mode
+    judges._get_llm = lambda schema=JudicialOpinion: make_llm(schema, usage)
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(judges.JUDGE_PERSONAS)) as pool:
+        results = list(pool.map(lambda item: judges._run_judge_node(state, *item), judges.JUDGE_PERSONAS.items()))
+    elapsed = time.perf_counter() - t0
+    return [o for r in results for o in r["opinions"]], elapsed, usage
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--evidence", type=Path, help="recorded evidence JSON to replay")
+    parser.add_argument("--record", type=Path, help="record evidence to this JSON (then benchmark it)")
+    parser.add_argument("--repo", default=str(_ROOT), help="local repository to record evidence from")
+    parser.add_argument("--pdf", default=str(_ROOT / "reports" / "final_report.pdf"))
+    parser.add_argument("--rubric", default=str(_ROOT / "rubric.json"))
+    parser.add_argument("--runs", type=int, default=1, help="runs per mode (median time, summed tokens / runs)")
+    parser.add_argument("--offline", action="store_true", help="simulated model even when OPENAI_API_KEY is set")
+    parser.add_argument("--base-latency", type=float, default=0.4, help="simulated seconds per call")
+    parser.add_argument("--output-tps", type=float, default=150.0, help="simulated output tokens per second")
+    args = parser.parse_args()
+
+    evidence_path = args.evidence
+    if evidence_path is None or args.record:
+        evidence_path = args.record or Path(tempfile.mkdtemp()) / "evidence.json"
+        record_evidence(evidence_path, args.repo, args.pdf, args.rubric)
+        print(f"recorded evidence: {evidence_path}")
+    recorded = json.loads(evidence_path.read_text(encoding="utf-8"))
+    state = {
+        "rubric_path": recorded["rubric_path"],
+        "rubric_dimensions": recorded["rubric_dimensions"],
+        "evidences": {k: [Evidence(**e) for e in v] for k, v in recorded["evidences"].items()},
+    }
+
+    offline = args.offline or not os.environ.get("OPENAI_API_KEY")
+    if offline:
+        def make_llm(schema, usage):
+            return SimulatedLLM(schema, usage, args.base_latency, args.output_tps)
+    else:
+        make_llm = RecordingLLM
+
+    dims = len(state["rubric_dimensions"])
+    print(f"{dims} criteria x {len(judges.JUDGE_PERSONAS)} judges, {'simulated' if offline else 'gpt-4o-mini'} model")
+    print(f"{'mode':>14} {'calls':>6} {'in tok':>8} {'out tok':>8} {'time s':>7}")
+    scores: dict[str, dict[tuple[str, str], int]] = {}
+    for mode in _MODES:
+        times, totals = [], [0, 0, 0]
+        for _ in range(args.runs):
+            opinions, elapsed, usage = judge_all(state, mode, make_llm)
+            times.append(elapsed)
+            totals = [totals[0] + usage.calls, totals[1] + usage.input_tokens, totals[2] + usage.output_tokens]
+        scores[mode] = {(o.judge, o.criterion_id): o.score for o in opinions}
+        calls, tok_in, tok_out = (t // args.runs for t in totals)
+        print(f"{mode:>14} {calls:>6} {tok_in:>8} {tok_out:>8} {statistics.median(times):>7.2f}")
+
+    if offline:
+        print("agreement: n/a (simulated model scores are mode-independent; set OPENAI_API_KEY to measure)")
+        return
+    keys = sorted(scores["per_criterion"])
+    diffs = [abs(scores["per_criterion"][k] - scores["batched"].get(k, 0)) for k in keys]
+    exact = sum(d == 0 for d in diffs) / len(diffs)
+    within_one = sum(d <= 1 for d in diffs) / len(diffs)
+    print(f"agreement over {len(keys)} (judge, criterion) scores: exact {exact:.0%}, within 1 {within_one:.0%}, "
+          f"mean |diff| {statistics.mean(diffs):.2f}")
+
+
+if __name__ == "__main__":
+    main()
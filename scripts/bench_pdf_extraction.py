@@ -0,0 +1,63 @@
+"""
+Benchmark PDF text extraction scaling: ingest_pdf over synthetic text PDFs of --pages page
+counts, extracting serially (workers=1) and across process pools of --workers sizes. Each run
+bypasses the artifact cache and text store so every cell pays the full extraction; reports wall
+time and the speedup over serial per page count.
+
+Usage: uv run python scripts/bench_pdf_extraction.py [--pages 64 256 1024] [--workers 1 2 4 8]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.tools import doc_tools  # noqa: E402
+from tests.fixtures.text_pdf import write_text_pdf  # noqa: E402
+
+
+def synthetic_pages(pages: int, words_per_page: int = 450, seed: int = 7) -> list[str]:
+    rng = random.Random(seed)
+    vocab = [f"w{i:05d}" for i in range(5_000)]
+    return [" ".join(rng.choices(vocab, k=words_per_page)) for _ in range(pages)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--pages", type=int, nargs="+", default=[64, 256, 1024])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--repeat", type=int, default=1, help="best of N runs per cell")
+    args = parser.parse_args()
+
+    # Measure extraction itself, not artifact-cache or text-store hits
+    doc_tools.default_pdf_cache = lambda: None
+    doc_tools.default_pdf_text_store = lambda: None
+    header = f"{'pages':>6} " + " ".join(f"{f'w={w} s':>9}" for w in args.workers)
+    print(header + "  " + " ".join(f"{f'x w={w}':>7}" for w in args.workers))
+    with tempfile.TemporaryDirectory() as tmp:
+        for pages in args.pages:
+            pdf = write_text_pdf(Path(tmp) / f"report_{pages}.pdf", synthetic_pages(pages))
+            times = []
+            for workers in args.workers:
+                best = float("inf")
+                for _ in range(args.repeat):
+                    t0 = time.perf_counter()
+                    doc_tools.ingest_pdf(pdf, chunk_by="page", workers=workers)
+                    best = min(best, time.perf_counter() - t0)
+                times.append(best)
+            serial = times[0]
+            cells = " ".join(f"{t:>9.2f}" for t in times)
+            speedups = " ".join(f"{serial / t:>7.1f}" for t in times)
+            print(f"{pages:>6} {cells}  {speedups}")
+    print(f"(pools start only at >= {doc_tools._PARALLEL_MIN_PAGES} pages, "
+          f"{doc_tools._PAGES_PER_TASK_MIN}+ pages per worker; speedups relative to the first --workers value)")
+
+
+if __name__ == "__main__":
+    main()
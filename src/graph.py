@@ -1,6 +1,7 @@
 """
 StateGraph: START → parallel detectives → EvidenceAggregator → [optional] parallel Judges → END.
-Phase 2: Detective layer only. Phase 3: + Judges (Prosecutor, Defense, Tech Lead).
+Phase 2: Detective layer only. Phase 3: + Judges (Prosecutor, Defense, Tech Lead), mapped to one
+Send task per (judge persona, dimension) and reduced into opinions by merge_opinions.
 """
 
 from __future__ import annotations
@@ -9,17 +10,28 @@ import json
 from pathlib import Path
 
 from langgraph.graph import END, START, StateGraph
+from langgraph.types import RetryPolicy, Send
 
 from src.state import AgentState
 from src.nodes.detectives import doc_analyst_node, repo_investigator_node, vision_inspector_node
-from src.nodes.judges import defense_node, prosecutor_node, tech_lead_node
+from src.nodes.judges import (
+    JUDGE_NODE_ATTEMPTS,
+    judge_batch_node,
+    judge_batch_tasks,
+    judge_concurrency,
+    judge_criterion_node,
+    judge_mode,
+    judge_tasks,
+)
 from src.nodes.justice import (
     chief_justice_node,
     degraded_report_node,
     evidence_aggregator_node,
     is_critical_failure,
     judge_collector_node,
+    llm_stats_snapshot,
 )
+from src.tools.llm_scheduler import is_retryable
 
 
 def load_rubric_dimensions(rubric_path: str | None = None) -> list[dict]:
@@ -78,10 +90,29 @@ def _judicial_entry_node(state: AgentState) -> dict:
     return {}
 
 
+def _fan_out_judges(state: AgentState) -> list[Send] | str:
+    """
+    Map step: one judge_criterion task per (judge persona, dimension), so LangGraph runs, retries and
+    traces each judgment separately; AUDITOR_JUDGE_MODE=batched sends one judge_batch task per persona
+    instead. With no dimensions, go straight to judge_collector.
+    """
+    if not state.get("rubric_dimensions"):
+        return "judge_collector"
+    if judge_mode() == "batched":
+        return [Send("judge_batch", task) for task in judge_batch_tasks(state)]
+    return [Send("judge_criterion", task) for task in judge_tasks(state)]
+
+
+def audit_run_config() -> dict:
+    """Run config for the audit graph: at most AUDITOR_JUDGE_CONCURRENCY tasks (judge calls) at once."""
+    return {"max_concurrency": judge_concurrency()}
+
+
 def build_audit_graph() -> StateGraph:
     """
     Build StateGraph: detectives → EvidenceAggregator → [conditional]
     → either degraded_report → END (error path) or judicial_entry → Judges → judge_collector → ChiefJustice → END.
+    Judges: judge_criterion per (persona, dimension) via Send; opinions merged by merge_opinions.
     """
     builder = StateGraph(AgentState)
 
@@ -91,9 +122,10 @@ def build_audit_graph() -> StateGraph:
     builder.add_node("evidence_aggregator", evidence_aggregator_node)
     builder.add_node("degraded_report", degraded_report_node)
     builder.add_node("judicial_entry", _judicial_entry_node)
-    builder.add_node("prosecutor", prosecutor_node)
-    builder.add_node("defense", defense_node)
-    builder.add_node("tech_lead", tech_lead_node)
+    # Per-task retries for transient LLM errors the scheduler gave up on; the final attempt falls back in-task
+    judge_retry = RetryPolicy(max_attempts=JUDGE_NODE_ATTEMPTS, retry_on=is_retryable)
+    builder.add_node("judge_criterion", judge_criterion_node, retry_policy=judge_retry)
+    builder.add_node("judge_batch", judge_batch_node, retry_policy=judge_retry)
     builder.add_node("judge_collector", judge_collector_node)
     builder.add_node("chief_justice", chief_justice_node)
 
@@ -113,13 +145,11 @@ def build_audit_graph() -> StateGraph:
     )
     builder.add_edge("degraded_report", END)
 
-    builder.add_edge("judicial_entry", "prosecutor")
-    builder.add_edge("judicial_entry", "defense")
-    builder.add_edge("judicial_entry", "tech_lead")
-
-    builder.add_edge("prosecutor", "judge_collector")
-    builder.add_edge("defense", "judge_collector")
-    builder.add_edge("tech_lead", "judge_collector")
+    builder.add_conditional_edges(
+        "judicial_entry", _fan_out_judges, ["judge_criterion", "judge_batch", "judge_collector"]
+    )
+    builder.add_edge("judge_criterion", "judge_collector")
+    builder.add_edge("judge_batch", "judge_collector")
     builder.add_edge("judge_collector", "chief_justice")
     builder.add_edge("chief_justice", END)
 
@@ -133,7 +163,8 @@ def create_initial_state(
     repo_path: str | None = None,
 ) -> AgentState:
     """Build initial AgentState for the graph. pdf_path may be empty for repo-only audit.
-    When repo_path is set (e.g. pre-cloned for default PDF), RepoInvestigator will reuse it."""
+    When repo_path is set (e.g. pre-cloned for default PDF), RepoInvestigator will reuse it.
+    The LLM counters are snapshotted here so the report's run metadata covers this audit only."""
     default_rubric = "rubric.json"
     path = Path(rubric_path or default_rubric)
     dimensions = load_rubric_dimensions(rubric_path)
@@ -145,6 +176,7 @@ def create_initial_state(
         "evidences": {},
         "opinions": [],
         "final_report": None,
+        "llm_stats_baseline": llm_stats_snapshot(),
     }
     if repo_path:
         state["repo_path"] = repo_path
@@ -10,22 +10,30 @@ from pathlib import Path
 from typing import Any
 
 from src.state import AgentState, Evidence
+from src.tools.diagram_ranking import rank_diagram_candidates, vision_top_k
 from src.tools.doc_tools import (
     PDFParseError,
     analyze_diagram,
-    extract_images_from_pdf,
     ingest_pdf,
-    query_doc,
+    iter_pdf_image_refs,
+    query_doc_batch,
 )
+from src.tools.git_session import GitSession
+from src.tools.repo_cache import default_repo_cache
 from src.tools.repo_tools import (
     RepoCloneError,
-    analyze_graph_structure,
-    analyze_state_schema,
+    analyze_repo,
+    clone_options,
     clone_repo,
+    default_analysis_cache,
     extract_git_history,
     list_repo_files,
 )
 
+# DocAnalyst excerpt budget per dimension: whole structure-aware chunks while they fit
+# (the former cut was 2000 characters, ~500 tokens, often mid-sentence)
+_EXCERPT_TOKENS = 512
+
 
 def _repo_dimensions(state: AgentState) -> list[dict[str, Any]]:
     dims = state.get("rubric_dimensions") or []
@@ -60,16 +68,27 @@ def repo_investigator_node(state: AgentState) -> dict[str, Any]:
     git_history: list[dict] = []
     graph_struct: dict[str, Any] = {}
     state_schema: dict[str, Any] = {}
+    security: dict[str, Any] = {"modules_scanned": 0, "findings": [], "subprocess_calls": 0}
     repo_file_list: list[str] = []
 
-    if repo_url:
+    # A pre-cloned repo_path is analyzed even without a repo_url (nothing to clone then)
+    if repo_url or repo_path:
         try:
             if repo_path is None:
-                repo_path = clone_repo(repo_url)
-            git_history = extract_git_history(repo_path) if repo_path else []
-            graph_struct = analyze_graph_structure(repo_path) if repo_path else {}
-            state_schema = analyze_state_schema(repo_path) if repo_path else {}
-            repo_file_list = list_repo_files(repo_path) if repo_path else []
+                options = clone_options(state.get("rubric_dimensions") or [])
+                repo_path = clone_repo(repo_url, cache=default_repo_cache(), **options)
+            # One git session answers every metadata query and blob read for this repo
+            with GitSession(repo_path) as session:
+                git_history = extract_git_history(repo_path, session=session)
+                repo_file_list = list_repo_files(repo_path, session=session)
+                # Keyed by git blob shas: an unchanged repo is answered from the analysis cache without
+                # reading or parsing any file; on a miss every .py file is parsed once into a shared index
+                analysis = analyze_repo(
+                    repo_path, session=session, files=repo_file_list, cache=default_analysis_cache()
+                )
+                graph_struct = analysis["graph_structure"]
+                state_schema = analysis["state_schema"]
+                security = analysis["security"]
         except RepoCloneError as e:
             for d in dimensions:
                 dim_id = d.get("id", "unknown")
@@ -77,7 +96,7 @@ def repo_investigator_node(state: AgentState) -> dict[str, Any]:
                     Evidence(
                         goal=d.get("forensic_instruction", ""),
                         found=False,
-                        location=repo_url,
+                        location=repo_url or repo_path or "(no url)",
                         rationale=str(e),
                         confidence=0.0,
                     )
@@ -126,13 +145,13 @@ def repo_investigator_node(state: AgentState) -> dict[str, Any]:
             has_parallel = graph_struct.get("has_parallelism", False)
             reducers = graph_struct.get("reducers_used", False)
             wiring = graph_struct.get("wiring_summary") or ""
-            content = f"AST-based: nodes={graph_struct.get('nodes', [])}, edges={graph_struct.get('edges', [])}, has_parallelism={has_parallel}, reducers_used={reducers}. Wiring: {wiring}"
+            content = f"AST-based: files={graph_struct.get('graph_files', [])}, nodes={graph_struct.get('nodes', [])}, edges={graph_struct.get('edges', [])}, has_parallelism={has_parallel}, reducers_used={reducers}. Wiring: {wiring}"
             dim_evidences.append(
                 Evidence(
                     goal=goal,
                     found=found,
                     content=content,
-                    location=f"{repo_path}/src/graph.py",
+                    location=f"{repo_path}/{(graph_struct.get('graph_files') or ['src/graph.py'])[0]}",
                     rationale=success if found else (graph_struct.get("error") or failure),
                     confidence=0.85 if found else 0.2,
                 )
@@ -194,15 +213,25 @@ def repo_investigator_node(state: AgentState) -> dict[str, Any]:
                     confidence=confidence,
                 )
             )
-        # safe_tool_engineering: explicit rationale for auditor (TOOL-2)
+        # safe_tool_engineering: AST scan of every module for shell/code-execution calls (TOOL-2)
         elif dim_id == "safe_tool_engineering" and repo_path:
+            findings = security["findings"]
+            scanned = security["modules_scanned"]
+            if findings:
+                listed = "; ".join(f"{f['call']} ({f['issue']}) at {f['path']}:{f['line']}" for f in findings[:10])
+                content = f"AST scan of {scanned} modules: {len(findings)} unsafe call(s): {listed}"
+            else:
+                content = (
+                    f"AST scan of {scanned} modules: no shell-executing or code-executing calls; "
+                    f"subprocess calls: {security['subprocess_calls']}."
+                )
             dim_evidences.append(
                 Evidence(
                     goal=goal,
-                    found=True,
-                    content="Clone uses tempfile.mkdtemp(); subprocess.run for git clone; no os.system with user input.",
+                    found=not findings,
+                    content=content,
                     location=repo_path,
-                    rationale="Sandboxed clone in temp dir; subprocess.run only; no os.system with user input.",
+                    rationale=success if not findings else failure,
                     confidence=0.9,
                 )
             )
@@ -229,7 +258,8 @@ def repo_investigator_node(state: AgentState) -> dict[str, Any]:
 
 def doc_analyst_node(state: AgentState) -> dict[str, Any]:
     """
-    Filter by target_artifact == "pdf_report"; ingest_pdf, query_doc; return {"evidences": {...}}.
+    Filter by target_artifact == "pdf_report"; ingest_pdf (structure chunks), query_doc_batch under a
+    token budget; return {"evidences": {...}}.
     """
     dimensions = _pdf_report_dimensions(state)
     if not dimensions:
@@ -252,7 +282,7 @@ def doc_analyst_node(state: AgentState) -> dict[str, Any]:
         return {"evidences": evidences}
 
     try:
-        store = ingest_pdf(pdf_path)
+        store = ingest_pdf(pdf_path, chunk_by="structure")
     except (FileNotFoundError, PDFParseError) as e:
         for d in dimensions:
             evidences[d.get("id", "unknown")] = [
@@ -266,19 +296,21 @@ def doc_analyst_node(state: AgentState) -> dict[str, Any]:
             ]
         return {"evidences": evidences}
 
-    for dim in dimensions:
+    # Dimension-specific questions, answered together in one retrieval pass
+    questions = [
+        (d.get("forensic_instruction") or "").split(".")[0] or "What is the main topic?" for d in dimensions
+    ]
+    excerpts = query_doc_batch(store, questions, max_tokens=_EXCERPT_TOKENS)
+    for dim, excerpt in zip(dimensions, excerpts):
         dim_id = dim.get("id", "unknown")
         goal = dim.get("forensic_instruction", "")
         success = dim.get("success_pattern", "")
-        # Query using dimension-specific question
-        question = goal.split(".")[0] if goal else "What is the main topic?"
-        excerpt = query_doc(store, question)
         found = bool(excerpt and "No relevant" not in excerpt)
         evidences[dim_id] = [
             Evidence(
                 goal=goal,
                 found=found,
-                content=excerpt[:2000] if excerpt else None,
+                content=excerpt or None,
                 location=pdf_path,
                 rationale=success if found else "No or limited relevant content.",
                 confidence=0.8 if found else 0.3,
@@ -290,8 +322,9 @@ def doc_analyst_node(state: AgentState) -> dict[str, Any]:
 
 def vision_inspector_node(state: AgentState) -> dict[str, Any]:
     """
-    Filter by target_artifact == "pdf_images"; extract_images_from_pdf, analyze_diagram;
-    return {"evidences": {...}}. Execution optional (stub when no vision key).
+    Filter by target_artifact == "pdf_images"; iter_pdf_image_refs (no decode; icons skipped), rank them locally
+    for diagram-likeness and analyze_diagram only the top AUDITOR_VISION_TOP_K (once each, shared by all
+    dimensions); return {"evidences": {...}}. Execution optional (stub when no vision key).
     """
     dimensions = _pdf_images_dimensions(state)
     if not dimensions:
@@ -313,21 +346,25 @@ def vision_inspector_node(state: AgentState) -> dict[str, Any]:
             ]
         return {"evidences": evidences}
 
-    images = extract_images_from_pdf(pdf_path)
+    candidates = rank_diagram_candidates(iter_pdf_image_refs(pdf_path), top_k=vision_top_k())
     question = "Describe the diagram flow: parallel branches, aggregation, or linear pipeline?"
+    analyses = [
+        f"[Page {c.image.page_no} image, diagram score {c.score:.2f}] {analyze_diagram(c.image, question)}"
+        for c in candidates
+    ]
+    analysis = "\n\n".join(analyses)
 
     for dim in dimensions:
         dim_id = dim.get("id", "unknown")
         goal = dim.get("forensic_instruction", "")
-        if images:
-            analysis = analyze_diagram(images[0], question)
+        if candidates:
             evidences[dim_id] = [
                 Evidence(
                     goal=goal,
                     found=True,
                     content=analysis[:2000] if analysis else None,
                     location=pdf_path,
-                    rationale="Image extracted and analyzed.",
+                    rationale=f"{len(candidates)} most diagram-like image(s) extracted and analyzed.",
                     confidence=0.7,
                 )
             ]
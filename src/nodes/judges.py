@@ -2,22 +2,54 @@
 Judicial layer: Prosecutor, Defense, Tech Lead. Each returns {"opinions": [JudicialOpinion, ...]}.
 Uses .with_structured_output(JudicialOpinion); distinct prompts per persona. API Contracts §4, §7.
 Retry/error-handling for malformed LLM output; criterion-aware prompts with rubric metadata.
+Criteria are judged concurrently per judge node (ainvoke under a bounded semaphore). The audit graph
+instead maps judge_tasks to one judge_criterion_node task per (persona, dimension) via LangGraph Send.
+AUDITOR_JUDGE_MODE=batched judges all criteria of a persona in one call (judge_batch_node), re-judging
+only the criteria missing from or invalid in the batch response one by one. Successful responses are
+served from / stored in the persistent LLM response cache (src/tools/llm_cache.py). Every model call
+goes through the process-wide LLM scheduler (src/tools/llm_scheduler.py): RPM/TPM budgets and backoff
+on transient errors; the local retries here only re-ask after malformed output.
 """
 
 from __future__ import annotations
 
+import asyncio
+import inspect
 import logging
 import os
-from typing import Any, Literal
+import threading
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Literal, Optional, TypedDict
 
-from pydantic import ValidationError
+from langchain_core.runnables import RunnableConfig
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
 
 from src.state import AgentState, Evidence, JudicialOpinion
+from src.tools.llm_cache import get_cached_response, llm_cache_key, put_cached_response
+from src.tools.llm_scheduler import (
+    DEFAULT_OUTPUT_TOKENS,
+    default_llm_scheduler,
+    estimate_request_tokens,
+    is_retryable,
+)
 
 logger = logging.getLogger(__name__)
 
 _JUDGE = Literal["Prosecutor", "Defense", "TechLead"]
 
+JUDGE_MODEL = "gpt-4o-mini"
+# Lower temperature for more consistent scores across runs (VAR-1)
+JUDGE_TEMPERATURE = 0.1
+# Criteria in flight per judge node: a 10-criterion rubric is judged in one round of calls
+DEFAULT_JUDGE_CONCURRENCY = 10
+_MAX_ATTEMPTS = 3
+# Graph attempts per judge task (RetryPolicy on transient errors; the last attempt falls back instead)
+JUDGE_NODE_ATTEMPTS = 3
+# "per_criterion": one call per (judge, criterion); "batched": one call per judge for all criteria
+JUDGE_MODES = ("per_criterion", "batched")
+
 _PROSECUTOR_SYSTEM = """You are the Prosecutor in a technical audit. Your philosophy: "Trust No One. Assume Vibe Coding."
 Scrutinize the evidence for gaps, security flaws, and laziness.
 - Prefer score 1-2 when evidence is missing, contradictory, or shows serious flaws (e.g. linear pipeline, no reducers, os.system with user input).
@@ -40,17 +72,62 @@ Score scale: 1 = Vibe Coder, 3 = Competent, 5 = Master Thinker.
 You must respond with a valid JudicialOpinion: judge="TechLead", criterion_id, score (1-5), argument, cited_evidence (list of short strings referencing the evidence)."""
 
 
-def _get_llm():
-    """Return chat model with structured output binding. Uses OPENAI_API_KEY."""
+JUDGE_PERSONAS: dict[_JUDGE, str] = {
+    "Prosecutor": _PROSECUTOR_SYSTEM,
+    "Defense": _DEFENSE_SYSTEM,
+    "TechLead": _TECH_LEAD_SYSTEM,
+}
+
+
+class JudgeTask(TypedDict):
+    """One (judge persona, rubric dimension) unit of judging; the payload of a judge_criterion Send."""
+
+    judge: _JUDGE
+    dimension: dict[str, Any]
+    evidences: list[Evidence]
+    synthesis_rules: dict[str, str]
+
+
+class JudgeBatchTask(TypedDict):
+    """All dimensions for one judge persona (batched mode); the payload of a judge_batch Send."""
+
+    judge: _JUDGE
+    dimensions: list[dict[str, Any]]
+    evidences: dict[str, list[Evidence]]
+    synthesis_rules: dict[str, str]
+
+
+class BatchOpinionItem(BaseModel):
+    """
+    One criterion of a batched judge response: JudicialOpinion's fields with loose types and no bounds,
+    so a single malformed item cannot fail the whole batch; _batch_opinions validates each item on its own.
+    """
+
+    model_config = ConfigDict(from_attributes=True)
+
+    criterion_id: str | None = Field(None, description="Criterion id, exactly as given")
+    score: int | float | str | None = Field(None, description="Integer score from 1 to 5")
+    argument: str | None = Field(None, description="Reasoning for the score")
+    cited_evidence: list[str] | str | None = Field(None, description="Cited evidence references, e.g. [1]")
+
+
+class JudicialOpinionBatch(BaseModel):
+    """Structured output of a batched judge call: one opinion per criterion."""
+
+    opinions: list[BatchOpinionItem]
+
+
+def _get_llm(schema: type[BaseModel] = JudicialOpinion):
+    """Return chat model with structured output binding (JudicialOpinion, or a batch schema). Uses OPENAI_API_KEY."""
     try:
         from langchain_openai import ChatOpenAI
     except ImportError:
         raise RuntimeError("Install langchain-openai for Judge nodes (pip install langchain-openai)")
     if not os.environ.get("OPENAI_API_KEY"):
         raise RuntimeError("Set OPENAI_API_KEY for Judge nodes")
-    # Lower temperature for more consistent scores across runs (VAR-1)
-    llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.1)
-    return llm.with_structured_output(JudicialOpinion)
+    # Transient errors are retried by the LLM scheduler (backoff, Retry-After), not the client
+    llm = ChatOpenAI(model=JUDGE_MODEL, temperature=JUDGE_TEMPERATURE, max_retries=0)
+    return llm.with_structured_output(schema)
 
 
 def _evidence_summary(evidences: list[Evidence]) -> str:
@@ -82,17 +159,12 @@ def _synthesis_hint_for_dimension(dimension: dict[str, Any], synthesis_rules: di
     return ""
 
 
-def _invoke_judge_for_dimension(
+def _criterion_prompt(
     dimension: dict[str, Any],
     evidence_list: list[Evidence],
-    judge_name: _JUDGE,
-    system_prompt: str,
     synthesis_rules: dict[str, str] | None = None,
-) -> JudicialOpinion:
-    """
-    Call LLM for one dimension with retry/error-handling. Returns JudicialOpinion; on parse
-    failure after retries returns a fallback opinion so the dimension remains criterion-aware.
-    """
+) -> str:
+    """Prompt section for one criterion: rubric metadata, levels and evidence summary."""
     dim_id = dimension.get("id", "unknown")
     dim_name = dimension.get("name", dim_id)
     forensic = dimension.get("forensic_instruction", "")
@@ -112,7 +184,7 @@ def _invoke_judge_for_dimension(
             level_instruction += f"- Score {score_val}: {lev.get('name', lev.get('id', ''))} ({lev.get('points', 0)} pts) — {lev.get('description', '')[:200]}\n"
         level_instruction += "Provide your opinion: score (1-4 for 4 levels, where 4=best), argument, and cited_evidence.\n\n"
 
-    user_content = f"""Criterion being evaluated — id: {dim_id}, name: {dim_name}
+    return f"""Criterion being evaluated — id: {dim_id}, name: {dim_name}
 Forensic instruction: {forensic}
 Success pattern: {success}
 Failure pattern: {failure}
@@ -120,43 +192,247 @@ Failure pattern: {failure}
 
 {level_instruction}
 Evidence collected:
-{evidence_text}
+{evidence_text}"""
+
+
+def _judge_messages(
+    dimension: dict[str, Any],
+    evidence_list: list[Evidence],
+    system_prompt: str,
+    synthesis_rules: dict[str, str] | None = None,
+) -> list[Any]:
+    """System + user messages for one criterion."""
+    user_content = f"""{_criterion_prompt(dimension, evidence_list, synthesis_rules)}
 
 Provide your opinion for this criterion only: score (1-5), argument, and cited_evidence (reference the evidence items above)."""
 
     from langchain_core.messages import HumanMessage, SystemMessage
 
+    return [SystemMessage(content=system_prompt), HumanMessage(content=user_content)]
+
+
+def _batch_messages(
+    dimensions: list[dict[str, Any]],
+    evidences: dict[str, list[Evidence]],
+    judge_name: _JUDGE,
+    system_prompt: str,
+    synthesis_rules: dict[str, str] | None = None,
+) -> list[Any]:
+    """System prompt once + one user message with every criterion's section (batched mode)."""
+    ids = [d.get("id", "unknown") for d in dimensions]
+    sections = [
+        f"=== Criterion {i} of {len(dimensions)} ===\n"
+        f"{_criterion_prompt(dim, evidences.get(dim_id, []), synthesis_rules)}"
+        for i, (dim, dim_id) in enumerate(zip(dimensions, ids), 1)
+    ]
+    user_content = (
+        f"You are judging {len(dimensions)} criteria. Judge each one independently, on its own evidence only.\n\n"
+        + "\n\n".join(sections)
+        + f"""
+
+Return exactly one opinion per criterion, with criterion_id set to each of: {", ".join(ids)}.
+Each opinion: judge="{judge_name}", criterion_id, score (1-5), argument, and cited_evidence (reference that criterion's evidence items)."""
+    )
+
+    from langchain_core.messages import HumanMessage, SystemMessage
+
+    return [SystemMessage(content=system_prompt), HumanMessage(content=user_content)]
+
+
+def _coerce_opinion(opinion: Any, judge_name: _JUDGE, dim_id: str) -> JudicialOpinion:
+    """Pin judge and criterion, clamp the score; raises ValueError when the LLM returned something else."""
+    if not isinstance(opinion, JudicialOpinion):
+        raise ValueError("LLM did not return JudicialOpinion")
+    return JudicialOpinion(
+        judge=judge_name,
+        criterion_id=dim_id,
+        score=max(1, min(5, opinion.score)),
+        argument=opinion.argument or "",
+        cited_evidence=opinion.cited_evidence if isinstance(opinion.cited_evidence, list) else [],
+    )
+
+
+def _fallback_opinion(
+    judge_name: _JUDGE, dim_id: str, last_error: Exception | None, attempts: int
+) -> JudicialOpinion:
+    """Fallback: valid JudicialOpinion so dimension is not dropped; Chief Justice can still synthesize."""
+    tries = f"{attempts} attempt{'s' if attempts != 1 else ''}"
+    return JudicialOpinion(
+        judge=judge_name,
+        criterion_id=dim_id,
+        score=3,
+        argument=f"No valid opinion after {tries}; neutral score. Last error: {last_error!s}"[:500],
+        cited_evidence=[],
+    )
+
+
+def _log_attempt_error(judge_name: _JUDGE, dim_id: str, attempt: int, e: Exception) -> None:
+    if isinstance(e, ValidationError):
+        logger.warning("Judge %s criterion %s attempt %s: ValidationError %s", judge_name, dim_id, attempt + 1, e)
+    else:
+        logger.warning("Judge %s criterion %s attempt %s: %s", judge_name, dim_id, attempt + 1, e)
+
+
+def _invoke_judge_for_dimension(
+    dimension: dict[str, Any],
+    evidence_list: list[Evidence],
+    judge_name: _JUDGE,
+    system_prompt: str,
+    synthesis_rules: dict[str, str] | None = None,
+    raise_transient: bool = False,
+    prior_attempts: int = 0,
+) -> JudicialOpinion:
+    """
+    Call LLM for one dimension with retry/error-handling. Returns JudicialOpinion; on parse
+    failure after retries returns a fallback opinion so the dimension remains criterion-aware.
+    raise_transient: re-raise transient errors the scheduler gave up on (the graph retries the task)
+    instead of falling back. prior_attempts: failed graph attempts of this task, reported by the fallback.
+    """
+    dim_id = dimension.get("id", "unknown")
+    messages = _judge_messages(dimension, evidence_list, system_prompt, synthesis_rules)
+    key = llm_cache_key(JUDGE_MODEL, JUDGE_TEMPERATURE, messages, JudicialOpinion)
+    cached = get_cached_response(key, JudicialOpinion)
+    if cached is not None:
+        return _coerce_opinion(cached, judge_name, dim_id)
     llm = _get_llm()
-    messages = [SystemMessage(content=system_prompt), HumanMessage(content=user_content)]
-    max_attempts = 3
+    scheduler, tokens = default_llm_scheduler(), estimate_request_tokens(messages)
     last_error: Exception | None = None
-    for attempt in range(max_attempts):
+    attempts = prior_attempts
+    for attempt in range(_MAX_ATTEMPTS):
+        attempts += 1
         try:
-            opinion = llm.invoke(messages)
-            if not isinstance(opinion, JudicialOpinion):
-                last_error = ValueError("LLM did not return JudicialOpinion")
-                continue
-            return JudicialOpinion(
+            opinion = _coerce_opinion(scheduler.call(lambda: llm.invoke(messages), tokens), judge_name, dim_id)
+            put_cached_response(key, opinion)
+            return opinion
+        except Exception as e:
+            last_error = e
+            _log_attempt_error(judge_name, dim_id, attempt, e)
+            if is_retryable(e):
+                if raise_transient:
+                    raise
+                break  # the scheduler already backed off and retried it
+    return _fallback_opinion(judge_name, dim_id, last_error, attempts)
+
+
+def _invoke_judge_batch(
+    dimensions: list[dict[str, Any]],
+    evidences: dict[str, list[Evidence]],
+    judge_name: _JUDGE,
+    system_prompt: str,
+    synthesis_rules: dict[str, str] | None = None,
+    raise_transient: bool = False,
+    prior_attempts: int = 0,
+) -> list[JudicialOpinion]:
+    """
+    One structured call for all dimensions (batched mode), opinions in dimension order. Criteria whose
+    opinion is missing, duplicated or empty in the batch response (or all, when the call fails) are
+    judged again with per-criterion calls. raise_transient, prior_attempts: as in _invoke_judge_for_dimension.
+    """
+    ids = [d.get("id", "unknown") for d in dimensions]
+    judged: dict[str, JudicialOpinion] = {}
+    messages = _batch_messages(dimensions, evidences, judge_name, system_prompt, synthesis_rules)
+    key = llm_cache_key(JUDGE_MODEL, JUDGE_TEMPERATURE, messages, JudicialOpinionBatch)
+    try:
+        batch = get_cached_response(key, JudicialOpinionBatch)
+        if batch is None:
+            llm = _get_llm(JudicialOpinionBatch)
+            batch = default_llm_scheduler().call(
+                lambda: llm.invoke(messages), estimate_request_tokens(messages, len(ids) * DEFAULT_OUTPUT_TOKENS)
+            )
+            if isinstance(batch, JudicialOpinionBatch):
+                put_cached_response(key, batch)
+        judged = _batch_opinions(batch, judge_name, ids)
+    except Exception as e:
+        if raise_transient and is_retryable(e):
+            raise
+        logger.warning("Judge %s batch of %s criteria: %s", judge_name, len(ids), e)
+    missing = [dim_id for dim_id in ids if dim_id not in judged]
+    if missing:
+        logger.warning("Judge %s batch: per-criterion fallback for %s", judge_name, ", ".join(missing))
+    return [
+        judged.get(dim_id)
+        or _invoke_judge_for_dimension(
+            dim, evidences.get(dim_id, []), judge_name, system_prompt, synthesis_rules, raise_transient, prior_attempts
+        )
+        for dim, dim_id in zip(dimensions, ids)
+    ]
+
+
+def _batch_opinions(batch: Any, judge_name: _JUDGE, ids: list[str]) -> dict[str, JudicialOpinion]:
+    """
+    Opinions of a batch response by criterion id, each validated as a JudicialOpinion on its own.
+    Unknown, duplicated, empty and invalid (e.g. out-of-range score) items are dropped.
+    """
+    items = getattr(batch, "opinions", None)
+    if not isinstance(items, list):
+        raise ValueError("LLM did not return JudicialOpinionBatch")
+    wanted = set(ids)
+    judged: dict[str, JudicialOpinion] = {}
+    seen: set[str] = set()
+    duplicated: set[str] = set()
+    for item in items:
+        dim_id = getattr(item, "criterion_id", None)
+        if dim_id not in wanted:
+            continue
+        if dim_id in seen:
+            duplicated.add(dim_id)
+        seen.add(dim_id)
+        argument = getattr(item, "argument", None)
+        if not isinstance(argument, str) or not argument.strip():
+            continue
+        cited = getattr(item, "cited_evidence", None) or []
+        try:
+            judged[dim_id] = JudicialOpinion(
                 judge=judge_name,
                 criterion_id=dim_id,
-                score=max(1, min(5, opinion.score)),
-                argument=opinion.argument or "",
-                cited_evidence=opinion.cited_evidence if isinstance(opinion.cited_evidence, list) else [],
+                score=getattr(item, "score", None),
+                argument=argument,
+                cited_evidence=[cited] if isinstance(cited, str) else cited,
             )
         except ValidationError as e:
-            last_error = e
-            logger.warning("Judge %s criterion %s attempt %s: ValidationError %s", judge_name, dim_id, attempt + 1, e)
+            logger.warning("Judge %s batch: invalid opinion for %s: %s", judge_name, dim_id, e)
+    for dim_id in duplicated:
+        judged.pop(dim_id, None)
+    return judged
+
+
+async def _ainvoke_judge_for_dimension(
+    dimension: dict[str, Any],
+    evidence_list: list[Evidence],
+    judge_name: _JUDGE,
+    system_prompt: str,
+    synthesis_rules: dict[str, str] | None = None,
+) -> JudicialOpinion:
+    """Async _invoke_judge_for_dimension: same prompt, retries and fallback, awaiting the model."""
+    dim_id = dimension.get("id", "unknown")
+    messages = _judge_messages(dimension, evidence_list, system_prompt, synthesis_rules)
+    key = llm_cache_key(JUDGE_MODEL, JUDGE_TEMPERATURE, messages, JudicialOpinion)
+    cached = get_cached_response(key, JudicialOpinion)
+    if cached is not None:
+        return _coerce_opinion(cached, judge_name, dim_id)
+    llm = _get_llm()
+    scheduler, tokens = default_llm_scheduler(), estimate_request_tokens(messages)
+    last_error: Exception | None = None
+    attempts = 0
+    for attempt in range(_MAX_ATTEMPTS):
+        attempts += 1
+        try:
+            opinion = _coerce_opinion(await scheduler.acall(lambda: _ainvoke(llm, messages), tokens), judge_name, dim_id)
+            put_cached_response(key, opinion)
+            return opinion
         except Exception as e:
             last_error = e
-            logger.warning("Judge %s criterion %s attempt %s: %s", judge_name, dim_id, attempt + 1, e)
-    # Fallback: valid JudicialOpinion so dimension is not dropped; Chief Justice can still synthesize
-    return JudicialOpinion(
-        judge=judge_name,
-        criterion_id=dim_id,
-        score=3,
-        argument=f"Structured output parse failure after {max_attempts} retries; neutral score. Last error: {last_error!s}"[:500],
-        cited_evidence=[],
-    )
+            _log_attempt_error(judge_name, dim_id, attempt, e)
+            if is_retryable(e):
+                break
+    return _fallback_opinion(judge_name, dim_id, last_error, attempts)
+
+
+async def _ainvoke(llm: Any, messages: list[Any]) -> Any:
+    """llm.ainvoke when the model is natively async, else its blocking invoke on a worker thread."""
+    if inspect.iscoroutinefunction(getattr(llm, "ainvoke", None)):
+        return await llm.ainvoke(messages)
+    return await asyncio.to_thread(llm.invoke, messages)
 
 
 def _load_synthesis_rules(state: AgentState) -> dict[str, str]:
@@ -174,32 +450,190 @@ def _load_synthesis_rules(state: AgentState) -> dict[str, str]:
         return {}
 
 
+def judge_mode() -> str:
+    """AUDITOR_JUDGE_MODE: "per_criterion" (default) or "batched"; raises ValueError for unknown modes."""
+    mode = (os.environ.get("AUDITOR_JUDGE_MODE") or "per_criterion").strip().lower()
+    if mode not in JUDGE_MODES:
+        raise ValueError(f"Unknown AUDITOR_JUDGE_MODE {mode!r}; expected one of: {', '.join(JUDGE_MODES)}")
+    return mode
+
+
+def judge_concurrency() -> int:
+    """
+    AUDITOR_JUDGE_CONCURRENCY: judge calls in flight at once (default 10; 1 = sequential). Bounds the
+    criteria of a standalone judge node, and the audit graph's judge tasks via max_concurrency.
+    """
+    try:
+        return max(1, int(os.environ.get("AUDITOR_JUDGE_CONCURRENCY") or DEFAULT_JUDGE_CONCURRENCY))
+    except ValueError:
+        return DEFAULT_JUDGE_CONCURRENCY
+
+
+def _dimension_evidence(dim: dict[str, Any], evidences_map: dict[str, Any]) -> list[Evidence]:
+    evidence_list = evidences_map.get(dim.get("id", "unknown"), [])
+    if not isinstance(evidence_list, list):
+        evidence_list = []
+    return [
+        e if isinstance(e, Evidence) else Evidence(**e)
+        for e in evidence_list
+        if isinstance(e, (Evidence, dict))
+    ]
+
+
 def _run_judge_node(state: AgentState, judge_name: _JUDGE, system_prompt: str) -> dict[str, Any]:
-    """Common logic: iterate dimensions, get evidence, call LLM with criterion metadata, collect opinions."""
+    """
+    Common logic: per dimension, get evidence and call LLM with criterion metadata; collect opinions in
+    dimension order. Dimensions are judged concurrently (_arun_judge_node) unless AUDITOR_JUDGE_CONCURRENCY=1,
+    or in one batched call when AUDITOR_JUDGE_MODE=batched.
+    """
     dimensions = state.get("rubric_dimensions") or []
+    if judge_mode() == "batched" and len(dimensions) > 1:
+        (task,) = judge_batch_tasks(state, judges=(judge_name,))
+        return judge_batch_node(task)
+    concurrency = judge_concurrency()
+    if concurrency > 1 and len(dimensions) > 1:
+        return _run_coroutine(_arun_judge_node(state, judge_name, system_prompt, concurrency))
+
     evidences_map = state.get("evidences") or {}
     synthesis_rules = _load_synthesis_rules(state)
     opinions: list[JudicialOpinion] = []
-
     for dim in dimensions:
-        dim_id = dim.get("id", "unknown")
-        evidence_list = evidences_map.get(dim_id, [])
-        if not isinstance(evidence_list, list):
-            evidence_list = []
-        evidence_objs = [
-            e if isinstance(e, Evidence) else Evidence(**e)
-            for e in evidence_list
-            if isinstance(e, (Evidence, dict))
-        ]
-
         opinion = _invoke_judge_for_dimension(
-            dim, evidence_objs, judge_name, system_prompt, synthesis_rules
+            dim, _dimension_evidence(dim, evidences_map), judge_name, system_prompt, synthesis_rules
         )
         opinions.append(opinion)
 
     return {"opinions": opinions}
 
 
+async def _arun_judge_node(
+    state: AgentState, judge_name: _JUDGE, system_prompt: str, concurrency: int | None = None
+) -> dict[str, Any]:
+    """
+    Async _run_judge_node: all dimensions in flight at once, at most concurrency LLM calls at a time;
+    opinions keep dimension order. Wall-clock time approaches the slowest call instead of the sum.
+    """
+    dimensions = state.get("rubric_dimensions") or []
+    evidences_map = state.get("evidences") or {}
+    synthesis_rules = _load_synthesis_rules(state)
+    semaphore = asyncio.Semaphore(concurrency or judge_concurrency())
+
+    async def judge(dim: dict[str, Any]) -> JudicialOpinion:
+        async with semaphore:
+            return await _ainvoke_judge_for_dimension(
+                dim, _dimension_evidence(dim, evidences_map), judge_name, system_prompt, synthesis_rules
+            )
+
+    opinions = await asyncio.gather(*(judge(dim) for dim in dimensions))
+    return {"opinions": list(opinions)}
+
+
+def _run_coroutine(coro: Any) -> Any:
+    """Run coro from sync code; inside a running event loop, on a fresh loop in a worker thread."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, coro).result()
+
+
+def judge_tasks(state: AgentState) -> list[JudgeTask]:
+    """One JudgeTask per (persona, dimension), persona-major in dimension order; rubric rules loaded once."""
+    dimensions = state.get("rubric_dimensions") or []
+    evidences_map = state.get("evidences") or {}
+    synthesis_rules = _load_synthesis_rules(state)
+    return [
+        JudgeTask(
+            judge=judge,
+            dimension=dim,
+            evidences=_dimension_evidence(dim, evidences_map),
+            synthesis_rules=synthesis_rules,
+        )
+        for judge in JUDGE_PERSONAS
+        for dim in dimensions
+    ]
+
+
+_task_attempts: dict[str, int] = {}
+_task_attempts_lock = threading.Lock()
+
+
+@contextmanager
+def _graph_attempt(config: RunnableConfig | None) -> Iterator[int | None]:
+    """
+    1-based attempt number of the running graph task, or None outside a graph. LangGraph's retry
+    loop re-invokes a task with the same config, whose checkpoint namespace ends in the task id, so
+    attempts are counted per namespace. The count is kept only while a transient error is propagating
+    (the graph will retry); any other exit forgets it. Nodes annotate config as Optional[RunnableConfig]:
+    LangGraph injects it by annotation text, and "RunnableConfig | None" is not recognized.
+    """
+    ns = ((config or {}).get("configurable") or {}).get("checkpoint_ns")
+    if not ns:
+        yield None
+        return
+    with _task_attempts_lock:
+        attempt = _task_attempts[ns] = _task_attempts.get(ns, 0) + 1
+    retrying = False
+    try:
+        yield attempt
+    except Exception as e:
+        retrying = is_retryable(e) and attempt < JUDGE_NODE_ATTEMPTS
+        raise
+    finally:
+        if not retrying:
+            with _task_attempts_lock:
+                _task_attempts.pop(ns, None)
+
+
+def judge_criterion_node(task: JudgeTask, config: Optional[RunnableConfig] = None) -> dict[str, Any]:  # noqa: UP045
+    """
+    Judge one criterion as one persona (graph map step); returns {"opinions": [JudicialOpinion]}.
+    Transient LLM errors are raised for the graph's RetryPolicy, except on the final attempt (fallback).
+    """
+    with _graph_attempt(config) as attempt:
+        opinion = _invoke_judge_for_dimension(
+            task["dimension"],
+            task["evidences"],
+            task["judge"],
+            JUDGE_PERSONAS[task["judge"]],
+            task["synthesis_rules"],
+            raise_transient=attempt is not None and attempt < JUDGE_NODE_ATTEMPTS,
+            prior_attempts=(attempt or 1) - 1,
+        )
+    return {"opinions": [opinion]}
+
+
+def judge_batch_tasks(state: AgentState, judges: tuple[_JUDGE, ...] = tuple(JUDGE_PERSONAS)) -> list[JudgeBatchTask]:
+    """One JudgeBatchTask per persona with every dimension (batched mode)."""
+    dimensions = state.get("rubric_dimensions") or []
+    evidences_map = state.get("evidences") or {}
+    evidences = {dim.get("id", "unknown"): _dimension_evidence(dim, evidences_map) for dim in dimensions}
+    synthesis_rules = _load_synthesis_rules(state)
+    return [
+        JudgeBatchTask(judge=judge, dimensions=dimensions, evidences=evidences, synthesis_rules=synthesis_rules)
+        for judge in judges
+    ]
+
+
+def judge_batch_node(task: JudgeBatchTask, config: Optional[RunnableConfig] = None) -> dict[str, Any]:  # noqa: UP045
+    """
+    Judge every criterion as one persona in one structured call, per-criterion fallback for failures.
+    Transient errors are raised for the graph's RetryPolicy as in judge_criterion_node.
+    """
+    with _graph_attempt(config) as attempt:
+        opinions = _invoke_judge_batch(
+            task["dimensions"],
+            task["evidences"],
+            task["judge"],
+            JUDGE_PERSONAS[task["judge"]],
+            task["synthesis_rules"],
+            raise_transient=attempt is not None and attempt < JUDGE_NODE_ATTEMPTS,
+            prior_attempts=(attempt or 1) - 1,
+        )
+    return {"opinions": opinions}
+
+
 def prosecutor_node(state: AgentState) -> dict[str, Any]:
     """Prosecutor persona: adversarial; argue low when evidence warrants. Returns {"opinions": [JudicialOpinion, ...]}."""
     return _run_judge_node(state, "Prosecutor", _PROSECUTOR_SYSTEM)
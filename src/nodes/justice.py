@@ -14,7 +14,10 @@ from src.tools.doc_tools import (
     cross_reference_report_claims,
     extract_claimed_paths_from_text,
     ingest_pdf,
+    iter_pdf_segments,
 )
+from src.tools.llm_cache import llm_cache_stats
+from src.tools.llm_scheduler import default_llm_scheduler
 
 
 def is_critical_failure(state: AgentState) -> bool:
@@ -49,7 +52,8 @@ def evidence_aggregator_node(state: AgentState) -> dict:
     report_accuracy_dim = next((d for d in dimensions if d.get("id") == "report_accuracy"), None)
     if report_accuracy_dim and repo_file_list and pdf_path:
         try:
-            store = ingest_pdf(pdf_path)
+            # Same chunking as DocAnalyst, so the segments it already built are reused
+            store = ingest_pdf(pdf_path, chunk_by="structure")
             full_text = " ".join(s.text for s in store.segments)
             claimed = extract_claimed_paths_from_text(full_text)
             result = cross_reference_report_claims(claimed, repo_file_list)
@@ -103,8 +107,7 @@ def evidence_aggregator_node(state: AgentState) -> dict:
                     if f.is_file() and f.suffix.lower() in (".md", ".txt", ".pdf"):
                         try:
                             if f.suffix.lower() == ".pdf":
-                                store = ingest_pdf(str(f))
-                                content_excerpt = " ".join(s.text for s in store.segments)[:8000]
+                                content_excerpt = _pdf_excerpt(str(f), 8000)
                             else:
                                 content_excerpt = f.read_text(encoding="utf-8", errors="replace")[:8000]
                             found_feedback = True
@@ -127,8 +130,7 @@ def evidence_aggregator_node(state: AgentState) -> dict:
                     if f.is_file() and f.suffix.lower() in (".md", ".txt", ".pdf"):
                         try:
                             if f.suffix.lower() == ".pdf":
-                                store = ingest_pdf(str(f))
-                                content_excerpt = " ".join(s.text for s in store.segments)[:8000]
+                                content_excerpt = _pdf_excerpt(str(f), 8000)
                             else:
                                 content_excerpt = f.read_text(encoding="utf-8", errors="replace")[:8000]
                             found_feedback = True
@@ -211,6 +213,18 @@ def evidence_aggregator_node(state: AgentState) -> dict:
     return {"evidences": evidences}
 
 
+def _pdf_excerpt(pdf_path: str, limit: int) -> str:
+    """First limit characters of the PDF's chunked text; stops extracting pages once reached."""
+    parts: list[str] = []
+    size = 0
+    for seg in iter_pdf_segments(pdf_path):
+        parts.append(seg.text)
+        size += len(seg.text) + 1
+        if size > limit:
+            break
+    return " ".join(parts)[:limit]
+
+
 def judge_collector_node(state: AgentState) -> dict:
     """Pass-through after all Judge nodes; opinions already merged via reducer. Returns {}."""
     return {}
@@ -431,6 +445,7 @@ def chief_justice_node(state: AgentState) -> dict[str, Any]:
             ) or "No remediation plan.",
             total_points=float(total_pts),
             max_points=float(max_pts) if max_pts is not None else None,
+            metadata=_report_metadata(state),
         )
     else:
         overall = (
@@ -456,10 +471,47 @@ def chief_justice_node(state: AgentState) -> dict[str, Any]:
             overall_score=round(overall, 1),
             criteria=criteria_results,
             remediation_plan=remediation_plan,
+            metadata=_report_metadata(state),
         )
     return {"final_report": report}
 
 
+def llm_stats_snapshot() -> dict[str, Any]:
+    """Current counters of the process-wide LLM cache and scheduler (create_initial_state keeps one as baseline)."""
+    return {"llm_cache": llm_cache_stats(), "llm_scheduler": default_llm_scheduler().stats()}
+
+
+def _report_metadata(state: AgentState | None = None) -> dict[str, Any]:
+    """
+    Run metadata for AuditReport: LLM response cache hits/misses and LLM scheduler counters. Both
+    are process-wide, so the audit's llm_stats_baseline is subtracted to report this audit alone
+    (audits running concurrently in one process still share the counters).
+    """
+    current = llm_stats_snapshot()
+    baseline = (state or {}).get("llm_stats_baseline") or {}
+    cache = current["llm_cache"]
+    if cache.get("enabled"):
+        cache = dict(cache, **_counter_delta(cache, baseline.get("llm_cache"), ("hits", "misses")))
+        lookups = cache["hits"] + cache["misses"]
+        cache["hit_rate"] = round(cache["hits"] / lookups, 3) if lookups else 0.0
+    scheduler = current["llm_scheduler"]
+    scheduler = dict(
+        scheduler,
+        **_counter_delta(
+            scheduler, baseline.get("llm_scheduler"), ("requests", "retries", "rate_limited", "waited_seconds")
+        ),
+    )
+    return {"llm_cache": cache, "llm_scheduler": scheduler}
+
+
+def _counter_delta(current: dict[str, Any], baseline: dict[str, Any] | None, keys: tuple[str, ...]) -> dict[str, Any]:
+    """current - baseline per counter; a counter below its baseline means the singleton was rebuilt (count from 0)."""
+    baseline = baseline or {}
+    if any(current[k] < baseline.get(k, 0) for k in keys):
+        baseline = {}
+    return {k: round(current[k] - baseline.get(k, 0), 3) for k in keys}
+
+
 def audit_report_to_markdown(report: AuditReport) -> str:
     """Serialize AuditReport to Markdown per API Contracts §8. Supports points-based criteria."""
     lines = [
@@ -503,6 +555,18 @@ def audit_report_to_markdown(report: AuditReport) -> str:
         report.remediation_plan,
         "",
     ])
+    llm_cache = (report.metadata or {}).get("llm_cache") or {}
+    scheduler = (report.metadata or {}).get("llm_scheduler") or {}
+    run_lines = []
+    if llm_cache.get("enabled"):
+        run_lines.append(f"- **LLM response cache:** {llm_cache.get('hits', 0)} hits, {llm_cache.get('misses', 0)} misses")
+    if scheduler.get("requests"):
+        run_lines.append(
+            f"- **LLM scheduler:** {scheduler['requests']} requests, {scheduler.get('retries', 0)} retries "
+            f"({scheduler.get('rate_limited', 0)} rate-limited), {scheduler.get('waited_seconds', 0):.1f} s queued"
+        )
+    if run_lines:
+        lines.extend(["---", "", "## Run Metadata", "", *run_lines, ""])
     return "\n".join(lines)
 
 
@@ -557,5 +621,6 @@ def degraded_report_node(state: AgentState) -> dict[str, Any]:
         overall_score=overall,
         criteria=criteria_results,
         remediation_plan=remediation_plan,
+        metadata=_report_metadata(state),
     )
     return {"final_report": report}
@@ -17,10 +17,11 @@ from dotenv import load_dotenv
 # Load .env so OPENAI_API_KEY and other vars are available (e.g. for Judges)
 load_dotenv()
 
-from src.graph import build_audit_graph, create_initial_state, load_rubric_dimensions
+from src.graph import audit_run_config, build_audit_graph, create_initial_state, load_rubric_dimensions
 from src.nodes.justice import write_report_to_path
 from src.state import AuditReport
-from src.tools.repo_tools import RepoCloneError, clone_repo
+from src.tools.repo_cache import default_mirror_pool, default_repo_cache
+from src.tools.repo_tools import RepoCloneError, clone_options, clone_repo
 
 # Default PDF path relative to the repo under evaluation (when pdf_path is omitted)
 DEFAULT_PDF_IN_REPO = "reports/final_report.pdf"
@@ -68,30 +69,45 @@ def run_audit(
         raise ValueError("repo_url is required and must be non-empty.")
     pdf_path = (pdf_path or "").strip() or None
     repo_path: str | None = None
-    if pdf_path is None:
-        # Default PDF is relative to the repo under evaluation: clone first, then resolve path
+    pool = default_mirror_pool()
+    workspace: str | None = None
+    if pool is not None:
+        # Shared bare mirror + per-audit worktree; RepoInvestigator reuses it via repo_path
         try:
-            repo_path = clone_repo(repo_url)
-            pdf_path = str(Path(repo_path) / DEFAULT_PDF_IN_REPO)
+            repo_path = workspace = pool.acquire(repo_url)
         except RepoCloneError:
-            pdf_path = ""  # repo-only if clone fails or no default PDF
-    _require_llm_key()
-    dimensions = load_rubric_dimensions(rubric_path)
-    if not dimensions:
-        raise ValueError(
-            f"Rubric has no dimensions. Check rubric_path (e.g. {rubric_path or 'rubric.json'}) exists and contains 'dimensions'."
-        )
-    state = create_initial_state(
-        repo_url=repo_url,
-        pdf_path=pdf_path,
-        rubric_path=rubric_path,
-        repo_path=repo_path,
-    )
-    graph = build_audit_graph().compile()
+            repo_path = None
     try:
-        final = graph.invoke(state)
-    except Exception as e:
-        raise RuntimeError(f"Audit graph failed: {e}") from e
+        if pdf_path is None:
+            # Default PDF is relative to the repo under evaluation: clone first, then resolve path
+            try:
+                if repo_path is None:
+                    options = clone_options(load_rubric_dimensions(rubric_path), extra=[DEFAULT_PDF_IN_REPO])
+                    repo_path = clone_repo(repo_url, cache=default_repo_cache(), **options)
+                pdf_path = str(Path(repo_path) / DEFAULT_PDF_IN_REPO)
+            except RepoCloneError:
+                pdf_path = ""  # repo-only if clone fails or no default PDF
+        _require_llm_key()
+        dimensions = load_rubric_dimensions(rubric_path)
+        if not dimensions:
+            raise ValueError(
+                f"Rubric has no dimensions. Check rubric_path (e.g. {rubric_path or 'rubric.json'}) exists and contains 'dimensions'."
+            )
+        state = create_initial_state(
+            repo_url=repo_url,
+            pdf_path=pdf_path,
+            rubric_path=rubric_path,
+            repo_path=repo_path,
+        )
+        graph = build_audit_graph().compile()
+        try:
+            final = graph.invoke(state, config=audit_run_config())
+        except Exception as e:
+            raise RuntimeError(f"Audit graph failed: {e}") from e
+    finally:
+        # Worktree is removed as soon as the graph finishes (success or failure)
+        if pool is not None and workspace:
+            pool.release(workspace)
     report = final.get("final_report")
     if report is None:
         return None
@@ -62,6 +62,8 @@ class AuditReport(BaseModel):
     # Points-based rubric (optional)
     total_points: float | None = None
     max_points: float | None = None
+    # Run metadata (optional), e.g. {"llm_cache": {"hits": ..., "misses": ...}}
+    metadata: dict[str, Any] | None = None
 
 
 # ----- Explicit reducers for parallel-written state (API Contracts §3.5) -----
@@ -114,3 +116,4 @@ class AgentState(TypedDict, total=False):
     opinions: Annotated[list[JudicialOpinion], merge_opinions]
     final_report: AuditReport | None
     repo_file_list: list[str]  # optional; set by RepoInvestigator for cross-reference (report_accuracy)
+    llm_stats_baseline: dict[str, Any]  # optional; LLM cache/scheduler counters at audit start (report metadata)
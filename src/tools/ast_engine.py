@@ -0,0 +1,237 @@
+"""
+Single-pass AST analysis engine for RepoInvestigator. One traversal of a module dispatches
+every node, exactly once, to every registered analyzer (graph wiring, state schema, security
+calls, ...); analyzers never walk subtrees themselves, so adding a forensic check adds no pass
+and nesting depth adds no repeated work. SRS FR-7 (AST-based analysis, no regex for structure).
+"""
+
+from __future__ import annotations
+
+import ast
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+_Handler = Callable[[ast.AST, "VisitContext"], None]
+_SCOPE_NODES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+
+
+@dataclass
+class VisitContext:
+    """Traversal state shared with analyzers: module path and enclosing function/class names."""
+
+    path: str = ""
+    functions: list[str] = field(default_factory=list)
+    classes: list[str] = field(default_factory=list)
+
+    @property
+    def function_depth(self) -> int:
+        return len(self.functions)
+
+
+class NodeAnalyzer:
+    """
+    Base class for engine analyzers. Define visit_<NodeType>(node, ctx) to see a node before its
+    children and leave_<NodeType>(node, ctx) after them; result() returns the analyzer's findings.
+    Enclosing scopes are tracked by the engine (ctx.functions / ctx.classes), not by analyzers.
+    """
+
+    name = "analyzer"
+
+    def result(self) -> Any:
+        raise NotImplementedError
+
+
+def run_analyzers(tree: ast.AST, analyzers: list[NodeAnalyzer], path: str = "") -> dict[str, Any]:
+    """
+    Traverse tree once (iterative, source order) and dispatch each node to every analyzer that
+    handles its type. Returns {analyzer.name: analyzer.result()}.
+    """
+    ctx = VisitContext(path=path)
+    dispatch: dict[type, tuple[list[_Handler], list[_Handler]]] = {}
+    stack: list[tuple[ast.AST, bool]] = [(tree, False)]
+    while stack:
+        node, leaving = stack.pop()
+        cls = type(node)
+        handlers = dispatch.get(cls)
+        if handlers is None:
+            handlers = dispatch[cls] = (
+                [h for a in analyzers if (h := getattr(a, f"visit_{cls.__name__}", None))],
+                [h for a in analyzers if (h := getattr(a, f"leave_{cls.__name__}", None))],
+            )
+        is_scope = isinstance(node, _SCOPE_NODES)
+        if leaving:
+            if is_scope:
+                (ctx.classes if cls is ast.ClassDef else ctx.functions).pop()
+            for handler in handlers[1]:
+                handler(node, ctx)
+            continue
+        for handler in handlers[0]:
+            handler(node, ctx)
+        if is_scope:
+            (ctx.classes if cls is ast.ClassDef else ctx.functions).append(node.name)  # type: ignore[attr-defined]
+        if is_scope or handlers[1]:
+            stack.append((node, True))
+        children = list(ast.iter_child_nodes(node))
+        stack.extend((child, False) for child in reversed(children))
+    return {a.name: a.result() for a in analyzers}
+
+
+class GraphWiringAnalyzer(NodeAnalyzer):
+    """StateGraph construction, add_node / add_edge / add_conditional_edges calls and reducer usage."""
+
+    name = "graph"
+
+    def __init__(self) -> None:
+        self.has_state_graph = False
+        self.has_conditional = False
+        self.reducers_seen = False
+        self.node_calls: list[str] = []
+        self.edge_calls: list[tuple[str, str]] = []
+
+    def visit_Call(self, node: ast.Call, ctx: VisitContext) -> None:
+        name = call_name(node.func)
+        if not name:
+            return
+        if "StateGraph" in name:
+            self.has_state_graph = True
+        if "add_edge" in name:
+            src, tgt = _edge_args(node)
+            if src and tgt:
+                self.edge_calls.append((src, tgt))
+        if "add_node" in name:
+            node_name = _add_node_arg(node)
+            if node_name:
+                self.node_calls.append(node_name)
+        if "add_conditional" in name.lower():
+            self.has_conditional = True
+        if ctx.function_depth and name in ("operator.ior", "operator.add", "ior", "add"):
+            self.reducers_seen = True
+
+    def visit_Assign(self, node: ast.Assign, ctx: VisitContext) -> None:
+        if any(isinstance(t, ast.Name) and t.id == "reducer" for t in node.targets):
+            self.reducers_seen = True
+
+    def result(self) -> dict[str, Any]:
+        return {
+            "has_state_graph": self.has_state_graph,
+            "nodes": list(dict.fromkeys(self.node_calls)),
+            "edges": list(dict.fromkeys(self.edge_calls)),
+            "has_conditional": self.has_conditional,
+            "reducers_seen": self.reducers_seen,
+        }
+
+
+class StateSchemaAnalyzer(NodeAnalyzer):
+    """Class definitions (Pydantic models, TypedDict state) and Annotated reducer keys."""
+
+    name = "state"
+
+    def __init__(self) -> None:
+        self.models_found: list[str] = []
+        self.pydantic_models: list[str] = []
+        self.reducer_keys: list[str] = []
+        self._ann_keys: list[str] = []  # state keys of enclosing AnnAssign statements
+
+    def visit_ClassDef(self, node: ast.ClassDef, ctx: VisitContext) -> None:
+        if node.name:
+            self.models_found.append(node.name)
+        if any((call_name(b) or "").split(".")[-1] == "BaseModel" for b in node.bases):
+            self.pydantic_models.append(node.name)
+
+    def visit_AnnAssign(self, node: ast.AnnAssign, ctx: VisitContext) -> None:
+        if not isinstance(node.target, ast.Name):
+            return
+        key_name = node.target.id
+        self._ann_keys.append(key_name)
+        ann = node.annotation
+        # Annotated[dict[str, list[Evidence]], merge_evidences] -> key_name
+        if isinstance(ann, ast.Subscript) and (isinstance(ann.slice, ast.Tuple) or hasattr(ann.slice, "elts")):
+            self.reducer_keys.append(key_name)
+
+    def leave_AnnAssign(self, node: ast.AnnAssign, ctx: VisitContext) -> None:
+        if isinstance(node.target, ast.Name):
+            self._ann_keys.pop()
+
+    def visit_Call(self, node: ast.Call, ctx: VisitContext) -> None:
+        # Reducer called inside an annotation (e.g. Annotated[list, operator.add()])
+        if not self._ann_keys:
+            return
+        n = call_name(node.func)
+        if n and ("merge" in n.lower() or "ior" in n or "add" in n):
+            self.reducer_keys.append(self._ann_keys[-1])
+
+    def result(self) -> dict[str, Any]:
+        return {
+            "models_found": self.models_found,
+            "pydantic_models": self.pydantic_models,
+            "reducer_keys": list(dict.fromkeys(self.reducer_keys)),
+        }
+
+
+# Calls that run a shell or arbitrary code; flagged by SecurityCallAnalyzer
+_SHELL_CALLS = frozenset({"os.system", "os.popen", "os.execl", "os.execvp", "commands.getoutput"})
+_CODE_EXEC_CALLS = frozenset({"eval", "exec"})
+_SUBPROCESS_CALLS = frozenset(
+    {"subprocess.run", "subprocess.call", "subprocess.check_call", "subprocess.check_output", "subprocess.Popen"}
+)
+
+
+class SecurityCallAnalyzer(NodeAnalyzer):
+    """Shell-executing and code-executing calls: os.system, subprocess with shell=True, eval/exec."""
+
+    name = "security"
+
+    def __init__(self) -> None:
+        self.findings: list[dict[str, Any]] = []
+        self.subprocess_calls = 0
+
+    def visit_Call(self, node: ast.Call, ctx: VisitContext) -> None:
+        name = call_name(node.func)
+        if not name:
+            return
+        issue = None
+        if name in _SHELL_CALLS:
+            issue = "shell command"
+        elif name in _CODE_EXEC_CALLS:
+            issue = "dynamic code execution"
+        elif name in _SUBPROCESS_CALLS:
+            self.subprocess_calls += 1
+            if any(
+                kw.arg == "shell" and not (isinstance(kw.value, ast.Constant) and not kw.value.value)
+                for kw in node.keywords
+            ):
+                issue = "subprocess with shell=True"
+        if issue:
+            self.findings.append({"call": name, "issue": issue, "path": ctx.path, "line": node.lineno})
+
+    def result(self) -> dict[str, Any]:
+        return {"findings": self.findings, "subprocess_calls": self.subprocess_calls}
+
+
+def call_name(func: ast.expr) -> str | None:
+    """Dotted name of a call target (os.system, builder.add_edge); None for computed callees."""
+    if isinstance(func, ast.Name):
+        return func.id
+    if isinstance(func, ast.Attribute):
+        return f"{call_name(func.value) or ''}.{func.attr}"
+    return None
+
+
+def _edge_args(node: ast.Call) -> tuple[str | None, str | None]:
+    if len(node.args) >= 2:
+        src = _arg_value(node.args[0])
+        tgt = _arg_value(node.args[1])
+        return (src, tgt)
+    return (None, None)
+
+
+def _arg_value(arg: ast.expr) -> str | None:
+    if isinstance(arg, ast.Constant):
+        return str(arg.value) if arg.value is not None else None
+    return None
+
+
+def _add_node_arg(node: ast.Call) -> str | None:
+    if len(node.args) >= 1:
+        return _arg_value(node.args[0])
+    return None
@@ -0,0 +1,100 @@
+"""
+Repo-wide AST index for RepoInvestigator: every tracked .py file is read once and parsed once
+per audit; repo analyzers query the index instead of re-reading and re-parsing files. Parsing
+stays in-process: shipping ast.Module trees back from worker processes costs more to unpickle
+than parsing them. SRS FR-7 (AST-based analysis, no regex for structure).
+"""
+
+from __future__ import annotations
+
+import ast
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from src.tools.repo_tools import list_repo_files, read_repo_file
+
+if TYPE_CHECKING:
+    from src.tools.git_session import GitSession
+
+# Files larger than this are recorded as skipped (generated code, vendored bundles)
+DEFAULT_MAX_FILE_BYTES = 512 * 1024
+# Vendored or environment directories students commit by mistake; never analyzed
+SKIP_DIRS = frozenset({".venv", "venv", "env", "site-packages", "node_modules", "__pycache__", ".tox", ".git"})
+
+
+@dataclass
+class AstIndex:
+    """Parsed modules keyed by repo-relative path, plus parse failures and skipped files."""
+
+    modules: dict[str, ast.Module] = field(default_factory=dict)
+    sources: dict[str, str] = field(default_factory=dict)  # every read file, parsed or not
+    errors: dict[str, str] = field(default_factory=dict)  # path -> "syntax error: ..."
+    skipped: dict[str, str] = field(default_factory=dict)  # path -> reason
+
+    def get(self, path: str) -> ast.Module | None:
+        return self.modules.get(path)
+
+    def source(self, path: str) -> str | None:
+        return self.sources.get(path)
+
+    def __contains__(self, path: object) -> bool:
+        return path in self.modules or path in self.errors
+
+    def paths(self) -> list[str]:
+        """Successfully parsed paths, sorted."""
+        return sorted(self.modules)
+
+
+def is_indexable(path: str) -> bool:
+    """True for .py files outside vendored/environment directories (SKIP_DIRS)."""
+    parts = path.replace("\\", "/").split("/")
+    return path.endswith(".py") and not any(p in SKIP_DIRS for p in parts[:-1])
+
+
+def build_ast_index(
+    repo_path: str,
+    session: GitSession | None = None,
+    files: list[str] | None = None,
+    max_file_bytes: int = DEFAULT_MAX_FILE_BYTES,
+) -> AstIndex:
+    """
+    Read and parse every tracked .py file once.
+
+    Args:
+        repo_path: Cloned repo root.
+        session: Optional GitSession for file listing and for blobs outside a sparse checkout.
+        files: Tracked file list if already known (defaults to list_repo_files).
+        max_file_bytes: Files above this size are skipped (recorded in index.skipped).
+
+    Returns:
+        AstIndex. Parse failures are recorded in index.errors, never raised.
+    """
+    index = AstIndex()
+    if files is None:
+        files = list_repo_files(repo_path, session=session)
+    for rel in files:
+        if not is_indexable(rel):
+            continue
+        disk = Path(repo_path) / rel
+        try:
+            if disk.is_file() and disk.stat().st_size > max_file_bytes:
+                index.skipped[rel] = f"larger than {max_file_bytes} bytes"
+                continue
+            source = read_repo_file(repo_path, rel, session)
+        except OSError as e:
+            index.skipped[rel] = str(e)
+            continue
+        if source is None:
+            index.skipped[rel] = "unreadable"
+            continue
+        if len(source) > max_file_bytes:
+            index.skipped[rel] = f"larger than {max_file_bytes} bytes"
+            continue
+        index.sources[rel] = source
+        try:
+            index.modules[rel] = ast.parse(source, filename=rel)
+        except (SyntaxError, ValueError) as e:
+            index.errors[rel] = f"syntax error: {e}"
+    return index
+
@@ -0,0 +1,143 @@
+"""
+Local diagram-candidate ranking for VisionInspector. Every extracted image is scored for
+"diagram-likeness" from NumPy statistics on a downsampled copy, and only the top-k go to the
+vision model. Architecture diagrams are mostly background with a few flat colors and thin
+strokes; photos and cover art have rich palettes and little whitespace; logos and banners have
+extreme shapes or almost no structure.
+
+Signals (each in [0, 1], higher is more diagram-like):
+- palette: 1 - entropy of a 64-color quantized histogram (6 bits max)
+- whitespace: share of the dominant (background) color, white or dark theme; blank scores 0
+- edges: density of strong luminance steps, peaking for line art and falling off for texture
+- aspect: declared shape, 1 between 1:2 and 3:1, tapering to 0 for banners and strips
+
+Without numpy (extra "vector") images are ranked by aspect ratio and declared size only.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+from dataclasses import dataclass, field
+from typing import Any, Iterable
+
+from src.tools.pdf_images import PDFImageRef
+
+DEFAULT_TOP_K = 2
+THUMBNAIL_SIDE = 128
+
+_WEIGHTS = {"palette": 0.3, "whitespace": 0.25, "edges": 0.3, "aspect": 0.15}
+_EDGE_STEP = 48  # luminance step (0-255) that counts as an edge between neighbouring pixels
+_MIN_EDGES = 0.005  # below this the image is blank or a smooth gradient
+_LINE_ART_EDGES = (0.02, 0.25)  # edge densities typical of boxes, arrows and labels
+
+
+@dataclass
+class DiagramCandidate:
+    """An image with its diagram-likeness score (0-1) and the per-signal scores behind it."""
+
+    image: Any
+    score: float
+    signals: dict[str, float] = field(default_factory=dict)
+
+
+def aspect_score(width: int, height: int) -> float:
+    """1 for 1:2 to 3:1 shapes, linearly down to 0 at 1:4 and 6:1 (strips, banners, rules)."""
+    if not width or not height:
+        return 0.0
+    ratio = width / height
+    if 0.5 <= ratio <= 3.0:
+        return 1.0
+    if ratio < 0.5:
+        return max(0.0, (ratio - 0.25) / 0.25)
+    return max(0.0, (6.0 - ratio) / 3.0)
+
+
+def diagram_signals(image: Any, width: int | None = None, height: int | None = None) -> dict[str, float]:
+    """
+    Per-signal scores of a PIL image (any size; downsampled to THUMBNAIL_SIDE first). width /
+    height: declared size for the aspect signal, defaulting to the image's own.
+    """
+    import numpy as np
+
+    thumb = image.convert("RGB")
+    thumb.thumbnail((THUMBNAIL_SIDE, THUMBNAIL_SIDE))
+    rgb = np.asarray(thumb, dtype=np.int16)
+    w, h = image.size
+    signals = {"aspect": aspect_score(width or w, height or h)}
+
+    # Palette entropy over 4 levels per channel
+    bins = (rgb[..., 0] // 64) * 16 + (rgb[..., 1] // 64) * 4 + rgb[..., 2] // 64
+    counts = np.bincount(bins.ravel(), minlength=64)
+    p = counts[counts > 0] / bins.size
+    signals["palette"] = float(1.0 - min(-(p * np.log2(p)).sum() / 6.0, 1.0))
+
+    # Whitespace: share of the dominant flat color (white paper or a dark-theme canvas)
+    white = float(counts.max() / bins.size)
+    signals["whitespace"] = white if white < 0.99 else 0.0
+
+    # Edge density: strong horizontal or vertical luminance steps
+    gray = rgb @ np.array([299, 587, 114]) // 1000
+    steps = np.zeros(gray.shape, dtype=bool)
+    steps[:, 1:] |= np.abs(np.diff(gray, axis=1)) >= _EDGE_STEP
+    steps[1:, :] |= np.abs(np.diff(gray, axis=0)) >= _EDGE_STEP
+    density = float(steps.mean())
+    low, high = _LINE_ART_EDGES
+    if density < _MIN_EDGES:
+        signals["edges"] = 0.0
+    elif density < low:
+        signals["edges"] = density / low
+    elif density <= high:
+        signals["edges"] = 1.0
+    else:
+        signals["edges"] = max(0.0, 1.0 - (density - high) / high)
+    return signals
+
+
+def diagram_score(signals: dict[str, float]) -> float:
+    """Weighted signal average; images without edges (blank, gradients) are pushed to the bottom."""
+    score = sum(weight * signals.get(name, 0.0) for name, weight in _WEIGHTS.items())
+    return score if signals.get("edges", 0.0) > 0 else score * 0.1
+
+
+def rank_diagram_candidates(images: Iterable[Any], top_k: int | None = None) -> list[DiagramCandidate]:
+    """
+    Score images (PDFImageRef or PIL images) and return the top_k most diagram-like, best first;
+    ties keep document order. top_k None ranks all. Images that fail to decode are skipped.
+    """
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        return _rank_by_shape(list(images), top_k)
+    candidates = []
+    for image in images:
+        try:
+            if isinstance(image, PDFImageRef):
+                signals = diagram_signals(image.thumbnail(THUMBNAIL_SIDE), image.width, image.height)
+            else:
+                signals = diagram_signals(image)
+        except Exception:
+            continue
+        candidates.append(DiagramCandidate(image, diagram_score(signals), signals))
+    candidates.sort(key=lambda c: -c.score)  # stable: ties keep document order
+    return candidates if top_k is None else candidates[:top_k]
+
+
+def _rank_by_shape(images: list[Any], top_k: int | None) -> list[DiagramCandidate]:
+    """numpy-free fallback: declared aspect ratio, then larger images first."""
+    candidates = []
+    for image in images:
+        width, height = getattr(image, "width", 0), getattr(image, "height", 0)
+        aspect = aspect_score(width, height)
+        size = min(math.log10(max(width * height, 1)) / 7.0, 1.0)  # 10 MP -> 1
+        candidates.append(DiagramCandidate(image, 0.7 * aspect + 0.3 * size, {"aspect": aspect}))
+    candidates.sort(key=lambda c: -c.score)
+    return candidates if top_k is None else candidates[:top_k]
+
+
+def vision_top_k() -> int:
+    """AUDITOR_VISION_TOP_K: images sent to the vision model per audit (default DEFAULT_TOP_K, min 1)."""
+    try:
+        return max(1, int(os.environ.get("AUDITOR_VISION_TOP_K") or DEFAULT_TOP_K))
+    except ValueError:
+        return DEFAULT_TOP_K
@@ -6,17 +6,49 @@ API Contracts §5.2; SRS FR-8, FR-9.
 
 from __future__ import annotations
 
+import bisect
+import io
+import multiprocessing
 import os
-from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Literal
+from typing import Any, Iterable, Iterator, Literal
 
 from pypdf import PdfReader
 
+from src.tools.chunking import DEFAULT_CHUNK_TOKENS, estimate_tokens, structure_chunks
+from src.tools.kv_cache import KVCache
+from src.tools.llm_cache import get_cached_response, llm_cache_key, put_cached_response
+from src.tools.llm_scheduler import PRIORITY_HIGH, default_llm_scheduler, estimate_request_tokens
+from src.tools.pdf_cache import (
+    PDFArtifacts,
+    default_pdf_cache,
+    default_pdf_text_store,
+    file_sha256,
+    open_pdf_artifacts,
+)
+from src.tools.pdf_images import (
+    DEFAULT_MIN_PIXELS,
+    PDFImageRef,
+    encode_image,
+    page_image_refs,
+    sniff_image_type,
+    vision_max_pixels,
+)
+from src.tools.retrieval import BM25Index, Retriever, build_retriever, retriever_name
+
 
 # Chunk size in characters for RAG-lite (avoid dumping full doc into context)
 _CHUNK_SIZE = 1500
 _CHUNK_OVERLAP = 100
+# Parallel text extraction: only for PDFs with at least this many pages, at least this many pages per worker
+_PARALLEL_MIN_PAGES = 64
+_PAGES_PER_TASK_MIN = 16
+# Vision model for analyze_diagram (part of the LLM response cache key)
+VISION_MODEL = "gpt-4o"
+VISION_TEMPERATURE = 0
 
 
 class PDFParseError(Exception):
@@ -33,7 +65,8 @@ class ChunkSegment:
     """A single queryable segment (page-bound or character-bound) for RAG retrieval."""
 
     text: str
-    page_no: int | None = None  # 1-based; None for merged char chunks
+    page_no: int | None = None  # 1-based (first page of the chunk); None when unknown
+    page_end: int | None = None  # last page for chunks spanning pages (char / structure modes)
 
 
 @dataclass
@@ -45,34 +78,33 @@ class PDFIngestionResult:
 
     segments: list[ChunkSegment]
     source_path: str
-
-    def query(self, question: str, top_k: int = 5) -> str:
-        """Return relevant excerpts for the question (chunked retrieval)."""
-        texts = [s.text for s in self.segments]
-        relevant = _search_chunks(texts, question, top_k)
-        if not relevant:
-            return "No relevant excerpts found."
-        return "\n\n---\n\n".join(relevant)
+    index: Retriever | None = field(default=None, repr=False, compare=False)
+    retriever: str | None = None  # "bm25" / "tfidf"; None = AUDITOR_RETRIEVER or bm25
+
+    def query(self, question: str, top_k: int = 5, max_tokens: int | None = None) -> str:
+        """
+        Return relevant excerpts for the question (ranked chunked retrieval, see retriever).
+        max_tokens caps the excerpt size: whole chunks in rank order while they fit.
+        """
+        return _format_excerpts(self.search_index().top_chunks(question, top_k), max_tokens)
+
+    def query_batch(self, questions: list[str], top_k: int = 5, max_tokens: int | None = None) -> list[str]:
+        """query() for every question at once (one pass over the index); results align with questions."""
+        hits = self.search_index().top_chunks_batch(questions, top_k)
+        return [_format_excerpts(chunks, max_tokens) for chunks in hits]
+
+    def search_index(self) -> Retriever:
+        """Retriever over the segments (built by ingest_pdf; lazily for hand-built results or a new retriever)."""
+        name = retriever_name(self.retriever)
+        if self.index is None or len(self.index) != len(self.segments) or self.index.name != name:
+            self.index = build_retriever([s.text for s in self.segments], name)
+        return self.index
 
     def get_segments(self) -> list[ChunkSegment]:
         """Return the chunked segments (e.g. for inspection or custom retrieval)."""
         return list(self.segments)
 
 
-def _search_chunks(chunks: list[str], question: str, top_k: int = 5) -> list[str]:
-    """Return chunks most relevant to question (simple keyword overlap)."""
-    q_lower = question.lower()
-    q_words = set(w for w in q_lower.split() if len(w) > 2)
-    scored = []
-    for c in chunks:
-        c_lower = c.lower()
-        score = sum(1 for w in q_words if w in c_lower)
-        if score > 0:
-            scored.append((score, c))
-    scored.sort(key=lambda x: -x[0])
-    return [c for _, c in scored[:top_k]]
-
-
 @dataclass
 class DocStore:
     """
@@ -82,35 +114,185 @@ class DocStore:
 
     chunks: list[str]
     source_path: str
+    index: Retriever | None = field(default=None, repr=False, compare=False)
+    retriever: str | None = None  # as PDFIngestionResult.retriever
 
     def search_chunks(self, question: str, top_k: int = 5) -> list[str]:
-        """Return chunks most relevant to question (simple keyword overlap)."""
-        return _search_chunks(self.chunks, question, top_k)
+        """Return chunks most relevant to question (retriever built on first use; BM25 by default)."""
+        return self._search_index().top_chunks(question, top_k)
+
+    def query_batch(self, questions: list[str], top_k: int = 5, max_tokens: int | None = None) -> list[str]:
+        """query() for every question at once (one pass over the index); results align with questions."""
+        hits = self._search_index().top_chunks_batch(questions, top_k)
+        return [_format_excerpts(chunks, max_tokens) for chunks in hits]
+
+    def _search_index(self) -> Retriever:
+        name = retriever_name(self.retriever)
+        if self.index is None or len(self.index) != len(self.chunks) or self.index.name != name:
+            self.index = build_retriever(self.chunks, name)
+        return self.index
 
-    def query(self, question: str, top_k: int = 5) -> str:
-        """RAG-like query: return relevant excerpts for the question."""
-        relevant = self.search_chunks(question, top_k)
-        if not relevant:
-            return "No relevant excerpts found."
-        return "\n\n---\n\n".join(relevant)
+    def query(self, question: str, top_k: int = 5, max_tokens: int | None = None) -> str:
+        """RAG-like query: return relevant excerpts for the question (max_tokens as PDFIngestionResult)."""
+        return _format_excerpts(self.search_chunks(question, top_k), max_tokens)
 
 
 def ingest_pdf(
     pdf_path: str,
-    chunk_by: Literal["char", "page"] = "char",
+    chunk_by: Literal["char", "page", "structure"] = "char",
+    workers: int | None = None,
+    retriever: str | None = None,
 ) -> PDFIngestionResult:
     """
     Ingest PDF into chunked, queryable segments (RAG-like; no full-text dump). SRS FR-8.
     - chunk_by="char": merge pages then split by character count (default).
     - chunk_by="page": one segment per page (page-bound chunks).
+    - chunk_by="structure": headings / paragraphs / sentences packed under a token budget, no
+      overlap (fewer, denser chunks; see src/tools/chunking.py).
+    Every segment carries its page range (page_no .. page_end).
+    - workers: text extraction processes for large PDFs (default AUDITOR_PDF_WORKERS or the CPU
+      count; 1 extracts serially). Segments are always in page order.
+    - retriever: "bm25" (default) or "tfidf" (NumPy); None reads AUDITOR_RETRIEVER.
+    Page text, segments and index are persisted in the on-disk text store (default_pdf_text_store),
+    so re-auditing the same PDF content skips extraction entirely.
     Raises FileNotFoundError if file missing; PDFParseError on parse/corrupt PDF.
     """
     path = Path(pdf_path)
     if not path.is_file():
         raise FileNotFoundError(f"PDF not found: {pdf_path}")
 
+    name = retriever_name(retriever)
+    artifacts = _open_pdf(pdf_path)
+    store = default_pdf_text_store()
+    with artifacts.lock:
+        segments = artifacts.segments.get(chunk_by)
+        save = False
+        if segments is None:
+            stored = _load_segments(store, artifacts.sha256, chunk_by)
+            if stored is not None:
+                segments, bm25 = stored
+                if bm25 is not None:
+                    artifacts.indexes[f"{chunk_by}:bm25"] = bm25
+            else:
+                page_texts = _page_texts(artifacts, pdf_path, workers, store)
+                segments = list(_segments_from_pages(page_texts, chunk_by))
+                save = True
+            artifacts.segments[chunk_by] = segments
+        # Retriever built at ingest time, once per PDF content, chunking mode and retriever
+        index = artifacts.indexes.get(f"{chunk_by}:{name}")
+        if index is None:
+            index = artifacts.indexes[f"{chunk_by}:{name}"] = build_retriever([seg.text for seg in segments], name)
+            save = save or name == "bm25"
+        if save:
+            _save_segments(store, artifacts.sha256, chunk_by, segments, artifacts.indexes.get(f"{chunk_by}:bm25"))
+    _remember(artifacts)
+    return PDFIngestionResult(segments=list(segments), source_path=pdf_path, index=index, retriever=name)
+
+
+def iter_pdf_segments(
+    pdf_path: str, chunk_by: Literal["char", "page", "structure"] = "char"
+) -> Iterator[ChunkSegment]:
+    """
+    Lazily yield the segments ingest_pdf would return, extracting one page at a time: a consumer
+    that stops iterating stops extraction, and only the current page and the pending chunk are
+    held (no full-text string, nothing added to the artifact cache). Segments already cached by
+    ingest_pdf, in memory or in the text store, are replayed. Raises FileNotFoundError /
+    PDFParseError on first iteration.
+    """
+    if not Path(pdf_path).is_file():
+        raise FileNotFoundError(f"PDF not found: {pdf_path}")
+    artifacts = _open_pdf(pdf_path)
+    with artifacts.lock:
+        cached = artifacts.segments.get(chunk_by)
+    if cached is None:
+        stored = _load_segments(default_pdf_text_store(), artifacts.sha256, chunk_by)
+        cached = stored[0] if stored is not None else None
+    if cached is not None:
+        yield from cached
+        return
+    yield from _segments_from_pages(_iter_page_texts(artifacts, pdf_path), chunk_by)
+
+
+def _segments_from_pages(page_texts: Iterable[tuple[int, str]], chunk_by: str) -> Iterator[ChunkSegment]:
+    """
+    Chunk a stream of (page_no, text) into segments. "char" mode keeps a rolling buffer and cuts
+    the same _CHUNK_SIZE / _CHUNK_OVERLAP windows _split_into_chunks cuts from the joined text,
+    tracking where each page starts in the buffer for provenance.
+    """
+    emitted = False
+    if chunk_by == "page":
+        for page_no, text in page_texts:
+            emitted = True
+            yield ChunkSegment(text=text, page_no=page_no, page_end=page_no)
+        if not emitted:
+            yield ChunkSegment(text="(no text extracted)", page_no=None)
+        return
+    if chunk_by == "structure":
+        for text, first, last in structure_chunks(page_texts, DEFAULT_CHUNK_TOKENS):
+            emitted = True
+            yield ChunkSegment(text=text, page_no=first, page_end=last)
+        if not emitted:
+            yield ChunkSegment(text="(no text)", page_no=None)
+        return
+    step = _CHUNK_SIZE - _CHUNK_OVERLAP
+    buffer = ""
+    starts: list[int] = []  # buffer offset where each pending page's text begins
+    pages: list[int] = []
+    for i, (page_no, text) in enumerate(page_texts):
+        if i:
+            buffer += "\n\n"
+        starts.append(len(buffer))
+        pages.append(page_no)
+        buffer += text
+        while len(buffer) >= _CHUNK_SIZE:
+            segment = _char_segment(buffer, 0, starts, pages)
+            if segment is not None:
+                emitted = True
+                yield segment
+            buffer = buffer[step:]
+            starts = [offset - step for offset in starts]
+            while len(starts) > 1 and starts[1] <= 0:
+                del starts[0], pages[0]
+    for start in range(0, len(buffer), step):
+        segment = _char_segment(buffer, start, starts, pages)
+        if segment is not None:
+            emitted = True
+            yield segment
+    if not emitted:
+        yield ChunkSegment(text="(no text)", page_no=None)
+
+
+def _char_segment(buffer: str, start: int, starts: list[int], pages: list[int]) -> ChunkSegment | None:
+    """The _CHUNK_SIZE window at start, with the pages of its first and last non-space characters."""
+    window = buffer[start : start + _CHUNK_SIZE]
+    text = window.strip()
+    if not text:
+        return None
+    first = start + len(window) - len(window.lstrip())
+    last = start + len(window.rstrip()) - 1
+    return ChunkSegment(
+        text=text,
+        page_no=pages[bisect.bisect_right(starts, first) - 1],
+        page_end=pages[bisect.bisect_right(starts, last) - 1],
+    )
+
+
+def _open_pdf(pdf_path: str) -> PDFArtifacts:
+    """
+    Parsed PDF for pdf_path: from the process-wide artifact cache (one parse per file content
+    across DocAnalyst, VisionInspector and EvidenceAggregator) or parsed directly when disabled.
+    Raises PDFParseError when the file cannot be parsed.
+    """
+    cache = default_pdf_cache()
     try:
-        reader = PdfReader(pdf_path)
+        if cache is not None:
+            return cache.get(pdf_path)
+        handle = open(pdf_path, "rb")
+        try:
+            return open_pdf_artifacts(pdf_path, handle, file_sha256(handle))
+        except BaseException:
+            handle.close()
+            raise
     except Exception as e:
         raise PDFParseError(
             f"PDF parsing failed: {pdf_path}. {type(e).__name__}: {e}",
@@ -118,30 +300,160 @@ def ingest_pdf(
             cause=e,
         ) from e
 
-    page_texts: list[tuple[int, str]] = []  # 1-based page_no, text
-    for i, page in enumerate(reader.pages):
+
+def _load_segments(
+    store: KVCache | None, sha256: str, chunk_by: str
+) -> tuple[list[ChunkSegment], BM25Index | None] | None:
+    """Stored segments (and BM25 index, if stored) for this PDF content and chunking mode; None on a miss."""
+    data = store.get_json(f"pdf_segments:{sha256}:{chunk_by}") if store is not None else None
+    if data is None:
+        return None
+    try:
+        segments = [
+            ChunkSegment(text=text, page_no=page_no, page_end=page_end) for text, page_no, page_end in data["segments"]
+        ]
+        index = data.get("index")
+        return segments, BM25Index.from_dict([seg.text for seg in segments], index) if index else None
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def _save_segments(
+    store: KVCache | None, sha256: str, chunk_by: str, segments: list[ChunkSegment], index: BM25Index | None
+) -> None:
+    if store is not None:
+        payload: dict[str, Any] = {"segments": [[seg.text, seg.page_no, seg.page_end] for seg in segments]}
+        if index is not None:
+            payload["index"] = index.to_dict()
+        store.set_json(f"pdf_segments:{sha256}:{chunk_by}", payload)
+
+
+def _page_texts(
+    artifacts: PDFArtifacts, pdf_path: str, workers: int | None = None, store: KVCache | None = None
+) -> list[tuple[int, str]]:
+    """
+    Per-page text (1-based page_no, text), extracted once per artifacts (or loaded from store).
+    Caller holds artifacts.lock. Large PDFs are split into page ranges across a process pool
+    (see _extraction_workers).
+    """
+    key = f"pdf_pages:{artifacts.sha256}"
+    if artifacts.page_texts is None and store is not None:
+        stored = store.get_json(key)
+        if isinstance(stored, list):
+            artifacts.page_texts = [(page_no, text) for page_no, text in stored]
+    if artifacts.page_texts is None:
+        num_pages = len(artifacts.reader.pages)
+        workers = _extraction_workers(num_pages, workers)
+        page_texts = _extract_pages_parallel(pdf_path, num_pages, workers) if workers > 1 else None
+        if page_texts is None:
+            page_texts = []
+            for i, page in enumerate(artifacts.reader.pages):
+                try:
+                    t = page.extract_text()
+                    page_texts.append((i + 1, (t or "").strip() or "(no text)"))
+                except Exception as e:
+                    raise PDFParseError(
+                        f"Failed to extract text from page {i + 1}: {pdf_path}. {type(e).__name__}: {e}",
+                        path=pdf_path,
+                        cause=e,
+                    ) from e
+        artifacts.page_texts = page_texts
+        if store is not None:
+            store.set_json(key, page_texts)
+    return artifacts.page_texts
+
+
+def _iter_page_texts(artifacts: PDFArtifacts, pdf_path: str) -> Iterator[tuple[int, str]]:
+    """
+    Per-page text one page at a time (cached page_texts are replayed, nothing is stored).
+    artifacts.lock is held per page only, so consumers may call other doc tools between pages.
+    """
+    with artifacts.lock:
+        cached = artifacts.page_texts
+        num_pages = len(artifacts.reader.pages)
+    if cached is not None:
+        yield from cached
+        return
+    for i in range(num_pages):
         try:
-            t = page.extract_text()
-            page_texts.append((i + 1, (t or "").strip() or "(no text)"))
+            with artifacts.lock:
+                t = artifacts.reader.pages[i].extract_text()
         except Exception as e:
             raise PDFParseError(
                 f"Failed to extract text from page {i + 1}: {pdf_path}. {type(e).__name__}: {e}",
                 path=pdf_path,
                 cause=e,
             ) from e
+        yield (i + 1, (t or "").strip() or "(no text)")
 
-    if chunk_by == "page":
-        segments = [ChunkSegment(text=t, page_no=p) for p, t in page_texts]
-        if not segments:
-            segments = [ChunkSegment(text="(no text extracted)", page_no=None)]
-    else:
-        full = "\n\n".join(t for _, t in page_texts)
-        chunks = _split_into_chunks(full, _CHUNK_SIZE, _CHUNK_OVERLAP)
-        segments = [ChunkSegment(text=c, page_no=None) for c in chunks]
-        if not segments:
-            segments = [ChunkSegment(text="(no text)", page_no=None)]
 
-    return PDFIngestionResult(segments=segments, source_path=pdf_path)
+def _extraction_workers(num_pages: int, workers: int | None) -> int:
+    """
+    Process count for text extraction: explicit workers, else AUDITOR_PDF_WORKERS, else the CPU
+    count. PDFs under _PARALLEL_MIN_PAGES pages are always extracted in-process.
+    """
+    if workers is None:
+        try:
+            workers = int(os.environ.get("AUDITOR_PDF_WORKERS") or 0) or os.cpu_count() or 1
+        except ValueError:
+            workers = os.cpu_count() or 1
+    if num_pages < _PARALLEL_MIN_PAGES:
+        return 1
+    return max(1, min(workers, num_pages // _PAGES_PER_TASK_MIN))
+
+
+def _extract_pages_parallel(pdf_path: str, num_pages: int, workers: int) -> list[tuple[int, str]] | None:
+    """
+    Split [0, num_pages) into contiguous page ranges, extract them in a process pool and
+    reassemble in page order. Returns None when no pool can be started (caller extracts serially).
+    """
+    # A few ranges per worker balances uneven pages; each task re-opens the PDF once
+    tasks = min(num_pages, workers * 4)
+    bounds = [num_pages * i // tasks for i in range(tasks + 1)]
+    # forkserver/spawn: safe to start from LangGraph's worker threads (fork is not)
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    try:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(method)) as pool:
+            results = list(pool.map(_extract_page_range, [pdf_path] * tasks, bounds[:-1], bounds[1:]))
+    except (OSError, BrokenProcessPool, NotImplementedError):
+        return None
+    page_texts: list[tuple[int, str]] = []
+    for texts, error in results:
+        page_texts.extend(texts)
+        if error is not None:
+            # First bad page in page order, worded like the serial path
+            page_no, type_name, message = error
+            raise PDFParseError(
+                f"Failed to extract text from page {page_no}: {pdf_path}. {type_name}: {message}",
+                path=pdf_path,
+            )
+    return page_texts
+
+
+def _extract_page_range(
+    pdf_path: str, start: int, end: int
+) -> tuple[list[tuple[int, str]], tuple[int, str, str] | None]:
+    """
+    Process-pool task: text of pages [start, end) as (page_no, text), plus the first failure as
+    (page_no, exception type, message); exceptions are not pickled back across the pool.
+    """
+    texts: list[tuple[int, str]] = []
+    try:
+        with open(pdf_path, "rb") as handle:
+            pages = PdfReader(handle).pages
+            for i in range(start, end):
+                t = pages[i].extract_text()
+                texts.append((i + 1, (t or "").strip() or "(no text)"))
+    except Exception as e:
+        return texts, (start + len(texts) + 1, type(e).__name__, str(e))
+    return texts, None
+
+
+def _remember(artifacts: PDFArtifacts) -> None:
+    """Re-apply the artifact cache's memory bound after derived artifacts were added."""
+    cache = default_pdf_cache()
+    if cache is not None:
+        cache.update(artifacts)
 
 
 def _split_into_chunks(text: str, size: int, overlap: int) -> list[str]:
@@ -232,6 +544,46 @@ def cross_reference_report_claims(
     return {"verified": verified, "unverified": unverified}
 
 
+def query_doc_batch(
+    store: DocStore | PDFIngestionResult, questions: list[str], max_tokens: int | None = None
+) -> list[str]:
+    """query_doc for many questions in one retrieval pass (e.g. every PDF rubric dimension)."""
+    return store.query_batch(questions, max_tokens=max_tokens)
+
+
+def _format_excerpts(relevant: list[str], max_tokens: int | None = None) -> str:
+    """
+    Join ranked chunks. With max_tokens, whole chunks are kept in rank order while they fit;
+    the top chunk alone over budget is cut at a word boundary.
+    """
+    if not relevant:
+        return "No relevant excerpts found."
+    if max_tokens is not None:
+        kept: list[str] = []
+        used = 0
+        for chunk in relevant:
+            tokens = estimate_tokens(chunk)
+            if used + tokens > max_tokens:
+                if not kept:
+                    kept.append(_truncate_tokens(chunk, max_tokens))
+                break
+            kept.append(chunk)
+            used += tokens
+        relevant = kept
+    return "\n\n---\n\n".join(relevant)
+
+
+def _truncate_tokens(text: str, max_tokens: int) -> str:
+    words: list[str] = []
+    used = 0
+    for word in text.split(" "):
+        used += estimate_tokens(word)
+        if used > max_tokens:
+            break
+        words.append(word)
+    return " ".join(words)
+
+
 def query_doc(store: DocStore | PDFIngestionResult, question: str) -> str:
     """Query the store (RAG retrieval over chunked segments). Accepts DocStore or PDFIngestionResult."""
     if hasattr(store, "query") and callable(getattr(store, "query")):
@@ -249,6 +601,7 @@ def extract_images_from_pdf(pdf_path: str) -> list[Any]:
 
     Uses pypdf page.images: iterates over each page's images and collects PIL Images
     (or raw bytes if .image is not available). If Pillow is not installed, returns [].
+    The decoded list is cached per PDF; use iter_pdf_images to decode only what is consumed.
 
     Limitation (VISION-1): Many PDFs embed diagrams as vector graphics (drawing operations)
     rather than embedded image objects. In those cases page.images may be empty even when
@@ -258,66 +611,176 @@ def extract_images_from_pdf(pdf_path: str) -> list[Any]:
     if not path.is_file():
         return []
 
-    images: list[Any] = []
     try:
-        reader = PdfReader(pdf_path)
-        for page in reader.pages:
-            img_attr = getattr(page, "images", None)
-            if img_attr is None:
-                continue
-            # pypdf 4+: page.images is iterable; each item is ImageFile (.image = PIL, .data = bytes). Requires Pillow.
-            for img_obj in img_attr:
-                try:
-                    if hasattr(img_obj, "image") and img_obj.image is not None:
-                        images.append(img_obj.image)
-                    elif hasattr(img_obj, "data") and img_obj.data:
-                        images.append(img_obj.data)
-                except ImportError:
-                    raise
-                except Exception:
-                    continue
-    except ImportError as e:
-        if "pillow" in str(e).lower() or "pypdf" in str(e).lower() or "image" in str(e).lower():
-            pass  # Return [] when pypdf[image] not installed
-        else:
+        artifacts = _open_pdf(pdf_path)
+    except PDFParseError:
+        return []
+    with artifacts.lock:
+        if artifacts.images is not None:
+            return list(artifacts.images)
+        images: list[Any] = []
+        try:
+            for page in artifacts.reader.pages:
+                images.extend(_page_images(page))
+            artifacts.images = images
+        except ImportError as e:
+            if not _missing_image_support(e):
+                raise
+        except Exception:
+            pass
+    _remember(artifacts)
+    return list(images)
+
+
+def iter_pdf_images(pdf_path: str) -> Iterator[Any]:
+    """
+    Lazily yield the images extract_images_from_pdf would return, decoding one page at a time;
+    a consumer that stops early (e.g. after the first N diagram candidates) never decodes the
+    rest, and yielded images are not cached. Missing/corrupt PDFs or no Pillow yield nothing.
+    """
+    if not Path(pdf_path).is_file():
+        return
+    try:
+        artifacts = _open_pdf(pdf_path)
+    except PDFParseError:
+        return
+    with artifacts.lock:
+        cached = artifacts.images
+        num_pages = len(artifacts.reader.pages)
+    if cached is not None:
+        yield from cached
+        return
+    for i in range(num_pages):
+        try:
+            with artifacts.lock:
+                page_images = _page_images(artifacts.reader.pages[i])
+        except ImportError as e:
+            if not _missing_image_support(e):
+                raise
+            return
+        except Exception:
+            return
+        yield from page_images
+
+
+def iter_pdf_image_refs(pdf_path: str, min_pixels: int = DEFAULT_MIN_PIXELS) -> Iterator[PDFImageRef]:
+    """
+    Lazily yield PDFImageRefs (encoded bytes on demand, format, declared size, page number) for
+    embedded images of at least min_pixels declared pixels, page by page. Nothing is decoded:
+    icons and logos are skipped by their declared size. Missing/corrupt PDFs yield nothing.
+    """
+    if not Path(pdf_path).is_file():
+        return
+    try:
+        artifacts = _open_pdf(pdf_path)
+    except PDFParseError:
+        return
+    with artifacts.lock:
+        num_pages = len(artifacts.reader.pages)
+    for i in range(num_pages):
+        try:
+            with artifacts.lock:
+                refs = page_image_refs(artifacts.reader.pages[i], i + 1, min_pixels, artifacts.lock)
+        except Exception:
+            continue
+        yield from refs
+
+
+def extract_image_refs(pdf_path: str, min_pixels: int = DEFAULT_MIN_PIXELS) -> list[PDFImageRef]:
+    """All PDFImageRefs of the PDF (see iter_pdf_image_refs); no image is decoded."""
+    return list(iter_pdf_image_refs(pdf_path, min_pixels))
+
+
+def _page_images(page: Any) -> list[Any]:
+    """Decoded images of one page: PIL Images, or raw bytes when .image is unavailable."""
+    images: list[Any] = []
+    img_attr = getattr(page, "images", None)
+    if img_attr is None:
+        return images
+    # pypdf 4+: page.images is iterable; each item is ImageFile (.image = PIL, .data = bytes). Requires Pillow.
+    for img_obj in img_attr:
+        try:
+            if hasattr(img_obj, "image") and img_obj.image is not None:
+                images.append(img_obj.image)
+            elif hasattr(img_obj, "data") and img_obj.data:
+                images.append(img_obj.data)
+        except ImportError:
             raise
-    except Exception:
-        pass
+        except Exception:
+            continue
     return images
 
 
+def _missing_image_support(e: ImportError) -> bool:
+    """True when e means pypdf[image] / Pillow is not installed (callers then return no images)."""
+    return "pillow" in str(e).lower() or "pypdf" in str(e).lower() or "image" in str(e).lower()
+
+
 def analyze_diagram(image: Any, question: str) -> str:
     """
     Use vision-capable LLM to answer flow/structure questions about the image.
+    image: PDFImageRef (sent in its original JPEG/PNG encoding), PIL Image, or encoded JPEG/PNG
+    bytes; images over AUDITOR_VISION_MAX_PIXELS are downscaled before sending.
     Optional at runtime; if no vision API key or LLM unavailable, returns a stub message.
+    Answers are served from / stored in the persistent LLM response cache (stubs are never cached);
+    model calls go through the LLM scheduler at high priority (they gate evidence aggregation).
     Requires langchain-openai (or equivalent) for real vision; otherwise returns stub.
     """
     try:
         from langchain_core.messages import HumanMessage
 
-        try:
-            from langchain_openai import ChatOpenAI
-        except ImportError:
-            return "[Vision analysis skipped: install langchain-openai and set OPENAI_API_KEY for diagram analysis.]"
-
-        model = ChatOpenAI(model="gpt-4o", temperature=0)
-        # Support PIL Image or bytes
-        if hasattr(image, "save"):
+        payload = _vision_payload(image)
+        if payload is not None:
             import base64
-            import io
 
-            buf = io.BytesIO()
-            image.save(buf, format="PNG")
-            img_b64 = base64.standard_b64encode(buf.getvalue()).decode()
+            data, mime_type = payload
+            img_b64 = base64.standard_b64encode(data).decode()
             msg = HumanMessage(
                 content=[
                     {"type": "text", "text": question},
-                    {"type": "image_url", "image_url": {"url": f"data:image/png;base64,{img_b64}"}},
+                    {"type": "image_url", "image_url": {"url": f"data:{mime_type};base64,{img_b64}"}},
                 ]
             )
         else:
             msg = HumanMessage(content=[{"type": "text", "text": question}])
-        response = model.invoke([msg])
-        return response.content if hasattr(response, "content") else str(response)
+        key = llm_cache_key(VISION_MODEL, VISION_TEMPERATURE, [msg])
+        cached = get_cached_response(key)
+        if cached is not None:
+            return cached
+
+        try:
+            from langchain_openai import ChatOpenAI
+        except ImportError:
+            return "[Vision analysis skipped: install langchain-openai and set OPENAI_API_KEY for diagram analysis.]"
+
+        model = ChatOpenAI(model=VISION_MODEL, temperature=VISION_TEMPERATURE, max_retries=0)
+        response = default_llm_scheduler().call(
+            lambda: model.invoke([msg]), estimate_request_tokens([msg]), priority=PRIORITY_HIGH
+        )
+        answer = response.content if hasattr(response, "content") else str(response)
+        if isinstance(answer, str) and answer:
+            put_cached_response(key, answer)
+        return answer
     except Exception as e:
         return f"[Vision analysis skipped or failed: {e}. Set OPENAI_API_KEY for GPT-4o vision.]"
+
+
+def _vision_payload(image: Any) -> tuple[bytes, str] | None:
+    """(encoded bytes, mime type) to send for image, or None when it is not an image we can send."""
+    max_pixels = vision_max_pixels()
+    if isinstance(image, PDFImageRef):
+        return image.encoded(max_pixels)
+    if hasattr(image, "save"):
+        return encode_image(image, max_pixels)
+    if isinstance(image, (bytes, bytearray)):
+        mime_type = sniff_image_type(bytes(image))
+        if mime_type is None:
+            return None
+        if max_pixels is not None:
+            from PIL import Image
+
+            decoded = Image.open(io.BytesIO(image))  # reads the header only
+            if decoded.width * decoded.height > max_pixels:
+                return encode_image(decoded, max_pixels, jpeg=mime_type == "image/jpeg")
+        return bytes(image), mime_type
+    return None
@@ -0,0 +1,208 @@
+"""
+Long-lived git session for RepoInvestigator: one repository handle answers ls-files, log,
+rev-parse and blob reads. Object lookups go through a persistent `git cat-file --batch`
+channel instead of one subprocess per query; results are cached per session.
+Sandboxed git via subprocess only (SRS NFR-4, NFR-5).
+"""
+
+from __future__ import annotations
+
+import subprocess
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from src.tools.repo_tools import iter_git_history, parse_ls_files_stage
+
+_DEFAULT_BLOB_CACHE_BYTES = 32 * 1024 * 1024
+
+
+class GitSession:
+    """
+    Open a repository once; query it many times. Usable as a context manager.
+
+    - ls_files() / ls_files_stage() / log(): one git process each, at most once per session (cached).
+    - rev_parse() / read_blob() / read_text(): served by a single persistent
+      `git cat-file --batch` process. Resolved (rev, path) -> sha mappings and blob
+      contents (LRU, bounded by blob_cache_bytes) are cached, so repeated reads cost a
+      dict lookup. On partial clones, missing blobs are fetched on demand by git.
+
+    All methods degrade to empty/None results when git is unavailable or the path
+    is not a repository, mirroring the standalone repo tools.
+    """
+
+    def __init__(self, repo_path: str, blob_cache_bytes: int = _DEFAULT_BLOB_CACHE_BYTES):
+        self.repo_path = str(Path(repo_path))
+        self.blob_cache_bytes = blob_cache_bytes
+        self.processes_spawned = 0
+        self.blob_hits = 0
+        self.blob_misses = 0
+        self._lock = threading.Lock()
+        self._batch: subprocess.Popen | None = None
+        self._ls_files: list[str] | None = None
+        self._stage: dict[str, str] | None = None
+        self._log: dict[bool, list[dict]] = {}
+        self._shas: dict[str, str | None] = {}  # object spec -> sha (None = missing)
+        self._blobs: OrderedDict[str, bytes] = OrderedDict()
+        self._blob_bytes = 0
+
+    def __enter__(self) -> GitSession:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Terminate the batch process (idempotent)."""
+        with self._lock:
+            proc, self._batch = self._batch, None
+        if proc is None:
+            return
+        try:
+            if proc.stdin:
+                proc.stdin.close()
+            proc.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            proc.kill()
+            proc.wait()
+        finally:
+            if proc.stdout:
+                proc.stdout.close()
+
+    def ls_files(self) -> list[str]:
+        """Tracked paths (relative), from the index; includes paths outside a sparse checkout."""
+        if self._ls_files is None:
+            self._ls_files = []
+            if Path(self.repo_path).is_dir():
+                try:
+                    self.processes_spawned += 1
+                    result = subprocess.run(
+                        ["git", "ls-files", "-z"],
+                        cwd=self.repo_path,
+                        capture_output=True,
+                        timeout=30,
+                    )
+                except (FileNotFoundError, subprocess.TimeoutExpired):
+                    result = None
+                if result is not None and result.returncode == 0:
+                    self._ls_files = [
+                        p for p in result.stdout.decode("utf-8", errors="replace").split("\0") if p
+                    ]
+        return list(self._ls_files)
+
+    def ls_files_stage(self) -> dict[str, str]:
+        """Tracked path -> blob sha from the index (`git ls-files -s`), cached; reads no file."""
+        if self._stage is None:
+            self._stage = {}
+            if Path(self.repo_path).is_dir():
+                try:
+                    self.processes_spawned += 1
+                    result = subprocess.run(
+                        ["git", "ls-files", "-s", "-z"],
+                        cwd=self.repo_path,
+                        capture_output=True,
+                        timeout=30,
+                    )
+                except (FileNotFoundError, subprocess.TimeoutExpired):
+                    result = None
+                if result is not None and result.returncode == 0:
+                    self._stage = parse_ls_files_stage(result.stdout)
+        return dict(self._stage)
+
+    def log(self, numstat: bool = False) -> list[dict]:
+        """Commit history oldest-first (same entries as extract_git_history), cached."""
+        if numstat not in self._log:
+            self.processes_spawned += 1
+            self._log[numstat] = list(iter_git_history(self.repo_path, numstat=numstat))
+        return [dict(e) for e in self._log[numstat]]
+
+    def rev_parse(self, rev: str = "HEAD") -> str | None:
+        """Full object id for rev (any cat-file object spec), or None if it does not resolve."""
+        if rev not in self._shas:
+            header = self._request(rev, want_content=False)
+            self._shas[rev] = header[0] if header else None
+        return self._shas[rev]
+
+    def read_blob(self, path: str, rev: str = "HEAD") -> bytes | None:
+        """Contents of path at rev, or None if the path is missing or not a file."""
+        spec = f"{rev}:{path.strip('/')}"
+        sha = self._shas.get(spec)
+        if sha is not None and sha in self._blobs:
+            self.blob_hits += 1
+            self._blobs.move_to_end(sha)
+            return self._blobs[sha]
+        if spec in self._shas and sha is None:
+            return None
+        self.blob_misses += 1
+        result = self._request(spec, want_content=True)
+        if result is None or result[1] != "blob":
+            self._shas[spec] = None
+            return None
+        sha, _, data = result
+        self._shas[spec] = sha
+        self._remember_blob(sha, data)
+        return data
+
+    def read_text(self, path: str, rev: str = "HEAD") -> str | None:
+        data = self.read_blob(path, rev)
+        return data.decode("utf-8", errors="replace") if data is not None else None
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "processes_spawned": self.processes_spawned,
+            "blob_hits": self.blob_hits,
+            "blob_misses": self.blob_misses,
+            "cached_blobs": len(self._blobs),
+            "cached_blob_bytes": self._blob_bytes,
+        }
+
+    def _remember_blob(self, sha: str, data: bytes) -> None:
+        if len(data) > self.blob_cache_bytes or sha in self._blobs:
+            return
+        self._blobs[sha] = data
+        self._blob_bytes += len(data)
+        while self._blob_bytes > self.blob_cache_bytes and self._blobs:
+            _, evicted = self._blobs.popitem(last=False)
+            self._blob_bytes -= len(evicted)
+
+    def _ensure_batch(self) -> subprocess.Popen | None:
+        if self._batch is None and Path(self.repo_path).is_dir():
+            try:
+                self._batch = subprocess.Popen(
+                    ["git", "cat-file", "--batch"],
+                    cwd=self.repo_path,
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL,
+                )
+                self.processes_spawned += 1
+            except FileNotFoundError:
+                return None
+        return self._batch
+
+    def _request(self, spec: str, want_content: bool) -> tuple[str, str, bytes] | None:
+        """
+        Send one object spec over the batch channel. Returns (sha, type, content) or None when
+        the object is missing. The content is always drained from the pipe to keep it in sync.
+        """
+        if "\n" in spec:
+            return None
+        with self._lock:
+            proc = self._ensure_batch()
+            if proc is None or proc.stdin is None or proc.stdout is None:
+                return None
+            try:
+                proc.stdin.write(spec.encode("utf-8") + b"\n")
+                proc.stdin.flush()
+                header = proc.stdout.readline().decode("utf-8", errors="replace").rstrip("\n")
+                parts = header.split(" ")
+                if len(parts) != 3 or parts[1] in ("missing", "ambiguous"):
+                    return None
+                sha, obj_type, size = parts[0], parts[1], int(parts[2])
+                content = proc.stdout.read(size)
+                proc.stdout.read(1)  # trailing LF after contents
+            except (OSError, ValueError):
+                proc.kill()
+                self._batch = None
+                return None
+        return (sha, obj_type, content if want_content else b"")
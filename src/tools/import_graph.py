@@ -0,0 +1,268 @@
+"""
+Module import graph for RepoInvestigator, built from the AST index (import statements only),
+and a StateGraph locator on top of it: picks the repo's primary StateGraph construction site
+and follows the helpers it actually uses that wire nodes/edges (add_node, add_edge). Other
+graphs (scripts, examples, unrelated subsystems) are left out of the analysis.
+Text prefilters over the indexed sources keep the search cheap on repos with thousands of
+modules; only candidate modules are inspected beyond their import statements.
+"""
+
+from __future__ import annotations
+
+import ast
+from collections import deque
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from src.tools.ast_engine import call_name
+
+if TYPE_CHECKING:
+    from src.tools.ast_index import AstIndex
+
+# Preferred construction sites, in order (the conventional locations)
+CONVENTIONAL_GRAPH_FILES = ("src/graph.py", "graph.py")
+_WIRING_MARKERS = ("add_node", "add_edge", "add_conditional_edges")
+# How many import hops to follow from a construction site to helper modules
+_HELPER_DEPTH = 3
+# Directories whose graphs are demos or tooling, never the audited graph when another site exists
+_AUXILIARY_DIRS = frozenset({"scripts", "examples", "example", "docs", "benchmarks", "notebooks"})
+
+
+@dataclass
+class ImportGraph:
+    """Repo-internal imports: module path -> imported module paths; dotted name -> path."""
+
+    modules: dict[str, str] = field(default_factory=dict)  # dotted name -> path
+    imports: dict[str, set[str]] = field(default_factory=dict)  # path -> imported paths
+
+    def imported_by(self, path: str) -> set[str]:
+        return {p for p, targets in self.imports.items() if path in targets}
+
+    def reachable(self, path: str, depth: int) -> list[str]:
+        """Modules imported (transitively, up to depth hops) by path, nearest first."""
+        seen = {path}
+        order: list[str] = []
+        queue = deque([(path, 0)])
+        while queue:
+            current, hops = queue.popleft()
+            if hops == depth:
+                continue
+            for target in sorted(self.imports.get(current, ())):
+                if target not in seen:
+                    seen.add(target)
+                    order.append(target)
+                    queue.append((target, hops + 1))
+        return order
+
+
+def module_names(path: str) -> list[str]:
+    """Dotted names a repo file may be imported as: src/app/flow.py -> src.app.flow, app.flow."""
+    parts = path[:-3].split("/") if path.endswith(".py") else path.split("/")
+    if parts[-1] == "__init__":
+        parts = parts[:-1]
+    if not parts:
+        return []
+    names = [".".join(parts)]
+    if parts[0] == "src" and len(parts) > 1:
+        names.append(".".join(parts[1:]))
+    return names
+
+
+def build_import_graph(index: AstIndex) -> ImportGraph:
+    """Resolve each indexed module's import statements (module level, incl. if/try blocks) to repo paths."""
+    graph = ImportGraph()
+    for path in index.paths():
+        for name in module_names(path):
+            graph.modules.setdefault(name, path)
+    for path in index.paths():
+        tree = index.get(path)
+        targets: set[str] = set()
+        for stmt in _module_level_statements(tree.body if tree else []):
+            for name in _imported_names(stmt, path):
+                resolved = graph.modules.get(name)
+                if resolved and resolved != path:
+                    targets.add(resolved)
+        graph.imports[path] = targets
+    return graph
+
+
+def locate_graph_files(index: AstIndex, graph: ImportGraph | None = None) -> list[str]:
+    """
+    Files that make up the repo's StateGraph wiring: the primary construction site followed by
+    the helper modules it reaches that call add_node / add_edge. The primary site is the module
+    calling StateGraph(...) (tests excluded) that ranks first by: conventional location, outside
+    scripts/examples/docs, imported by other modules, compiles the graph, shallowest path.
+    Helpers are followed through the functions, classes and assignments the site actually uses
+    (up to _HELPER_DEPTH hops), not whole imported modules. Empty when no module builds a graph.
+    """
+    sites = [
+        path
+        for path, source in index.sources.items()
+        if "StateGraph" in source and not _is_test_path(path) and _constructs_state_graph(index.get(path))
+    ]
+    if not sites:
+        return []
+    graph = graph or build_import_graph(index)
+    site = min(sites, key=lambda path: _site_rank(path, index, graph))
+    files = [site]
+    tree = index.get(site)
+    pending = _references(tree.body if tree else [], _import_bindings(tree, site, graph))
+    seen = {site}
+    for _ in range(_HELPER_DEPTH):
+        following: dict[str, set[str]] = {}
+        for helper, names in sorted(pending.items()):
+            if helper in seen or _is_test_path(helper):
+                continue
+            seen.add(helper)
+            helper_tree = index.get(helper)
+            if helper_tree is None:
+                continue
+            bindings = _import_bindings(helper_tree, helper, graph)
+            used = _used_definitions(helper_tree, names)
+            if any(_calls_any(node, _WIRING_MARKERS) for node in used):
+                files.append(helper)
+            refs = _references(used, bindings)
+            # Names re-exported by the helper (from .wiring import wire) lead on to their module
+            for name in names:
+                target, symbol = bindings.get(name, (None, None))
+                if target and symbol:
+                    refs.setdefault(target, set()).add(symbol)
+            for target, symbols in refs.items():
+                following.setdefault(target, set()).update(symbols)
+        pending = following
+    return files
+
+
+def _site_rank(path: str, index: AstIndex, graph: ImportGraph) -> tuple:
+    conventional = CONVENTIONAL_GRAPH_FILES.index(path) if path in CONVENTIONAL_GRAPH_FILES else 2
+    auxiliary = any(part in _AUXILIARY_DIRS for part in path.split("/")[:-1])
+    exported = any(not _is_test_path(importer) for importer in graph.imported_by(path))
+    return (conventional, auxiliary, not exported, not _compiles_graph(index.get(path)), path.count("/"), path)
+
+
+def _import_bindings(tree: ast.Module | None, path: str, graph: ImportGraph) -> dict[str, tuple[str, str | None]]:
+    """Local names bound by repo-internal imports: name -> (module path, symbol or None for a module)."""
+    bindings: dict[str, tuple[str, str | None]] = {}
+    for stmt in _module_level_statements(tree.body if tree else []):
+        if isinstance(stmt, ast.Import):
+            for alias in stmt.names:
+                resolved = graph.modules.get(alias.name)
+                if resolved:
+                    bindings[alias.asname or alias.name] = (resolved, None)
+        elif isinstance(stmt, ast.ImportFrom):
+            base = _import_base(stmt, path)
+            for alias in stmt.names:
+                local = alias.asname or alias.name
+                submodule = graph.modules.get(f"{base}.{alias.name}" if base else alias.name)
+                if submodule:
+                    bindings[local] = (submodule, None)
+                elif base in graph.modules:
+                    bindings[local] = (graph.modules[base], alias.name)
+    return bindings
+
+
+def _references(nodes: list[ast.AST], bindings: dict[str, tuple[str, str | None]]) -> dict[str, set[str]]:
+    """Repo symbols used by nodes, grouped by module: wire(g) and wiring.wire(g) both name wiring.wire."""
+    refs: dict[str, set[str]] = {}
+    for node in nodes:
+        for sub in ast.walk(node):
+            if not isinstance(sub, (ast.Name, ast.Attribute)) or not isinstance(sub.ctx, ast.Load):
+                continue
+            dotted = call_name(sub) or ""
+            target, symbol = bindings.get(dotted, (None, None))
+            if target is None and "." in dotted:
+                prefix, attr = dotted.rsplit(".", 1)
+                target, symbol = bindings.get(prefix, (None, None))
+                symbol = attr if target and symbol is None else None
+            if target and symbol:
+                refs.setdefault(target, set()).add(symbol)
+    return refs
+
+
+def _used_definitions(tree: ast.Module, names: set[str]) -> list[ast.stmt]:
+    """Top-level defs and assignments named in names, plus the module-local ones they use in turn."""
+    defined: dict[str, ast.stmt] = {}
+    for stmt in tree.body:
+        if isinstance(stmt, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            defined[stmt.name] = stmt
+        elif isinstance(stmt, (ast.Assign, ast.AnnAssign)):
+            for target in stmt.targets if isinstance(stmt, ast.Assign) else [stmt.target]:
+                if isinstance(target, ast.Name):
+                    defined[target.id] = stmt
+    used: list[ast.stmt] = []
+    queue = deque(sorted(names))
+    while queue:
+        stmt = defined.pop(queue.popleft(), None)
+        if stmt is None or stmt in used:
+            continue
+        used.append(stmt)
+        queue.extend(sub.id for sub in ast.walk(stmt) if isinstance(sub, ast.Name) and sub.id in defined)
+    return used
+
+
+def _module_level_statements(body: list[ast.stmt]) -> list[ast.stmt]:
+    """Top-level statements, descending into if/try blocks (guarded imports) but not into defs."""
+    out: list[ast.stmt] = []
+    stack = list(reversed(body))
+    while stack:
+        stmt = stack.pop()
+        out.append(stmt)
+        if isinstance(stmt, (ast.If, ast.Try)):
+            nested = list(stmt.body) + list(stmt.orelse)
+            if isinstance(stmt, ast.Try):
+                nested += [s for h in stmt.handlers for s in h.body] + list(stmt.finalbody)
+            stack.extend(reversed(nested))
+    return out
+
+
+def _imported_names(stmt: ast.stmt, path: str) -> list[str]:
+    """Candidate dotted module names for an import statement (from-imports may name submodules)."""
+    if isinstance(stmt, ast.Import):
+        return [alias.name for alias in stmt.names]
+    if not isinstance(stmt, ast.ImportFrom):
+        return []
+    base = _import_base(stmt, path)
+    names = [base] if base else []
+    names += [f"{base}.{alias.name}" if base else alias.name for alias in stmt.names]
+    return names
+
+
+def _import_base(stmt: ast.ImportFrom, path: str) -> str:
+    """Absolute dotted module a from-import reads from (relative levels resolved against path)."""
+    base = stmt.module or ""
+    if stmt.level:
+        package = path.split("/")[:-1]
+        if stmt.level > 1:
+            package = package[: len(package) - (stmt.level - 1)]
+        base = ".".join([*package, base] if base else package)
+    return base
+
+
+def _constructs_state_graph(tree: ast.Module | None) -> bool:
+    return _calls_any(tree, ("StateGraph",))
+
+
+def _compiles_graph(tree: ast.Module | None) -> bool:
+    """True if tree calls .compile() on anything but the re module (builder.compile())."""
+    return tree is not None and any(
+        isinstance(node, ast.Call)
+        and isinstance(node.func, ast.Attribute)
+        and node.func.attr == "compile"
+        and call_name(node.func) != "re.compile"
+        for node in ast.walk(tree)
+    )
+
+
+def _calls_any(tree: ast.AST | None, names: tuple[str, ...]) -> bool:
+    """True if tree calls a function/method whose final name component is in names."""
+    if tree is None:
+        return False
+    return any(
+        isinstance(node, ast.Call) and (call_name(node.func) or "").rsplit(".", 1)[-1] in names
+        for node in ast.walk(tree)
+    )
+
+
+def _is_test_path(path: str) -> bool:
+    name = path.rsplit("/", 1)[-1]
+    return path.startswith("tests/") or "/tests/" in path or name.startswith("test_") or name == "conftest.py"
@@ -0,0 +1,148 @@
+"""
+Persistent key-value cache on SQLite (stdlib only) shared by the auditor's on-disk caches.
+Values are bytes (JSON helpers provided); entries carry an optional TTL, the store is
+size-bounded with least-recently-used eviction, and a version stamp clears the store when
+the producing logic changes. Hit/miss/eviction counters for observability.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+DEFAULT_CACHE_ROOT = Path.home() / ".cache" / "automaton_auditor"
+
+
+class KVCache:
+    """
+    SQLite-backed bytes cache. Safe to share across threads (one connection, serialized);
+    several processes may open the same file (SQLite locking, WAL journal).
+
+    - version: stored in the database; opening with a different version drops every entry,
+      so results produced by old logic are never served.
+    - max_bytes: total value size budget; set() evicts least-recently-used entries beyond it.
+    - ttl (per set): entries older than ttl seconds count as misses and are deleted on read.
+    """
+
+    def __init__(self, path: str | Path, max_bytes: int | None = None, version: str | int = ""):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.version = str(version)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, value BLOB NOT NULL,"
+            " size INTEGER NOT NULL, last_used REAL NOT NULL, expires REAL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used)")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        row = self._conn.execute("SELECT value FROM meta WHERE name = 'version'").fetchone()
+        if row is None or row[0] != self.version:
+            with self._conn:
+                self._conn.execute("DELETE FROM entries")
+                self._conn.execute("INSERT OR REPLACE INTO meta VALUES ('version', ?)", (self.version,))
+
+    def get(self, key: str) -> bytes | None:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT value, expires FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None or (row[1] is not None and row[1] <= now):
+                if row is not None:
+                    self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE entries SET last_used = ? WHERE key = ?", (now, key))
+            self.hits += 1
+            return bytes(row[0])
+
+    def set(self, key: str, value: bytes, ttl: float | None = None) -> None:
+        if self.max_bytes is not None and len(value) > self.max_bytes:
+            return
+        now = time.time()
+        expires = now + ttl if ttl is not None else None
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)", (key, value, len(value), now, expires)
+            )
+            self._evict()
+
+    def get_json(self, key: str) -> Any:
+        """Decoded JSON value, or None on a miss (or an undecodable entry)."""
+        data = self.get(key)
+        if data is None:
+            return None
+        try:
+            return json.loads(data)
+        except ValueError:
+            return None
+
+    def set_json(self, key: str, value: Any, ttl: float | None = None) -> None:
+        self.set(key, json.dumps(value, separators=(",", ":")).encode("utf-8"), ttl=ttl)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            entries, size = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": entries,
+            "size_bytes": size,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _evict(self) -> None:
+        """Drop expired entries, then least-recently-used ones until within max_bytes. Caller holds the lock."""
+        self._conn.execute("DELETE FROM entries WHERE expires IS NOT NULL AND expires <= ?", (time.time(),))
+        if self.max_bytes is None:
+            return
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._conn.execute("SELECT key, size FROM entries ORDER BY last_used").fetchall():
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            total -= size
+            self.evictions += 1
+
+
+def env_flag(name: str, default: bool) -> bool:
+    """Boolean env var: 1/true/yes/on or 0/false/no/off; anything else (or unset) -> default."""
+    value = os.environ.get(name, "").strip().lower()
+    if value in ("1", "true", "yes", "on"):
+        return True
+    if value in ("0", "false", "no", "off"):
+        return False
+    return default
+
+
+def env_max_bytes(name: str, default_mb: int) -> int:
+    """Size budget from an *_MAX_MB env var, in bytes (default_mb when unset or invalid)."""
+    try:
+        return int(os.environ.get(name) or default_mb) * 1024 * 1024
+    except ValueError:
+        return default_mb * 1024 * 1024
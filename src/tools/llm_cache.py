@@ -0,0 +1,118 @@
+"""
+Persistent LLM response cache (KVCache) in front of the judge and vision calls. Re-auditing
+unchanged evidence, as when tuning a rubric, replays every response instead of paying for it again.
+The key is a SHA-256 over canonical JSON of the model name, temperature, messages (system prompt
+and user content, images included) and the output schema version, so any change to the
+prompt, model or schema is a miss. Structured responses are stored as their model_dump() and
+validated back into the schema; text responses are stored as strings. Only successful responses
+are stored: fallbacks and stub messages are never cached.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any
+
+from pydantic import BaseModel
+
+from src.tools.kv_cache import DEFAULT_CACHE_ROOT, KVCache, env_flag, env_max_bytes
+
+# Bump when the stored response format changes; drops every cached response
+LLM_CACHE_VERSION = 1
+DEFAULT_LLM_CACHE_MAX_MB = 64
+# Entries expire after a week by default so provider-side model updates are eventually picked up
+DEFAULT_LLM_CACHE_TTL_HOURS = 168
+
+_default_cache: KVCache | None = None
+_default_lock = threading.Lock()
+
+
+def default_llm_cache() -> KVCache | None:
+    """
+    Process-wide on-disk LLM response cache, or None when bypassed. AUDITOR_LLM_CACHE=0 bypasses
+    it; AUDITOR_LLM_CACHE_DIR sets the directory; AUDITOR_LLM_CACHE_MAX_MB sets the size budget
+    (default 64, LRU eviction).
+    """
+    global _default_cache
+    if not env_flag("AUDITOR_LLM_CACHE", True):
+        return None
+    path = Path(os.environ.get("AUDITOR_LLM_CACHE_DIR") or DEFAULT_CACHE_ROOT) / "llm_responses.sqlite"
+    max_bytes = env_max_bytes("AUDITOR_LLM_CACHE_MAX_MB", DEFAULT_LLM_CACHE_MAX_MB)
+    with _default_lock:
+        cache = _default_cache
+        if cache is None or cache.path != path or cache.max_bytes != max_bytes:
+            cache = _default_cache = KVCache(path, max_bytes=max_bytes, version=LLM_CACHE_VERSION)
+        return cache
+
+
+def llm_cache_ttl() -> float | None:
+    """AUDITOR_LLM_CACHE_TTL_HOURS in seconds (default one week); 0 keeps entries until evicted."""
+    try:
+        hours = float(os.environ.get("AUDITOR_LLM_CACHE_TTL_HOURS") or DEFAULT_LLM_CACHE_TTL_HOURS)
+    except ValueError:
+        hours = DEFAULT_LLM_CACHE_TTL_HOURS
+    return hours * 3600 if hours > 0 else None
+
+
+def schema_version(schema: type[BaseModel] | None) -> str:
+    """Output schema identity: name plus a hash of its JSON schema ("text" for plain responses)."""
+    if schema is None:
+        return "text"
+    digest = hashlib.sha256(json.dumps(schema.model_json_schema(), sort_keys=True).encode("utf-8"))
+    return f"{schema.__name__}:{digest.hexdigest()[:16]}"
+
+
+def llm_cache_key(model: str, temperature: float, messages: list[Any], schema: type[BaseModel] | None = None) -> str:
+    """Canonical prompt hash: model, temperature, (role, content) of every message, schema version."""
+    payload = {
+        "model": model,
+        "temperature": temperature,
+        "messages": [[getattr(m, "type", type(m).__name__), getattr(m, "content", m)] for m in messages],
+        "schema": schema_version(schema),
+    }
+    canonical = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return "llm:" + hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def get_cached_response(key: str, schema: type[BaseModel] | None = None) -> Any:
+    """Cached response for key (schema instance or string), or None on a miss / bypass / stale entry."""
+    cache = default_llm_cache()
+    if cache is None:
+        return None
+    value = cache.get_json(key)
+    if value is None:
+        return None
+    if schema is None:
+        return value if isinstance(value, str) else None
+    try:
+        return schema.model_validate(value)
+    except ValueError:
+        return None
+
+
+def put_cached_response(key: str, response: Any) -> None:
+    """Store a successful response (pydantic model or string) under key with the configured TTL."""
+    cache = default_llm_cache()
+    if cache is None:
+        return
+    value = response.model_dump(mode="json") if isinstance(response, BaseModel) else response
+    cache.set_json(key, value, ttl=llm_cache_ttl())
+
+
+def llm_cache_stats() -> dict[str, Any]:
+    """Hit/miss counters of the process-wide LLM cache for report metadata ({"enabled": False} when bypassed)."""
+    cache = default_llm_cache()
+    if cache is None:
+        return {"enabled": False}
+    stats = cache.stats()
+    return {
+        "enabled": True,
+        "hits": stats["hits"],
+        "misses": stats["misses"],
+        "hit_rate": round(stats["hit_rate"], 3),
+        "entries": stats["entries"],
+    }
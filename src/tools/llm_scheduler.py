@@ -0,0 +1,325 @@
+"""
+Process-wide LLM request scheduler shared by every judge and vision call. Requests wait in one
+priority queue and are released only while the requests-per-minute and tokens-per-minute token
+buckets allow. Transient failures are retried with jittered exponential backoff: rate limits, 5xx,
+timeouts and connection errors. A server-sent Retry-After is honored, and on a 429 the whole
+scheduler pauses for that long, so parallel judges back off together instead of failing together.
+
+Buckets hold _BURST_SECONDS (half a provider window) of budget, so a cold start cannot spend a
+whole minute's quota at once.
+Token costs are estimated locally (prompt estimate + expected output) before the call.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, TypeVar
+
+from src.tools.chunking import estimate_tokens
+
+T = TypeVar("T")
+
+# Defaults match gpt-4o-mini usage tier 1 (500 RPM, 200k TPM)
+DEFAULT_RPM = 500
+DEFAULT_TPM = 200_000
+DEFAULT_MAX_RETRIES = 5
+# Lower runs first: vision answers gate the evidence aggregator, judges follow
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 10
+PRIORITY_LOW = 20
+# Expected completion size of a structured opinion; images cost a high-detail 1024px tile estimate
+DEFAULT_OUTPUT_TOKENS = 600
+_IMAGE_TOKENS = 765
+
+_BURST_SECONDS = 30.0
+_POLL_SECONDS = 0.05
+_RETRYABLE_STATUS = frozenset({408, 409, 429, 500, 502, 503, 504})
+_RETRYABLE_ERRORS = frozenset(
+    {"APIConnectionError", "APITimeoutError", "ConnectError", "ReadTimeout", "RemoteProtocolError"}
+)
+
+
+class TokenBucket:
+    """Refills at per_minute / 60 per second up to burst_seconds of budget (at least one unit)."""
+
+    def __init__(
+        self, per_minute: float, burst_seconds: float = _BURST_SECONDS, clock: Callable[[], float] = time.monotonic
+    ):
+        self.rate = per_minute / 60.0
+        self.capacity = max(1.0, self.rate * burst_seconds)
+        self.level = self.capacity
+        self._clock = clock
+        self._updated = clock()
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until amount (capped at capacity) is available; 0 when it is now."""
+        self._refill()
+        amount = min(amount, self.capacity)
+        return 0.0 if self.level >= amount else (amount - self.level) / self.rate
+
+    def consume(self, amount: float) -> None:
+        self._refill()
+        self.level -= min(amount, self.capacity)
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+
+@dataclass(order=True)
+class _Ticket:
+    priority: int
+    seq: int
+    tokens: int = field(compare=False)
+
+
+class LLMScheduler:
+    """
+    Rate limiter, priority queue and retry policy for LLM calls; safe to share across threads and
+    event loops. rpm / tpm of 0 (or None) disable that budget.
+
+    - call(fn, tokens, priority) / acall(coro_fn, ...): run fn once admitted, retrying transient errors.
+    - acquire / aacquire: admission only (for callers with their own retry loop).
+    """
+
+    def __init__(
+        self,
+        rpm: int | None = DEFAULT_RPM,
+        tpm: int | None = DEFAULT_TPM,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+        burst_seconds: float = _BURST_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.rpm, self.tpm, self.max_retries = rpm, tpm, max_retries
+        self.base_delay, self.max_delay = base_delay, max_delay
+        self._requests = TokenBucket(rpm, burst_seconds, clock) if rpm else None
+        self._tokens = TokenBucket(tpm, burst_seconds, clock) if tpm else None
+        self._clock = clock
+        self._cond = threading.Condition()
+        self._queue: list[_Ticket] = []
+        self._seq = itertools.count()
+        self._paused_until = 0.0
+        self.requests = 0
+        self.retries = 0
+        self.rate_limited = 0
+        self.waited_seconds = 0.0
+
+    # ----- admission -----
+
+    def acquire(self, tokens: int = 0, priority: int = PRIORITY_NORMAL) -> None:
+        """Block until this request is at the head of the queue and both budgets allow it."""
+        start = self._clock()
+        with self._cond:
+            ticket = self._enqueue(tokens, priority)
+            try:
+                while (wait := self._try_admit(ticket)) > 0:
+                    self._cond.wait(timeout=wait)
+            finally:
+                self._withdraw(ticket)
+            self.waited_seconds += self._clock() - start
+
+    async def aacquire(self, tokens: int = 0, priority: int = PRIORITY_NORMAL) -> None:
+        """acquire for coroutines: polls without blocking the event loop."""
+        start = self._clock()
+        with self._cond:
+            ticket = self._enqueue(tokens, priority)
+        try:
+            while True:
+                with self._cond:
+                    wait = self._try_admit(ticket)
+                    if wait <= 0:
+                        self.waited_seconds += self._clock() - start
+                        return
+                await asyncio.sleep(min(wait, _POLL_SECONDS))
+        finally:
+            with self._cond:
+                self._withdraw(ticket)
+
+    def pending(self) -> int:
+        """Requests waiting for admission."""
+        with self._cond:
+            return len(self._queue)
+
+    def _enqueue(self, tokens: int, priority: int) -> _Ticket:
+        ticket = _Ticket(priority, next(self._seq), tokens)
+        heapq.heappush(self._queue, ticket)
+        return ticket
+
+    def _withdraw(self, ticket: _Ticket) -> None:
+        """Drop a ticket that left without admission (cancelled, interrupted) so it cannot block the queue."""
+        if ticket in self._queue:
+            self._queue.remove(ticket)
+            heapq.heapify(self._queue)
+            self._cond.notify_all()
+
+    def _try_admit(self, ticket: _Ticket) -> float:
+        """0 and dequeue when ticket may run now, else seconds to wait. Caller holds the lock."""
+        if self._queue[0] is not ticket:
+            return _POLL_SECONDS
+        waits = [self._paused_until - self._clock()]
+        if self._requests is not None:
+            waits.append(self._requests.wait_time(1))
+        if self._tokens is not None:
+            waits.append(self._tokens.wait_time(ticket.tokens))
+        wait = max(waits)
+        if wait > 0:
+            return wait
+        if self._requests is not None:
+            self._requests.consume(1)
+        if self._tokens is not None:
+            self._tokens.consume(ticket.tokens)
+        heapq.heappop(self._queue)
+        self.requests += 1
+        self._cond.notify_all()
+        return 0.0
+
+    # ----- calls with retries -----
+
+    def call(self, fn: Callable[[], T], tokens: int = 0, priority: int = PRIORITY_NORMAL) -> T:
+        """fn() once admitted; transient errors are retried after a jittered backoff, others raise."""
+        attempt = 0
+        while True:
+            self.acquire(tokens, priority)
+            try:
+                return fn()
+            except Exception as e:
+                delay = self._backoff(e, attempt)
+                if delay is None:
+                    raise
+            attempt += 1
+            time.sleep(delay)
+
+    async def acall(self, fn: Callable[[], Awaitable[T]], tokens: int = 0, priority: int = PRIORITY_NORMAL) -> T:
+        """Async call: await fn() once admitted, same retry policy."""
+        attempt = 0
+        while True:
+            await self.aacquire(tokens, priority)
+            try:
+                return await fn()
+            except Exception as e:
+                delay = self._backoff(e, attempt)
+                if delay is None:
+                    raise
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    def _backoff(self, exc: Exception, attempt: int) -> float | None:
+        """Seconds to wait before retrying exc, or None when it is not retryable or retries are spent."""
+        if attempt >= self.max_retries or not is_retryable(exc):
+            return None
+        retry_after = retry_after_seconds(exc)
+        # Full jitter over the exponential step; a server-sent Retry-After is a floor
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+        with self._cond:
+            self.retries += 1
+            if status_code(exc) == 429:
+                self.rate_limited += 1
+                pause = retry_after if retry_after is not None else delay
+                self._paused_until = max(self._paused_until, self._clock() + pause)
+        if retry_after is not None:
+            delay = retry_after + random.uniform(0, min(self.base_delay, 0.1 * retry_after + 0.05))
+        return delay
+
+    def stats(self) -> dict[str, Any]:
+        with self._cond:
+            return {
+                "requests": self.requests,
+                "retries": self.retries,
+                "rate_limited": self.rate_limited,
+                "waited_seconds": round(self.waited_seconds, 3),
+            }
+
+
+def status_code(exc: BaseException) -> int | None:
+    """HTTP status of an SDK / urllib / httpx error, if any."""
+    for candidate in (getattr(exc, "status_code", None), getattr(exc, "code", None)):
+        if isinstance(candidate, int):
+            return candidate
+    code = getattr(getattr(exc, "response", None), "status_code", None)
+    return code if isinstance(code, int) else None
+
+
+def retry_after_seconds(exc: BaseException) -> float | None:
+    """Retry-After (seconds or HTTP date) or retry-after-ms header of an error response, if any."""
+    headers = getattr(exc, "headers", None) or getattr(getattr(exc, "response", None), "headers", None)
+    if not headers:
+        return None
+    value = headers.get("retry-after-ms")
+    if value is not None:
+        try:
+            return max(0.0, float(value) / 1000)
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """Rate limits, server errors, timeouts and connection failures; never parse/validation errors."""
+    status = status_code(exc)
+    if status is not None:
+        return status in _RETRYABLE_STATUS
+    return isinstance(exc, (ConnectionError, TimeoutError)) or type(exc).__name__ in _RETRYABLE_ERRORS
+
+
+def estimate_request_tokens(messages: list[Any], output_tokens: int = DEFAULT_OUTPUT_TOKENS) -> int:
+    """TPM cost of a chat request: estimated prompt tokens (text parts, a flat cost per image) + output."""
+    total = output_tokens
+    for message in messages:
+        content = getattr(message, "content", message)
+        parts = content if isinstance(content, list) else [content]
+        for part in parts:
+            if isinstance(part, str):
+                total += estimate_tokens(part)
+            elif isinstance(part, dict) and part.get("type") == "image_url":
+                total += _IMAGE_TOKENS
+            elif isinstance(part, dict):
+                total += estimate_tokens(str(part.get("text", "")))
+    return total
+
+
+_default_scheduler: LLMScheduler | None = None
+_default_lock = threading.Lock()
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(0, int(os.environ.get(name) or default))
+    except ValueError:
+        return default
+
+
+def default_llm_scheduler() -> LLMScheduler:
+    """
+    Process-wide scheduler for judge and vision calls. AUDITOR_LLM_RPM / AUDITOR_LLM_TPM set the
+    budgets (0 = unlimited), AUDITOR_LLM_MAX_RETRIES the retries of transient errors per call.
+    """
+    global _default_scheduler
+    rpm = _env_int("AUDITOR_LLM_RPM", DEFAULT_RPM)
+    tpm = _env_int("AUDITOR_LLM_TPM", DEFAULT_TPM)
+    max_retries = _env_int("AUDITOR_LLM_MAX_RETRIES", DEFAULT_MAX_RETRIES)
+    with _default_lock:
+        scheduler = _default_scheduler
+        if scheduler is None or (scheduler.rpm, scheduler.tpm, scheduler.max_retries) != (rpm, tpm, max_retries):
+            scheduler = _default_scheduler = LLMScheduler(rpm=rpm, tpm=tpm, max_retries=max_retries)
+        return scheduler
@@ -0,0 +1,195 @@
+"""
+Parse-once PDF artifact cache shared by DocAnalyst, VisionInspector and EvidenceAggregator.
+Entries are keyed by the SHA-256 of the file contents, so every node that opens the same PDF
+in this process reuses one PdfReader and its derived artifacts (page texts, chunk segments,
+images). The file is hashed in blocks and the reader pages from an open file handle, so the
+PDF bytes themselves are never held in memory. Memory-bounded with LRU eviction; counters report parses performed and avoided.
+default_pdf_text_store() is the on-disk counterpart: extracted page text, segments and retrieval
+indexes persisted across processes, keyed by the same content hash.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, BinaryIO
+
+import pypdf
+from pypdf import PdfReader
+
+from src.tools.kv_cache import DEFAULT_CACHE_ROOT, KVCache, env_flag, env_max_bytes
+
+DEFAULT_MAX_MB = 256
+DEFAULT_TEXT_STORE_MAX_MB = 128
+# Bump when page-text extraction, chunking or index layout changes (stored entries are dropped).
+# The pypdf version is part of the stamp: extract_text output differs between releases.
+PDF_TEXT_STORE_VERSION = 2
+
+
+@dataclass
+class PDFArtifacts:
+    """One parsed PDF and everything derived from it. Derived fields are filled lazily by doc_tools."""
+
+    sha256: str
+    source_path: str
+    reader: PdfReader
+    page_texts: list[tuple[int, str]] | None = None  # (1-based page_no, text)
+    segments: dict[str, list[Any]] = field(default_factory=dict)  # chunk_by -> ChunkSegments
+    indexes: dict[str, Any] = field(default_factory=dict)  # chunk_by -> retrieval index
+    images: list[Any] | None = None
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def estimated_bytes(self) -> int:
+        """Approximate memory held: extracted text, segments and decoded images (file bytes stay on disk)."""
+        size = 0
+        if self.page_texts:
+            size += sum(len(t) for _, t in self.page_texts)
+        for segments in self.segments.values():
+            size += sum(len(getattr(s, "text", "")) for s in segments)
+        for image in self.images or []:
+            if hasattr(image, "size") and hasattr(image, "getbands"):
+                width, height = image.size
+                size += width * height * len(image.getbands())
+            elif isinstance(image, (bytes, bytearray)):
+                size += len(image)
+        return size
+
+
+def file_sha256(handle: BinaryIO) -> str:
+    """SHA-256 of an open binary file, read in blocks from the start."""
+    handle.seek(0)
+    return hashlib.file_digest(handle, "sha256").hexdigest()
+
+
+def open_pdf_artifacts(pdf_path: str | Path, handle: BinaryIO, sha256: str) -> PDFArtifacts:
+    """
+    Parse the PDF on an open handle. The reader keeps the handle and reads objects from disk on
+    demand; the handle is closed once the artifacts are garbage collected.
+    Raises whatever PdfReader raises on corrupt input.
+    """
+    handle.seek(0)
+    artifacts = PDFArtifacts(sha256=sha256, source_path=str(pdf_path), reader=PdfReader(handle))
+    weakref.finalize(artifacts, handle.close)
+    return artifacts
+
+
+class PDFArtifactCache:
+    """
+    Per-process LRU of PDFArtifacts keyed by content hash. get() hashes the file and returns the
+    cached entry or parses it once (concurrent callers for the same content wait for one parse).
+    Callers that add derived artifacts call update() so the memory bound is re-applied.
+    """
+
+    def __init__(self, max_bytes: int | None = DEFAULT_MAX_MB * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.parses = 0
+        self.parses_avoided = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, PDFArtifacts] = OrderedDict()
+        self._sizes: dict[str, int] = {}
+        self._parse_locks: dict[str, threading.Lock] = {}
+
+    def get(self, pdf_path: str) -> PDFArtifacts:
+        """
+        Artifacts for the PDF at pdf_path. Raises FileNotFoundError if missing and whatever
+        PdfReader raises on corrupt input (failures are not cached).
+        """
+        handle = open(pdf_path, "rb")
+        try:
+            sha = file_sha256(handle)
+            with self._lock:
+                parse_lock = self._parse_locks.setdefault(sha, threading.Lock())
+            with parse_lock:
+                with self._lock:
+                    entry = self._entries.get(sha)
+                    if entry is not None:
+                        self._entries.move_to_end(sha)
+                        self.parses_avoided += 1
+                        return entry
+                # Hashed and parsed through one handle: a file replaced meanwhile cannot mix contents
+                entry = open_pdf_artifacts(pdf_path, handle, sha)
+                handle = None  # owned by entry now
+                with self._lock:
+                    self.parses += 1
+                    self._entries[sha] = entry
+                    self._parse_locks.pop(sha, None)
+                self.update(entry)
+                return entry
+        finally:
+            if handle is not None:
+                handle.close()
+
+    def update(self, entry: PDFArtifacts) -> None:
+        """Re-measure an entry after derived artifacts were added; evict LRU entries over budget."""
+        with self._lock:
+            if entry.sha256 not in self._entries:
+                return
+            self._sizes[entry.sha256] = entry.estimated_bytes()
+            if self.max_bytes is None:
+                return
+            while len(self._entries) > 1 and sum(self._sizes.values()) > self.max_bytes:
+                sha, _ = self._entries.popitem(last=False)
+                self._sizes.pop(sha, None)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "parses": self.parses,
+                "parses_avoided": self.parses_avoided,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "size_bytes": sum(self._sizes.values()),
+            }
+
+
+_default_cache: PDFArtifactCache | None = None
+_default_lock = threading.Lock()
+
+
+def default_pdf_cache() -> PDFArtifactCache | None:
+    """
+    Process-wide PDFArtifactCache configured from env, or None when disabled.
+    AUDITOR_PDF_CACHE=0 disables it; AUDITOR_PDF_CACHE_MAX_MB sets the memory bound (default 256).
+    """
+    global _default_cache
+    if not env_flag("AUDITOR_PDF_CACHE", True):
+        return None
+    max_bytes = env_max_bytes("AUDITOR_PDF_CACHE_MAX_MB", DEFAULT_MAX_MB)
+    with _default_lock:
+        if _default_cache is None or _default_cache.max_bytes != max_bytes:
+            _default_cache = PDFArtifactCache(max_bytes=max_bytes)
+        return _default_cache
+
+
+_default_text_store: KVCache | None = None
+
+
+def default_pdf_text_store() -> KVCache | None:
+    """
+    Process-wide on-disk store of extracted PDF text keyed by content SHA-256, or None when
+    disabled. AUDITOR_PDF_TEXT_STORE=0 disables it; AUDITOR_PDF_TEXT_STORE_DIR sets the directory;
+    AUDITOR_PDF_TEXT_STORE_MAX_MB sets the size budget (default 128, LRU eviction).
+    """
+    global _default_text_store
+    if not env_flag("AUDITOR_PDF_TEXT_STORE", True):
+        return None
+    path = Path(os.environ.get("AUDITOR_PDF_TEXT_STORE_DIR") or DEFAULT_CACHE_ROOT) / "pdf_text.sqlite"
+    max_bytes = env_max_bytes("AUDITOR_PDF_TEXT_STORE_MAX_MB", DEFAULT_TEXT_STORE_MAX_MB)
+    with _default_lock:
+        store = _default_text_store
+        if store is None or store.path != path or store.max_bytes != max_bytes:
+            version = f"{PDF_TEXT_STORE_VERSION}-pypdf{pypdf.__version__}"
+            store = _default_text_store = KVCache(path, max_bytes=max_bytes, version=version)
+        return store
@@ -0,0 +1,237 @@
+"""
+Zero-decode access to images embedded in PDFs for VisionInspector. PDFImageRef is read straight
+from a page's XObject dictionaries: declared dimensions, encoding and page number, no pixel
+data. Tiny images (icons, logos) are filtered by declared size before any stream is touched;
+JPEG streams are sent to the vision model as-is and 8-bit Flate images are rewrapped as PNG
+(zlib only). Pillow decodes only other encodings and images over the vision pixel budget.
+"""
+
+from __future__ import annotations
+
+import io
+import math
+import os
+import struct
+import threading
+import zlib
+from dataclasses import dataclass, field
+from typing import Any, Iterator
+
+# Below 128 x 128 declared pixels an image is an icon, logo or bullet, never a diagram
+DEFAULT_MIN_PIXELS = 128 * 128
+# Vision models downscale to fit 2048 x 768 (high detail); larger payloads only cost upload time
+DEFAULT_MAX_PIXELS = 2048 * 768
+
+_PNG_COLOR_TYPES = {1: 0, 3: 2}  # components -> PNG color type (grayscale, truecolor)
+_MIME_TYPES = {"jpeg": "image/jpeg", "png": "image/png"}
+
+
+@dataclass
+class PDFImageRef:
+    """
+    One embedded image, not decoded. format: "jpeg" (DCT stream, passed through), "png" (8-bit
+    gray/RGB Flate stream, rewrapped) or "raw" (other encodings; decoded by Pillow when sent).
+    name is the XObject path within the page ("/Im1", or "/Fm1/Im1" inside a form).
+    """
+
+    page_no: int
+    name: str
+    width: int
+    height: int
+    format: str
+    _stream: Any = field(default=None, repr=False, compare=False)
+    _page: Any = field(default=None, repr=False, compare=False)
+    _lock: threading.Lock | None = field(default=None, repr=False, compare=False)
+
+    @property
+    def pixels(self) -> int:
+        return self.width * self.height
+
+    @property
+    def aspect_ratio(self) -> float:
+        return self.width / self.height if self.height else 0.0
+
+    def encoded_bytes(self) -> bytes | None:
+        """Original JPEG bytes or the PNG rewrap; None for "raw" images (see image())."""
+        if self.format == "raw":
+            return None
+        with self._lock or threading.Lock():
+            data = self._stream.get_data()  # DCT is passed through by pypdf; Flate is only inflated
+        if self.format == "jpeg":
+            return data
+        return _png_from_rows(data, self.width, self.height, _components(self._stream))
+
+    def image(self) -> Any:
+        """Decoded PIL image (decodes now: for ranking, downscaling or "raw" encodings)."""
+        data = self.encoded_bytes()
+        if data is not None:
+            from PIL import Image
+
+            img = Image.open(io.BytesIO(data))
+            img.load()
+            return img
+        # pypdf image key: "/Im1" on the page, ("/Fm1", "/Im1") inside a form XObject
+        parts = ["/" + part for part in self.name.split("/")[1:]]
+        with self._lock or threading.Lock():
+            return self._page.images[parts[0] if len(parts) == 1 else tuple(parts)].image
+
+    def thumbnail(self, max_side: int = 128) -> Any:
+        """
+        Small RGB PIL copy (longest side <= max_side) for local analysis. JPEGs are decoded at
+        reduced DCT scale and Flate rows are wrapped directly, so no full-size PNG is built.
+        """
+        from PIL import Image
+
+        if self.format == "jpeg":
+            with self._lock or threading.Lock():
+                data = self._stream.get_data()
+            img = Image.open(io.BytesIO(data))
+            img.draft("RGB", (max_side, max_side))
+        elif self.format == "png":
+            with self._lock or threading.Lock():
+                data = self._stream.get_data()
+            mode = "L" if _components(self._stream) == 1 else "RGB"
+            img = Image.frombytes(mode, (self.width, self.height), data)
+        else:
+            img = self.image()
+        img = img.convert("RGB")
+        img.thumbnail((max_side, max_side))
+        return img
+
+    def encoded(self, max_pixels: int | None = DEFAULT_MAX_PIXELS) -> tuple[bytes, str]:
+        """
+        (bytes, mime type) for a vision request: the original JPEG / rewrapped PNG when within
+        max_pixels, otherwise a downscaled re-encode (JPEG stays JPEG, everything else PNG).
+        """
+        if max_pixels is None or self.pixels <= max_pixels:
+            data = self.encoded_bytes()
+            if data is not None:
+                return data, _MIME_TYPES[self.format]
+        return encode_image(self.image(), max_pixels, jpeg=self.format == "jpeg")
+
+
+def page_image_refs(
+    page: Any, page_no: int, min_pixels: int = DEFAULT_MIN_PIXELS, lock: threading.Lock | None = None
+) -> list[PDFImageRef]:
+    """Image XObjects of one page (including inside form XObjects) of at least min_pixels declared pixels."""
+    refs: list[PDFImageRef] = []
+    for path, stream in _image_xobjects(page, "", set()):
+        width, height = int(stream.get("/Width", 0)), int(stream.get("/Height", 0))
+        if width * height < min_pixels or stream.get("/ImageMask"):
+            continue
+        refs.append(
+            PDFImageRef(
+                page_no=page_no,
+                name=path,
+                width=width,
+                height=height,
+                format=_format(stream),
+                _stream=stream,
+                _page=page,
+                _lock=lock,
+            )
+        )
+    return refs
+
+
+def encode_image(image: Any, max_pixels: int | None = DEFAULT_MAX_PIXELS, jpeg: bool = False) -> tuple[bytes, str]:
+    """Encode a PIL image for a vision request, downscaled (aspect kept) to at most max_pixels."""
+    from PIL import Image
+
+    width, height = image.size
+    if max_pixels is not None and width * height > max_pixels:
+        scale = math.sqrt(max_pixels / (width * height))
+        image = image.resize((max(1, int(width * scale)), max(1, int(height * scale))), Image.LANCZOS)
+    buf = io.BytesIO()
+    if jpeg:
+        image.convert("RGB").save(buf, format="JPEG", quality=85)
+        return buf.getvalue(), "image/jpeg"
+    if image.mode not in ("1", "L", "LA", "P", "RGB", "RGBA"):
+        image = image.convert("RGB")
+    image.save(buf, format="PNG")
+    return buf.getvalue(), "image/png"
+
+
+def sniff_image_type(data: bytes) -> str | None:
+    """MIME type of already-encoded JPEG / PNG bytes, else None."""
+    if data[:3] == b"\xff\xd8\xff":
+        return "image/jpeg"
+    if data[:8] == b"\x89PNG\r\n\x1a\n":
+        return "image/png"
+    return None
+
+
+def _image_xobjects(obj: Any, prefix: str, seen: set[int]) -> Iterator[tuple[str, Any]]:
+    resources = obj.get("/Resources")
+    resources = resources.get_object() if resources is not None else None
+    xobjects = resources.get("/XObject") if resources is not None else None
+    if xobjects is None:
+        return
+    for name, ref in xobjects.get_object().items():
+        stream = ref.get_object()
+        if id(stream) in seen:
+            continue
+        seen.add(id(stream))
+        subtype = stream.get("/Subtype")
+        if subtype == "/Image":
+            yield f"{prefix}{name}", stream
+        elif subtype == "/Form":
+            yield from _image_xobjects(stream, f"{prefix}{name}", seen)
+
+
+def _filters(stream: Any) -> list[str]:
+    filters = stream.get("/Filter")
+    if filters is None:
+        return []
+    filters = filters.get_object()
+    return [str(f) for f in filters] if isinstance(filters, list) else [str(filters)]
+
+
+def _components(stream: Any) -> int:
+    """Color components of DeviceGray / DeviceRGB / ICCBased (N) color spaces; 0 for others."""
+    space = stream.get("/ColorSpace")
+    space = space.get_object() if space is not None else None
+    if space == "/DeviceGray":
+        return 1
+    if space == "/DeviceRGB":
+        return 3
+    if isinstance(space, list) and space and space[0] == "/ICCBased":
+        return int(space[1].get_object().get("/N", 0))
+    return 0
+
+
+def _format(stream: Any) -> str:
+    filters = _filters(stream)
+    if filters == ["/DCTDecode"]:
+        return "jpeg"
+    if (
+        filters in (["/FlateDecode"], [])
+        and stream.get("/BitsPerComponent") == 8
+        and _components(stream) in _PNG_COLOR_TYPES
+        and "/Decode" not in stream
+        and "/SMask" not in stream
+    ):
+        return "png"
+    return "raw"
+
+
+def _png_from_rows(rows: bytes, width: int, height: int, components: int) -> bytes:
+    """PNG file from unfiltered 8-bit pixel rows: a zero filter byte per row, one IDAT chunk."""
+    stride = width * components
+    filtered = b"".join(b"\x00" + rows[y * stride : (y + 1) * stride] for y in range(height))
+    ihdr = struct.pack(">IIBBBBB", width, height, 8, _PNG_COLOR_TYPES[components], 0, 0, 0)
+    idat = zlib.compress(filtered, 6)
+    return b"\x89PNG\r\n\x1a\n" + _png_chunk(b"IHDR", ihdr) + _png_chunk(b"IDAT", idat) + _png_chunk(b"IEND", b"")
+
+
+def _png_chunk(kind: bytes, data: bytes) -> bytes:
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF)
+
+
+def vision_max_pixels() -> int | None:
+    """AUDITOR_VISION_MAX_PIXELS (default DEFAULT_MAX_PIXELS); 0 sends images at full size."""
+    try:
+        value = int(os.environ.get("AUDITOR_VISION_MAX_PIXELS") or DEFAULT_MAX_PIXELS)
+    except ValueError:
+        return DEFAULT_MAX_PIXELS
+    return value if value > 0 else None
@@ -0,0 +1,389 @@
+"""
+Persistent clone cache for RepoInvestigator. Entries are keyed by a hash of the normalized
+repo URL: the first audit clones, later audits only fetch the delta and check out the new HEAD.
+Each audit receives a private copy of the entry; entries are only refreshed, copied or evicted
+under a per-entry file lock, so concurrent audits (threads or processes) never see each other.
+Size-bounded with LRU eviction; hit/miss/eviction counters for observability.
+MirrorPool: one bare mirror per repo plus cheap per-audit worktrees for concurrent audits.
+Sandboxed git via subprocess.run only (SRS NFR-4, NFR-5).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX: in-process locking only
+    fcntl = None
+
+from src.tools.repo_tools import (
+    HistoryMode,
+    RepoCloneError,
+    _apply_sparse_checkout,
+    _git_clone,
+    _run_git,
+)
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "automaton_auditor" / "repos"
+DEFAULT_MAX_MB = 2048
+DEFAULT_MIRROR_DIR = Path.home() / ".cache" / "automaton_auditor" / "mirrors"
+
+
+def normalize_repo_url(repo_url: str) -> str:
+    """
+    Normalize a clone URL so equivalent spellings share one cache entry.
+    git@host:org/repo.git, https://Host/org/repo/ and https://host/org/repo all map to
+    https://host/org/repo. Local paths and file:// URLs are kept as-is (minus trailing slash).
+    """
+    url = (repo_url or "").strip()
+    scp = re.match(r"^(?:ssh://)?git@([^:/]+)[:/](.+)$", url)
+    if scp:
+        url = f"https://{scp.group(1)}/{scp.group(2)}"
+    m = re.match(r"^(https?)://([^/]+)(/.*)?$", url, flags=re.IGNORECASE)
+    if not m:
+        return url.rstrip("/")
+    host = m.group(2).lower().split("@")[-1]  # drop embedded credentials
+    path = (m.group(3) or "").rstrip("/")
+    if path.endswith(".git"):
+        path = path[:-4]
+    return f"https://{host}{path}"
+
+
+def _url_key(repo_url: str) -> str:
+    return hashlib.sha256(normalize_repo_url(repo_url).encode("utf-8")).hexdigest()[:24]
+
+
+@contextmanager
+def _file_lock(path: Path, blocking: bool = True) -> Iterator[bool]:
+    """
+    Exclusive flock on path, held across threads and processes (each call opens its own handle).
+    Yields False instead of waiting when blocking is False and another holder has it.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a+b") as handle:
+        if fcntl is None:
+            yield True
+            return
+        try:
+            fcntl.flock(handle, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+        except BlockingIOError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+class RepoCache:
+    """
+    On-disk clone cache. Each entry is a shallow working clone under root/<key>, with a
+    sidecar root/<key>.json holding url, last_used and size (bytes) for LRU accounting and a
+    root/<key>.lock file. Entries are never handed out: checkout refreshes the entry and copies it
+    to a private temp directory while holding the entry lock, and eviction skips locked entries.
+    """
+
+    def __init__(self, root: str | Path | None = None, max_bytes: int | None = None):
+        self.root = Path(root) if root else DEFAULT_CACHE_DIR
+        self.max_bytes = max_bytes if max_bytes is not None else DEFAULT_MAX_MB * 1024 * 1024
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    def key_for(self, repo_url: str, sparse: bool = False, history: HistoryMode = "shallow") -> str:
+        """
+        Content-addressed entry key: sha256 of the normalized URL (first 24 hex chars).
+        Sparse (partial) clones and each history mode are kept apart so no mode degrades another.
+        """
+        key = _url_key(repo_url)
+        if history != "shallow":
+            key += f"-{history}"
+        return key + ("-sparse" if sparse else "")
+
+    def checkout(
+        self,
+        repo_url: str,
+        sparse_paths: list[str] | None = None,
+        history: HistoryMode = "shallow",
+    ) -> str:
+        """
+        Return path to a private, up-to-date copy of repo_url. Hit: git fetch of the remote HEAD
+        (--depth 1 for shallow entries) and a forced checkout of the entry. Miss (or failed
+        refresh): fresh clone in the requested history mode. sparse_paths selects a partial,
+        sparse entry (re-applied on every hit, since the active rubric may differ between audits).
+        The copy lives in its own temp directory and belongs to the caller, like an uncached clone.
+        Raises RepoCloneError when the clone fails.
+        """
+        key = self.key_for(repo_url, sparse=sparse_paths is not None, history=history)
+        entry = self.root / key
+        with _file_lock(self._lock_path(key)):
+            hit = False
+            if (entry / ".git").is_dir():
+                try:
+                    self._refresh(entry, sparse_paths, history)
+                    hit = True
+                except RepoCloneError:
+                    shutil.rmtree(entry, ignore_errors=True)
+            if not hit:
+                shutil.rmtree(entry, ignore_errors=True)
+                _git_clone(repo_url, entry, sparse_paths=sparse_paths, history=history)
+            with self._lock:
+                if hit:
+                    self.hits += 1
+                else:
+                    self.misses += 1
+            self._write_meta(key, repo_url, _dir_size(entry))
+            copy = Path(tempfile.mkdtemp(prefix="automaton_auditor_clone_"))
+            try:
+                _copy_entry(entry, copy)
+            except OSError as e:
+                shutil.rmtree(copy, ignore_errors=True)
+                raise RepoCloneError(f"copying cached clone failed: {e}") from e
+        self._evict(keep=key)
+        return str(copy.resolve())
+
+    def stats(self) -> dict[str, int]:
+        """Counters since construction plus current entry count and total size on disk."""
+        metas = self._read_all_meta()
+        with self._lock:
+            counters = {"hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+        return {
+            **counters,
+            "entries": len(metas),
+            "size_bytes": sum(m.get("size", 0) for m in metas.values()),
+        }
+
+    def _refresh(
+        self, entry: Path, sparse_paths: list[str] | None = None, history: HistoryMode = "shallow"
+    ) -> None:
+        """Fetch only the new commits of the remote default branch and check out its tip."""
+        depth = ["--depth", "1"] if history == "shallow" else []
+        # Partial entries keep their clone filter (remote.origin.partialclonefilter) on fetch
+        fetch = _run_git(["fetch", *depth, "origin", "HEAD"], cwd=entry)
+        if fetch.returncode != 0:
+            raise RepoCloneError(f"git fetch failed: {(fetch.stderr or fetch.stdout).strip()}")
+        head = _run_git(["rev-parse", "HEAD"], cwd=entry, timeout=30).stdout.strip()
+        fetched = _run_git(["rev-parse", "FETCH_HEAD"], cwd=entry, timeout=30).stdout.strip()
+        if fetched and fetched != head:
+            checkout = _run_git(["checkout", "--force", "--detach", "FETCH_HEAD"], cwd=entry)
+            if checkout.returncode != 0:
+                raise RepoCloneError(f"git checkout failed: {checkout.stderr.strip()}")
+        if sparse_paths is not None:
+            _apply_sparse_checkout(entry, sparse_paths)
+        # Drop leftovers of an interrupted refresh so every copy starts from a pristine tree
+        _run_git(["clean", "-ffdxq"], cwd=entry, timeout=60)
+
+    def _meta_path(self, key: str) -> Path:
+        return self.root / f"{key}.json"
+
+    def _lock_path(self, key: str) -> Path:
+        return self.root / f"{key}.lock"
+
+    def _write_meta(self, key: str, repo_url: str, size: int) -> None:
+        meta = {"url": normalize_repo_url(repo_url), "last_used": time.time(), "size": size}
+        self._meta_path(key).write_text(json.dumps(meta), encoding="utf-8")
+
+    def _read_all_meta(self) -> dict[str, dict]:
+        metas: dict[str, dict] = {}
+        if not self.root.is_dir():
+            return metas
+        for p in self.root.glob("*.json"):
+            try:
+                metas[p.stem] = json.loads(p.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                continue
+        return metas
+
+    def _evict(self, keep: str) -> None:
+        """
+        Remove least-recently-used entries until total size fits max_bytes. Never evicts keep or
+        an entry whose lock is held (being refreshed or copied by another audit or process).
+        """
+        metas = self._read_all_meta()
+        total = sum(m.get("size", 0) for m in metas.values())
+        for key, _ in sorted(metas.items(), key=lambda kv: kv[1].get("last_used", 0)):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            with _file_lock(self._lock_path(key), blocking=False) as locked:
+                if not locked or not self._meta_path(key).is_file():
+                    continue
+                shutil.rmtree(self.root / key, ignore_errors=True)
+                self._meta_path(key).unlink(missing_ok=True)
+            total -= metas[key].get("size", 0)
+            with self._lock:
+                self.evictions += 1
+
+
+def _copy_entry(entry: Path, dest: Path) -> None:
+    """
+    Copy a cache entry into dest. Git object files are immutable, so they are hard-linked when the
+    filesystem allows (as git clone --local does); the working tree and refs are real copies.
+    """
+    objects = str(entry / ".git" / "objects") + os.sep
+
+    def link_or_copy(src: str, dst: str) -> str:
+        if src.startswith(objects):
+            try:
+                os.link(src, dst)
+                return dst
+            except OSError:
+                pass
+        return shutil.copy2(src, dst)
+
+    shutil.copytree(entry, dest, symlinks=True, copy_function=link_or_copy, dirs_exist_ok=True)
+
+
+def _dir_size(path: Path) -> int:
+    total = 0
+    for dirpath, _, filenames in os.walk(path):
+        for name in filenames:
+            try:
+                total += os.lstat(os.path.join(dirpath, name)).st_size
+            except OSError:
+                continue
+    return total
+
+
+_default_cache: RepoCache | None = None
+
+
+def default_repo_cache() -> RepoCache | None:
+    """
+    Process-wide RepoCache configured from env, or None when disabled.
+    AUDITOR_REPO_CACHE=0 disables caching; AUDITOR_REPO_CACHE_DIR sets the root;
+    AUDITOR_REPO_CACHE_MAX_MB sets the size budget (default 2048).
+    """
+    global _default_cache
+    if os.environ.get("AUDITOR_REPO_CACHE", "1").strip().lower() in ("0", "false", "no", "off"):
+        return None
+    root = Path(os.environ.get("AUDITOR_REPO_CACHE_DIR") or DEFAULT_CACHE_DIR)
+    try:
+        max_bytes = int(os.environ.get("AUDITOR_REPO_CACHE_MAX_MB") or DEFAULT_MAX_MB) * 1024 * 1024
+    except ValueError:
+        max_bytes = DEFAULT_MAX_MB * 1024 * 1024
+    if _default_cache is None or _default_cache.root != root or _default_cache.max_bytes != max_bytes:
+        _default_cache = RepoCache(root=root, max_bytes=max_bytes)
+    return _default_cache
+
+
+class MirrorPool:
+    """
+    Shared bare mirrors with per-audit worktrees, for concurrent audits of one repository.
+    Each repo has a single mirror at root/<key>.git (git clone --mirror, refreshed with
+    git fetch --prune); each audit gets a detached `git worktree` in its own temp directory,
+    so checkouts share one object store and never clone or copy objects again.
+    """
+
+    def __init__(self, root: str | Path | None = None):
+        self.root = Path(root) if root else DEFAULT_MIRROR_DIR
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._mirror_locks: dict[str, threading.Lock] = {}
+        self._active: dict[str, Path] = {}  # worktree path -> mirror path
+
+    def mirror_path(self, repo_url: str) -> Path:
+        return self.root / f"{_url_key(repo_url)}.git"
+
+    def acquire(self, repo_url: str) -> str:
+        """
+        Return path to a fresh, isolated worktree at the remote HEAD. The mirror is created on
+        first use and fetched (under a per-mirror lock) on later uses. Raises RepoCloneError.
+        """
+        url = (repo_url or "").strip()
+        if not url:
+            raise RepoCloneError("repo_url must be a non-empty string")
+        mirror = self.mirror_path(url)
+        with self._lock:
+            mirror_lock = self._mirror_locks.setdefault(mirror.name, threading.Lock())
+        # The file lock keeps other processes sharing this mirror root from fetching concurrently
+        with mirror_lock, _file_lock(mirror.with_suffix(".lock")):
+            self._sync_mirror(url, mirror)
+            parent = Path(tempfile.mkdtemp(prefix="automaton_auditor_wt_"))
+            worktree = parent / "repo"
+            result = _run_git(["worktree", "add", "--detach", str(worktree), "HEAD"], cwd=mirror)
+            if result.returncode != 0:
+                shutil.rmtree(parent, ignore_errors=True)
+                raise RepoCloneError(f"git worktree add failed: {(result.stderr or result.stdout).strip()}")
+        path = str(worktree.resolve())
+        with self._lock:
+            self._active[path] = mirror
+        return path
+
+    def release(self, worktree_path: str) -> None:
+        """Remove a worktree handed out by acquire (idempotent; unknown paths are ignored)."""
+        with self._lock:
+            mirror = self._active.pop(str(Path(worktree_path).resolve()), None)
+        if mirror is None:
+            return
+        _run_git(["worktree", "remove", "--force", worktree_path], cwd=mirror, timeout=60)
+        shutil.rmtree(Path(worktree_path).parent, ignore_errors=True)
+        _run_git(["worktree", "prune"], cwd=mirror, timeout=30)
+
+    def release_all(self) -> None:
+        with self._lock:
+            paths = list(self._active)
+        for path in paths:
+            self.release(path)
+
+    @contextmanager
+    def workspace(self, repo_url: str) -> Iterator[str]:
+        """Context manager: acquire a worktree for repo_url and release it on exit."""
+        path = self.acquire(repo_url)
+        try:
+            yield path
+        finally:
+            self.release(path)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "active_worktrees": len(self._active)}
+
+    def _sync_mirror(self, url: str, mirror: Path) -> None:
+        if mirror.is_dir():
+            fetch = _run_git(["fetch", "--prune", "origin"], cwd=mirror)
+            if fetch.returncode == 0:
+                with self._lock:
+                    self.hits += 1
+                _run_git(["worktree", "prune"], cwd=mirror, timeout=30)
+                return
+            shutil.rmtree(mirror, ignore_errors=True)
+        with self._lock:
+            self.misses += 1
+        self.root.mkdir(parents=True, exist_ok=True)
+        result = _run_git(["clone", "--mirror", url, str(mirror)])
+        if result.returncode != 0:
+            shutil.rmtree(mirror, ignore_errors=True)
+            msg = result.stderr or result.stdout or "Unknown git error"
+            raise RepoCloneError(f"git clone --mirror failed: {msg.strip()}")
+
+
+_default_pool: MirrorPool | None = None
+
+
+def default_mirror_pool() -> MirrorPool | None:
+    """
+    Process-wide MirrorPool when AUDITOR_REPO_WORKTREES=1, else None (opt-in).
+    AUDITOR_REPO_MIRROR_DIR sets the mirror root.
+    """
+    global _default_pool
+    if os.environ.get("AUDITOR_REPO_WORKTREES", "0").strip().lower() not in ("1", "true", "yes", "on"):
+        return None
+    root = Path(os.environ.get("AUDITOR_REPO_MIRROR_DIR") or DEFAULT_MIRROR_DIR)
+    if _default_pool is None or _default_pool.root != root:
+        _default_pool = MirrorPool(root=root)
+    return _default_pool
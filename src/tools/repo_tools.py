@@ -6,23 +6,82 @@ API Contracts §5.1; SRS FR-6, FR-7, NFR-4, NFR-5.
 from __future__ import annotations
 
 import ast
+import hashlib
 import os
 import subprocess
 import tempfile
+import threading
+from collections import Counter
+from collections.abc import Iterator
 from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any, Literal
+
+from src.tools.ast_engine import (
+    GraphWiringAnalyzer,
+    NodeAnalyzer,
+    SecurityCallAnalyzer,
+    StateSchemaAnalyzer,
+    run_analyzers,
+)
+from src.tools.import_graph import CONVENTIONAL_GRAPH_FILES, locate_graph_files
+from src.tools.kv_cache import DEFAULT_CACHE_ROOT, KVCache, env_flag, env_max_bytes
+
+if TYPE_CHECKING:
+    from src.tools.ast_index import AstIndex
+    from src.tools.git_session import GitSession
+    from src.tools.repo_cache import RepoCache
 
 
 class RepoCloneError(Exception):
     """Raised when git clone fails (invalid URL, auth, network)."""
 
 
-def clone_repo(repo_url: str) -> str:
+# Paths RepoInvestigator's analyzers read from the working tree (sparse checkout mode).
+# git ls-files and git log work from the index and object store, so they need no checkout.
+# Every Python source is materialized for the AST index (one batched fetch instead of one
+# on-demand blob fetch per file); committed virtualenvs and vendored trees are excluded.
+ANALYZER_CHECKOUT_PATHS = [
+    "src/graph.py", "graph.py", "src/state.py",
+    "*.py", "!**/.venv/**", "!**/venv/**", "!**/site-packages/**", "!**/node_modules/**",
+]
+# Files read from the clone by later stages (EvidenceAggregator's feedback lookup).
+_AUXILIARY_CHECKOUT_PATHS = ["audit/report_bypeer_received"]
+
+# How much history a clone carries:
+# - shallow: --depth 1 (one commit; cheapest, but git history evidence is meaningless)
+# - treeless: --filter=tree:0 (every commit, no historical trees/blobs; near-shallow cost)
+# - full: complete history with all objects
+HistoryMode = Literal["shallow", "treeless", "full"]
+HISTORY_MODES: tuple[str, ...] = ("shallow", "treeless", "full")
+
+# Bump whenever analyze_repo's analyzers change: the analysis cache is version-stamped, so
+# results produced by older logic are dropped on open.
+ANALYSIS_CACHE_VERSION = 6
+STATE_FILE = "src/state.py"
+_default_analysis_cache: KVCache | None = None
+
+
+def clone_repo(
+    repo_url: str,
+    cache: RepoCache | None = None,
+    sparse_paths: list[str] | None = None,
+    history: HistoryMode = "shallow",
+) -> str:
     """
     Clone repository into a temporary directory. Uses subprocess only; no os.system.
     Caller is responsible for cleanup of the temp directory (or process exit).
 
     Args:
         repo_url: Valid GitHub (or other) clone URL (HTTPS or SSH).
+        cache: Optional persistent RepoCache; when given, the cached entry is refreshed
+            (fetching only new commits) and a private copy of it is returned instead of a
+            fresh clone. The copy is owned by the caller, like an uncached clone.
+        sparse_paths: Optional repo-relative paths (files or directories) to materialize.
+            When given, the clone is partial (--filter=blob:none) and sparse: only these
+            paths are checked out; git ls-files still lists the full tree and any other
+            blob is fetched on demand (see read_repo_file).
+        history: "shallow" (default, --depth 1), "treeless" (all commits, trees/blobs fetched
+            on demand; use for git history evidence) or "full".
 
     Returns:
         Path to the cloned repo (directory containing .git).
@@ -35,32 +94,142 @@ def clone_repo(repo_url: str) -> str:
     url = repo_url.strip()
     if not url:
         raise RepoCloneError("repo_url must be a non-empty string")
+    if history not in HISTORY_MODES:
+        raise RepoCloneError(f"history must be one of {HISTORY_MODES}, got {history!r}")
+    if cache is not None:
+        return cache.checkout(url, sparse_paths=sparse_paths, history=history)
 
     tmp_dir = tempfile.mkdtemp(prefix="automaton_auditor_clone_")
+    # Clone into empty tmp_dir; repo root is tmp_dir (contents + .git live there)
+    return _git_clone(url, tmp_dir, sparse_paths=sparse_paths, history=history)
+
+
+def sparse_paths_for_dimensions(
+    dimensions: list[dict], extra: list[str] | None = None
+) -> list[str]:
+    """
+    Paths the active rubric dimensions need in the working tree. github_repo dimensions need
+    the analyzer inputs (ANALYZER_CHECKOUT_PATHS); any dimension may add its own via an
+    optional "checkout_paths" list in the rubric. extra is appended (e.g. the default PDF).
+    """
+    paths: list[str] = list(_AUXILIARY_CHECKOUT_PATHS)
+    if any(d.get("target_artifact") == "github_repo" for d in dimensions):
+        paths.extend(ANALYZER_CHECKOUT_PATHS)
+    for d in dimensions:
+        paths.extend(p for p in d.get("checkout_paths") or [] if isinstance(p, str))
+    paths.extend(extra or [])
+    return list(dict.fromkeys(p.strip().strip("/") for p in paths if p and p.strip("/ ")))
+
+
+def sparse_checkout_enabled() -> bool:
+    """True when AUDITOR_SPARSE_CHECKOUT=1: clones materialize only the paths the rubric needs."""
+    return os.environ.get("AUDITOR_SPARSE_CHECKOUT", "0").strip().lower() in ("1", "true", "yes", "on")
+
+
+def clone_options(dimensions: list[dict], extra: list[str] | None = None) -> dict[str, Any]:
+    """
+    clone_repo keyword args for an audit, from env: AUDITOR_CLONE_HISTORY (default "treeless",
+    so git_forensic_analysis sees the real commit timeline) and AUDITOR_SPARSE_CHECKOUT.
+    """
+    history = os.environ.get("AUDITOR_CLONE_HISTORY", "treeless").strip().lower()
+    if history not in HISTORY_MODES:
+        history = "treeless"
+    sparse = sparse_paths_for_dimensions(dimensions, extra) if sparse_checkout_enabled() else None
+    return {"history": history, "sparse_paths": sparse}
+
+
+def _run_git(args: list[str], cwd: str | Path | None = None, timeout: int = 120) -> subprocess.CompletedProcess:
+    """Run git with explicit args (no shell). Raises RepoCloneError when git is missing or times out."""
     try:
-        # Clone into empty tmp_dir; repo root is tmp_dir (contents + .git live there)
-        result = subprocess.run(
-            ["git", "clone", "--depth", "1", url, tmp_dir],
+        return subprocess.run(
+            ["git", *args],
+            cwd=cwd,
             capture_output=True,
             text=True,
-            timeout=120,
+            timeout=timeout,
         )
     except FileNotFoundError as e:
         raise RepoCloneError("git not found (is Git installed and on PATH?)") from e
     except subprocess.TimeoutExpired as e:
-        raise RepoCloneError(f"git clone timed out after {e.timeout}s") from e
+        raise RepoCloneError(f"git {args[0]} timed out after {e.timeout}s") from e
 
+
+def _git_clone(
+    url: str,
+    dest: str | Path,
+    sparse_paths: list[str] | None = None,
+    history: HistoryMode = "shallow",
+) -> str:
+    """Clone url into dest (empty or missing dir) per history mode. Returns absolute repo path."""
+    args = ["clone"]
+    if history == "shallow":
+        args += ["--depth", "1"]
+    if history == "treeless":
+        args += ["--filter=tree:0"]
+    elif sparse_paths is not None:
+        args += ["--filter=blob:none"]
+    if sparse_paths is not None:
+        args += ["--no-checkout"]
+    result = _run_git([*args, url, str(dest)])
     if result.returncode != 0:
         msg = result.stderr or result.stdout or "Unknown git error"
         raise RepoCloneError(f"git clone failed: {msg.strip()}")
 
-    repo_path = os.path.abspath(tmp_dir)
+    repo_path = os.path.abspath(dest)
     if not os.path.isdir(os.path.join(repo_path, ".git")):
         raise RepoCloneError("Clone completed but .git not found")
+    if sparse_paths is not None:
+        _apply_sparse_checkout(repo_path, sparse_paths)
+        # --no-checkout left the index empty: populate it from HEAD, materializing sparse paths only
+        checkout = _run_git(["checkout", "--force", "--quiet"], cwd=repo_path)
+        if checkout.returncode != 0:
+            raise RepoCloneError(f"git checkout failed: {(checkout.stderr or checkout.stdout).strip()}")
     return repo_path
 
 
-def list_repo_files(repo_path: str, relative: bool = True) -> list[str]:
+def _apply_sparse_checkout(repo_path: str | Path, sparse_paths: list[str]) -> None:
+    """
+    Restrict the working tree to sparse_paths (non-cone patterns). Plain paths are anchored at
+    the repo root; glob ("*.py") and negation ("!**/venv/**") patterns are passed through unanchored.
+    """
+    patterns = [
+        p if p.startswith("!") or any(c in p for c in "*?[") else f"/{p.strip('/')}"
+        for p in sparse_paths
+        if p.strip("/")
+    ]
+    result = _run_git(["sparse-checkout", "set", "--no-cone", *patterns], cwd=repo_path)
+    if result.returncode != 0:
+        raise RepoCloneError(f"git sparse-checkout failed: {(result.stderr or result.stdout).strip()}")
+
+
+def read_repo_file(repo_path: str, rel_path: str, session: GitSession | None = None) -> str | None:
+    """
+    Read a tracked file's text. Uses the working tree when the file is checked out; otherwise
+    (sparse clone) reads the blob at HEAD, which git fetches on demand. None if unavailable.
+    With a GitSession the blob read goes over its batch channel instead of a git show process.
+    """
+    path = Path(repo_path) / rel_path
+    if path.is_file():
+        return path.read_text(encoding="utf-8", errors="replace")
+    if not (Path(repo_path) / ".git").exists():
+        return None
+    if session is not None:
+        return session.read_text(rel_path)
+    try:
+        result = subprocess.run(
+            ["git", "show", f"HEAD:{rel_path}"],
+            cwd=repo_path,
+            capture_output=True,
+            timeout=60,
+        )
+    except (FileNotFoundError, subprocess.TimeoutExpired):
+        return None
+    if result.returncode != 0:
+        return None
+    return result.stdout.decode("utf-8", errors="replace")
+
+
+def list_repo_files(repo_path: str, relative: bool = True, session: GitSession | None = None) -> list[str]:
     """
     List file paths in the repository (for cross-reference with report claims).
     Uses git ls-files; no os.system, subprocess.run only.
@@ -68,6 +237,7 @@ def list_repo_files(repo_path: str, relative: bool = True) -> list[str]:
     Args:
         repo_path: Path to cloned repo root.
         relative: If True, return paths relative to repo root; else absolute.
+        session: Optional GitSession to answer from (one ls-files per session).
 
     Returns:
         List of file paths (strings). Empty on error or non-dir.
@@ -75,6 +245,9 @@ def list_repo_files(repo_path: str, relative: bool = True) -> list[str]:
     path = Path(repo_path)
     if not path.is_dir():
         return []
+    if session is not None:
+        lines = session.ls_files()
+        return lines if relative else [str(path / p) for p in lines]
     try:
         result = subprocess.run(
             ["git", "ls-files"],
@@ -93,88 +266,290 @@ def list_repo_files(repo_path: str, relative: bool = True) -> list[str]:
     return [str(path / p) for p in lines]
 
 
-def extract_git_history(repo_path: str) -> list[dict]:
+def extract_git_history(
+    repo_path: str, numstat: bool = False, session: GitSession | None = None
+) -> list[dict]:
+    """
+    Run git log --reverse with format for commit, message, timestamp.
+    Returns structured list of dicts (thin wrapper over iter_git_history; see there for numstat).
+    With a GitSession the history is read once per session and reused.
+    """
+    if session is not None:
+        return session.log(numstat=numstat)
+    return list(iter_git_history(repo_path, numstat=numstat))
+
+
+# Record layout for git log -z: \x1e starts a commit header, \x1f separates its fields
+_HISTORY_FORMAT = "--format=%x1e%h%x1f%ci%x1f%s"
+_HISTORY_READ_SIZE = 64 * 1024
+
+
+def iter_git_history(repo_path: str, numstat: bool = False, timeout: float = 30) -> Iterator[dict]:
     """
-    Run git log --oneline --reverse with format for commit, message, timestamp.
-    Returns structured list of dicts.
+    Stream commits (oldest first) from git log's stdout pipe, parsing NUL-delimited records
+    incrementally so Python memory stays flat however long the history is.
+
+    Yields {"commit", "message", "timestamp"}; with numstat=True also "added", "deleted"
+    (line counts summed over the commit; binary files count 0) and "files" (files touched).
+    numstat needs historical trees and blobs, so on treeless/partial clones git fetches them
+    on demand; leave it off there unless that cost is intended.
+
+    Stops (and kills git) after timeout seconds or when the consumer stops iterating.
+    Yields nothing for a non-dir, non-repo, or missing git.
     """
     path = Path(repo_path)
     if not path.is_dir():
-        return []
+        return
+    args = ["git", "log", "--reverse", "-z", _HISTORY_FORMAT]
+    if numstat:
+        args.append("--numstat")
+    try:
+        proc = subprocess.Popen(args, cwd=path, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    except FileNotFoundError:
+        return
+    timer = threading.Timer(timeout, proc.kill)
+    timer.start()
+    try:
+        current: dict | None = None
+        rename_paths_pending = 0
+        for record in _iter_nul_records(proc.stdout):
+            if record.startswith(b"\x1e"):
+                if current is not None:
+                    yield current
+                current = _parse_history_header(record[1:], numstat)
+                rename_paths_pending = 0
+            elif current is not None and numstat:
+                if rename_paths_pending:
+                    # -z rename entries: "added\tdeleted\t" then old and new paths as own records
+                    rename_paths_pending -= 1
+                    continue
+                fields = record.lstrip(b"\n").split(b"\t", 2)
+                if len(fields) < 3:
+                    continue
+                added, deleted, file_path = fields
+                current["added"] += int(added) if added.isdigit() else 0
+                current["deleted"] += int(deleted) if deleted.isdigit() else 0
+                current["files"] += 1
+                if not file_path:
+                    rename_paths_pending = 2
+        if current is not None:
+            yield current
+    finally:
+        timer.cancel()
+        if proc.poll() is None:
+            proc.kill()
+        if proc.stdout is not None:
+            proc.stdout.close()
+        proc.wait()
+
+
+def _iter_nul_records(stream: IO[bytes] | None) -> Iterator[bytes]:
+    """Split a byte stream on NUL without buffering more than one read plus a partial record."""
+    if stream is None:
+        return
+    pending = b""
+    while True:
+        chunk = stream.read1(_HISTORY_READ_SIZE) if hasattr(stream, "read1") else stream.read(_HISTORY_READ_SIZE)
+        if not chunk:
+            break
+        buf = pending + chunk
+        start = 0
+        while (end := buf.find(b"\0", start)) != -1:
+            part = buf[start:end]
+            start = end + 1
+            if part.strip(b"\n"):
+                yield part
+        pending = buf[start:]
+    if pending.strip(b"\n"):
+        yield pending
+
+
+def _parse_history_header(raw: bytes, numstat: bool) -> dict:
+    commit, _, rest = raw.decode("utf-8", errors="replace").partition("\x1f")
+    timestamp, _, message = rest.partition("\x1f")
+    entry = {"commit": commit.strip(), "message": message.strip(), "timestamp": timestamp.strip()}
+    if numstat:
+        entry.update({"added": 0, "deleted": 0, "files": 0})
+    return entry
+
+
+def _module_source(
+    repo_path: str, rel_path: str, session: GitSession | None, index: AstIndex | None
+) -> str | None:
+    """Text of rel_path, from the AstIndex when it read the file, else from the repo. None if missing."""
+    if index is not None:
+        source = index.source(rel_path)
+        if source is not None:
+            return source
+    return read_repo_file(repo_path, rel_path, session)
+
+
+def _module_tree(rel_path: str, source: str, index: AstIndex | None) -> ast.Module:
+    """Parsed module, reusing the AstIndex tree when present. Raises SyntaxError when it does not parse."""
+    if index is not None:
+        if rel_path in index.errors:
+            raise SyntaxError(index.errors[rel_path].removeprefix("syntax error: "))
+        tree = index.get(rel_path)
+        if tree is not None:
+            return tree
+    return ast.parse(source)
+
+
+def git_blob_sha(data: bytes) -> str:
+    """Git blob object id of raw file bytes (`git hash-object` without filters), without a git process."""
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
+def tracked_blob_shas(repo_path: str, session: GitSession | None = None) -> dict[str, str]:
+    """Tracked path -> blob sha as recorded in the git index (`git ls-files -s`); reads no file."""
+    if session is not None:
+        return session.ls_files_stage()
+    try:
+        result = subprocess.run(["git", "ls-files", "-s", "-z"], cwd=repo_path, capture_output=True, timeout=30)
+    except (FileNotFoundError, NotADirectoryError, subprocess.TimeoutExpired):
+        return {}
+    if result.returncode != 0:
+        return {}
+    return parse_ls_files_stage(result.stdout)
+
+
+def parse_ls_files_stage(output: bytes) -> dict[str, str]:
+    """Parse `git ls-files -s -z` records ("<mode> <sha> <stage>\t<path>")."""
+    shas: dict[str, str] = {}
+    for record in output.decode("utf-8", errors="replace").split("\0"):
+        meta, _, path = record.partition("\t")
+        fields = meta.split(" ")
+        if path and len(fields) == 3:
+            shas[path] = fields[1]
+    return shas
+
+
+def _modified_files(repo_path: str) -> list[str]:
+    """Tracked files whose working-tree content differs from the index (skip-worktree paths excluded)."""
     try:
         result = subprocess.run(
-            [
-                "git",
-                "log",
-                "--format=%h %s %ci",
-                "--reverse",
-                "-z",
-            ],
-            cwd=path,
-            capture_output=True,
-            text=True,
-            timeout=30,
+            ["git", "diff", "--name-only", "-z"], cwd=repo_path, capture_output=True, timeout=30
         )
-    except FileNotFoundError:
-        return []
-    except subprocess.TimeoutExpired:
+    except (FileNotFoundError, NotADirectoryError, subprocess.TimeoutExpired):
         return []
     if result.returncode != 0:
         return []
+    return [p for p in result.stdout.decode("utf-8", errors="replace").split("\0") if p]
 
-    entries = []
-    for block in (result.stdout or "").strip("\0").split("\0"):
-        block = block.strip()
-        if not block:
-            continue
-        parts = block.split()
-        if len(parts) < 2:
-            continue
-        commit = parts[0]
-        # %ci is YYYY-MM-DD HH:MM:SS +tz (3 tokens at end)
-        if len(parts) >= 4 and parts[-3][:1].isdigit() and parts[-2][:1].isdigit():
-            timestamp = " ".join(parts[-3:])
-            message = " ".join(parts[1:-3])
-        else:
-            timestamp = ""
-            message = " ".join(parts[1:])
-        entries.append({"commit": commit, "message": message, "timestamp": timestamp})
-    return entries
-
-
-def analyze_graph_structure(repo_path: str) -> dict:
+
+def repo_analysis_key(repo_path: str, session: GitSession | None = None) -> str | None:
+    """
+    Analysis cache key over the git blob shas of every indexable .py file, taken from the git index
+    before any file is read; files modified in the working tree are hashed from their bytes on disk.
+    None when the path is not a git repository.
+    """
+    from src.tools.ast_index import is_indexable
+
+    shas = {rel: sha for rel, sha in tracked_blob_shas(repo_path, session).items() if is_indexable(rel)}
+    if not shas:
+        return None
+    for rel in _modified_files(repo_path):
+        if rel in shas:
+            disk = Path(repo_path) / rel
+            shas[rel] = git_blob_sha(disk.read_bytes()) if disk.is_file() else "deleted"
+    listing = "\n".join(f"{sha} {rel}" for rel, sha in sorted(shas.items()))
+    return "repo_analysis:" + hashlib.sha256(listing.encode("utf-8")).hexdigest()
+
+
+def analyze_repo(
+    repo_path: str,
+    session: GitSession | None = None,
+    files: list[str] | None = None,
+    cache: KVCache | None = None,
+) -> dict[str, dict]:
+    """
+    RepoInvestigator's structural analyses in one call: {"graph_structure", "state_schema", "security"}
+    (analyze_graph_structure, analyze_state_schema, scan_security_calls over one AstIndex, fed by a
+    single run_analyzers traversal per module that carries every analyzer the module needs). With a
+    cache (see default_analysis_cache) the key comes from git blob shas (repo_analysis_key), so a
+    re-audit of an unchanged repo reads and parses nothing; the index is built only on a miss.
+    """
+    from src.tools.ast_index import build_ast_index
+
+    key = repo_analysis_key(repo_path, session) if cache is not None else None
+    cached = cache.get_json(key) if key is not None else None
+    if cached is not None:
+        cached["graph_structure"]["edges"] = [tuple(e) for e in cached["graph_structure"]["edges"]]
+        return cached
+    index = build_ast_index(repo_path, session=session, files=files)
+    graph_files = locate_graph_files(index) or [rel for rel in CONVENTIONAL_GRAPH_FILES if rel in index][:1]
+    # One engine pass per module: security everywhere, graph wiring and state schema where they apply
+    engine_results: dict[str, dict[str, Any]] = {}
+    for rel in index.paths():
+        analyzers: list[NodeAnalyzer] = [SecurityCallAnalyzer()]
+        if rel in graph_files:
+            analyzers.append(GraphWiringAnalyzer())
+        if rel == STATE_FILE:
+            analyzers.append(StateSchemaAnalyzer())
+        engine_results[rel] = run_analyzers(index.get(rel), analyzers, path=rel)
+    result = {
+        "graph_structure": analyze_graph_structure(
+            repo_path, session=session, index=index, graph_files=graph_files, engine_results=engine_results
+        ),
+        "state_schema": analyze_state_schema(repo_path, session=session, index=index, engine_results=engine_results),
+        "security": scan_security_calls(index, engine_results=engine_results),
+    }
+    if key is not None:
+        cache.set_json(key, result)
+    return result
+
+
+def default_analysis_cache() -> KVCache | None:
+    """
+    Process-wide on-disk cache of analyze_repo results keyed by git blob shas, or None when disabled.
+    AUDITOR_ANALYSIS_CACHE=0 disables it; AUDITOR_ANALYSIS_CACHE_DIR sets the directory;
+    AUDITOR_ANALYSIS_CACHE_MAX_MB sets the size budget (default 64).
+    """
+    global _default_analysis_cache
+    if not env_flag("AUDITOR_ANALYSIS_CACHE", True):
+        return None
+    path = Path(os.environ.get("AUDITOR_ANALYSIS_CACHE_DIR") or DEFAULT_CACHE_ROOT) / "analysis.sqlite"
+    max_bytes = env_max_bytes("AUDITOR_ANALYSIS_CACHE_MAX_MB", 64)
+    cache = _default_analysis_cache
+    if cache is None or cache.path != path or cache.max_bytes != max_bytes:
+        cache = _default_analysis_cache = KVCache(path, max_bytes=max_bytes, version=ANALYSIS_CACHE_VERSION)
+    return cache
+
+
+def analyze_graph_structure(
+    repo_path: str,
+    session: GitSession | None = None,
+    index: AstIndex | None = None,
+    graph_files: list[str] | None = None,
+    engine_results: dict[str, dict[str, Any]] | None = None,
+) -> dict:
     """
     Use Python AST to detect StateGraph, add_edge, add_node, parallelism, reducers
     in src/graph.py (or graph.py). Does not rely on regex for structure (SRS FR-7).
+    With an AstIndex the graph is located anywhere in the repo (import_graph.locate_graph_files:
+    the primary StateGraph construction site plus the helpers it calls that wire nodes/edges), and
+    already-parsed modules are reused. analyze_repo passes the graph_files it located and the
+    engine_results of its per-module run_analyzers pass, so no module is traversed again here.
+    Results are cached per repo by analyze_repo.
 
     Returns dict with keys: nodes, edges, has_parallelism, reducers_used, file_found, error,
-    wiring_summary, parallel_sources, fan_in_targets (AST-based structural analysis for Evidence).
+    wiring_summary, parallel_sources, fan_in_targets, graph_files (AST-based structural
+    analysis for Evidence).
     """
-    path = Path(repo_path)
-    candidates = [
-        path / "src" / "graph.py",
-        path / "graph.py",
-    ]
-    graph_file = None
-    for p in candidates:
-        if p.is_file():
-            graph_file = p
-            break
-    if not graph_file:
-        return {
-            "file_found": False,
-            "nodes": [],
-            "edges": [],
-            "has_parallelism": False,
-            "reducers_used": False,
-            "error": "no graph file found",
-            "wiring_summary": "",
-            "parallel_sources": [],
-            "fan_in_targets": [],
-        }
-
+    sources: dict[str, str] = {}
     try:
-        source = graph_file.read_text(encoding="utf-8", errors="replace")
+        if graph_files is None:
+            graph_files = locate_graph_files(index) if index is not None else []
+        for rel in graph_files:
+            source = _module_source(repo_path, rel, session, index)
+            if source is not None:
+                sources[rel] = source
+        if not sources:
+            for rel in CONVENTIONAL_GRAPH_FILES:
+                source = _module_source(repo_path, rel, session, index)
+                if source is not None:
+                    sources[rel] = source
+                    break
     except OSError as e:
         return {
             "file_found": True,
@@ -186,68 +561,60 @@ def analyze_graph_structure(repo_path: str) -> dict:
             "wiring_summary": "",
             "parallel_sources": [],
             "fan_in_targets": [],
+            "graph_files": [],
         }
-
-    try:
-        tree = ast.parse(source)
-    except SyntaxError as e:
+    if not sources:
         return {
-            "file_found": True,
+            "file_found": False,
             "nodes": [],
             "edges": [],
             "has_parallelism": False,
             "reducers_used": False,
-            "error": f"syntax error: {e}",
+            "error": "no graph file found",
             "wiring_summary": "",
             "parallel_sources": [],
             "fan_in_targets": [],
+            "graph_files": [],
         }
-
-    nodes: list[str] = []
-    edges: list[tuple[str, str]] = []
-    add_edge_calls: list[tuple[str, str]] = []
-    add_node_calls: list[str] = []
-    has_state_graph = False
-    has_add_conditional_edges = False
-    reducers_seen = False
-
-    for node in ast.walk(tree):
-        if isinstance(node, ast.Call):
-            func = node.func
-            name = _call_name(func)
-            if name and "StateGraph" in name:
-                has_state_graph = True
-            if name and "add_edge" in name:
-                src, tgt = _edge_args(node)
-                if src and tgt:
-                    add_edge_calls.append((src, tgt))
-            if name and "add_node" in name:
-                node_name = _add_node_arg(node)
-                if node_name:
-                    add_node_calls.append(node_name)
-            if name and "add_conditional" in name.lower():
-                has_add_conditional_edges = True
-        if isinstance(node, ast.Assign):
-            for t in node.targets:
-                if isinstance(t, ast.Name) and t.id == "reducer":
-                    reducers_seen = True
-        if isinstance(node, ast.FunctionDef):
-            for stmt in ast.walk(node):
-                if isinstance(stmt, ast.Call):
-                    n = _call_name(stmt.func)
-                    if n in ("operator.ior", "operator.add", "ior", "add"):
-                        reducers_seen = True
-
-    nodes = list(dict.fromkeys(add_node_calls))
-    edges = list(dict.fromkeys(add_edge_calls))
-    sources = [e[0] for e in edges]
-    targets = [e[1] for e in edges]
-    has_parallelism = has_add_conditional_edges or any(sources.count(s) > 1 for s in set(sources))
-
+    graph_files = list(sources)
+
+    # Wiring is accumulated across the construction site and its helper modules
+    parts: list[dict[str, Any]] = []
+    for rel, source in sources.items():
+        try:
+            tree = _module_tree(rel, source, index)
+        except SyntaxError as e:
+            if rel != graph_files[0]:
+                continue  # a broken helper module does not hide the main graph
+            return {
+                "file_found": True,
+                "nodes": [],
+                "edges": [],
+                "has_parallelism": False,
+                "reducers_used": False,
+                "error": f"syntax error: {e}",
+                "wiring_summary": "",
+                "parallel_sources": [],
+                "fan_in_targets": [],
+                "graph_files": graph_files,
+            }
+        parts.append(_engine_result(tree, rel, GraphWiringAnalyzer(), engine_results))
+    wiring = _merge_wiring(parts)
+    source = "\n".join(sources.values())
+
+    nodes: list[str] = wiring["nodes"]
+    edges: list[tuple[str, str]] = wiring["edges"]
+    has_state_graph = wiring["has_state_graph"]
+    has_add_conditional_edges = wiring["has_conditional"]
+    reducers_seen = wiring["reducers_seen"]
+
+    out_degree = Counter(src for src, _ in edges)
+    in_degree = Counter(tgt for _, tgt in edges)
     # Parallelism pattern: nodes that fan out (multiple outgoing edges)
-    parallel_sources = [s for s in set(sources) if sources.count(s) > 1]
+    parallel_sources = [src for src, count in out_degree.items() if count > 1]
+    has_parallelism = has_add_conditional_edges or bool(parallel_sources)
     # Fan-in: nodes that receive from multiple predecessors
-    fan_in_targets = [t for t in set(targets) if targets.count(t) > 1]
+    fan_in_targets = [tgt for tgt, count in in_degree.items() if count > 1]
     # Human-readable wiring summary for Evidence content/rationale
     wiring_summary = _build_wiring_summary(
         has_state_graph=has_state_graph,
@@ -260,7 +627,7 @@ def analyze_graph_structure(repo_path: str) -> dict:
         has_conditional=has_add_conditional_edges,
     )
 
-    return {
+    result = {
         "file_found": True,
         "nodes": nodes,
         "edges": edges,
@@ -270,6 +637,29 @@ def analyze_graph_structure(repo_path: str) -> dict:
         "wiring_summary": wiring_summary,
         "parallel_sources": parallel_sources,
         "fan_in_targets": fan_in_targets,
+        "graph_files": graph_files,
+    }
+    return result
+
+
+def _engine_result(
+    tree: ast.Module, rel_path: str, analyzer: NodeAnalyzer, engine_results: dict[str, dict[str, Any]] | None
+) -> Any:
+    """analyzer's result for rel_path from analyze_repo's shared pass, else from a pass of its own."""
+    shared = (engine_results or {}).get(rel_path, {})
+    if analyzer.name in shared:
+        return shared[analyzer.name]
+    return run_analyzers(tree, [analyzer], path=rel_path)[analyzer.name]
+
+
+def _merge_wiring(parts: list[dict[str, Any]]) -> dict[str, Any]:
+    """GraphWiringAnalyzer results of several modules as one graph (first-seen node and edge order)."""
+    return {
+        "has_state_graph": any(p["has_state_graph"] for p in parts),
+        "nodes": list(dict.fromkeys(n for p in parts for n in p["nodes"])),
+        "edges": list(dict.fromkeys(e for p in parts for e in p["edges"])),
+        "has_conditional": any(p["has_conditional"] for p in parts),
+        "reducers_seen": any(p["reducers_seen"] for p in parts),
     }
 
 
@@ -294,40 +684,44 @@ def _build_wiring_summary(
     return " ".join(parts)
 
 
-def analyze_state_schema(repo_path: str) -> dict:
+def analyze_state_schema(
+    repo_path: str,
+    session: GitSession | None = None,
+    index: AstIndex | None = None,
+    engine_results: dict[str, dict[str, Any]] | None = None,
+) -> dict:
     """
     AST-based analysis of src/state.py: Pydantic models (Evidence, JudicialOpinion, etc.)
     and TypedDict/Annotated reducer usage. Integrates with Evidence for state_management_rigor.
+    index and engine_results as for analyze_graph_structure.
 
     Returns dict with keys: file_found, models_found, reducer_keys, has_evidence, has_judicial_opinion,
     has_agent_state, error.
     """
-    path = Path(repo_path)
-    state_file = path / "src" / "state.py"
-    if not state_file.is_file():
+    try:
+        source = _module_source(repo_path, STATE_FILE, session, index)
+    except OSError as e:
         return {
-            "file_found": False,
+            "file_found": True,
             "models_found": [],
             "reducer_keys": [],
             "has_evidence": False,
             "has_judicial_opinion": False,
             "has_agent_state": False,
-            "error": "src/state.py not found",
+            "error": str(e),
         }
-    try:
-        source = state_file.read_text(encoding="utf-8", errors="replace")
-    except OSError as e:
+    if source is None:
         return {
-            "file_found": True,
+            "file_found": False,
             "models_found": [],
             "reducer_keys": [],
             "has_evidence": False,
             "has_judicial_opinion": False,
             "has_agent_state": False,
-            "error": str(e),
+            "error": "src/state.py not found",
         }
     try:
-        tree = ast.parse(source)
+        tree = _module_tree(STATE_FILE, source, index)
     except SyntaxError as e:
         return {
             "file_found": True,
@@ -339,38 +733,12 @@ def analyze_state_schema(repo_path: str) -> dict:
             "error": f"syntax error: {e}",
         }
 
-    models_found: list[str] = []
-    reducer_keys: list[str] = []
-    has_evidence = False
-    has_judicial_opinion = False
-    has_agent_state = False
-
-    for node in ast.walk(tree):
-        if isinstance(node, ast.ClassDef):
-            name = node.name
-            if name:
-                models_found.append(name)
-            if name == "Evidence":
-                has_evidence = True
-            if name == "JudicialOpinion":
-                has_judicial_opinion = True
-            if name == "AgentState":
-                has_agent_state = True
-        if isinstance(node, ast.AnnAssign) and isinstance(node.target, ast.Name):
-            # Annotated[..., reducer] pattern: target id is the state key
-            key_name = node.target.id
-            if isinstance(node.annotation, ast.Subscript):
-                ann = node.annotation
-                if isinstance(ann.slice, ast.Tuple) or hasattr(ann.slice, "elts"):
-                    # Annotated[dict[str, list[Evidence]], merge_evidences] -> key_name
-                    reducer_keys.append(key_name)
-            # Also check for simple Name annotation that might be Annotated alias
-            for child in ast.walk(node):
-                if isinstance(child, ast.Call):
-                    n = _call_name(child.func)
-                    if n and ("merge" in n.lower() or "ior" in str(n) or "add" in str(n)):
-                        if key_name not in reducer_keys:
-                            reducer_keys.append(key_name)
+    schema = _engine_result(tree, STATE_FILE, StateSchemaAnalyzer(), engine_results)
+    models_found: list[str] = schema["models_found"]
+    reducer_keys: list[str] = schema["reducer_keys"]
+    has_evidence = "Evidence" in models_found
+    has_judicial_opinion = "JudicialOpinion" in models_found
+    has_agent_state = "AgentState" in models_found
 
     if not reducer_keys and ("merge_evidences" in source or "merge_opinions" in source):
         if "evidences" in source:
@@ -378,7 +746,7 @@ def analyze_state_schema(repo_path: str) -> dict:
         if "opinions" in source:
             reducer_keys.append("opinions")
 
-    return {
+    result = {
         "file_found": True,
         "models_found": models_found,
         "reducer_keys": list(dict.fromkeys(reducer_keys)),
@@ -387,36 +755,27 @@ def analyze_state_schema(repo_path: str) -> dict:
         "has_agent_state": has_agent_state,
         "error": None,
     }
+    return result
 
 
-def _call_name(func: ast.expr) -> str | None:
-    if isinstance(func, ast.Name):
-        return func.id
-    if isinstance(func, ast.Attribute):
-        return f"{_call_name(func.value) or ''}.{func.attr}"
-    return None
-
-
-def _edge_args(node: ast.Call) -> tuple[str | None, str | None]:
-    if len(node.args) >= 2:
-        src = _arg_value(node.args[0])
-        tgt = _arg_value(node.args[1])
-        return (src, tgt)
-    return (None, None)
-
-
-def _arg_value(arg: ast.expr) -> str | None:
-    if isinstance(arg, ast.Constant):
-        return str(arg.value) if arg.value is not None else None
-    if isinstance(arg, ast.Str):
-        return arg.s
-    return None
-
+def scan_security_calls(index: AstIndex, engine_results: dict[str, dict[str, Any]] | None = None) -> dict:
+    """
+    Shell- and code-executing calls (os.system, subprocess with shell=True, eval/exec) across
+    every module in the AST index; one engine pass per module, or none when engine_results
+    (from analyze_repo) already carry the module's security findings. For safe_tool_engineering.
 
-def _add_node_arg(node: ast.Call) -> str | None:
-    if len(node.args) >= 1:
-        return _arg_value(node.args[0])
-    return None
+    Returns dict with keys: modules_scanned, findings (call, issue, path, line), subprocess_calls.
+    """
+    findings: list[dict] = []
+    subprocess_calls = 0
+    for rel in index.paths():
+        tree = index.get(rel)
+        if tree is None:
+            continue
+        security = _engine_result(tree, rel, SecurityCallAnalyzer(), engine_results)
+        findings.extend(security["findings"])
+        subprocess_calls += security["subprocess_calls"]
+    return {"modules_scanned": len(index.paths()), "findings": findings, "subprocess_calls": subprocess_calls}
 
 
 def _has_reducer_in_source(source: str) -> bool:
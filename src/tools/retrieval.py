@@ -0,0 +1,326 @@
+"""
+Chunk retrieval for the RAG-lite PDF interface. Retrievers are built once per chunk set (at
+ingest time) and share one interface (Retriever); build_retriever picks one by name:
+- "bm25" (default): inverted index with BM25 scoring over pre-tokenized, lowercased chunks. A
+  query touches only the posting lists of its terms, so its cost scales with matching postings.
+- "tfidf": NumPy TF-IDF over word and character n-gram features with cosine scoring; matches
+  inflected and compound forms (reducer / reducers, fan-in / fanin). Requires numpy (extra "vector").
+"""
+
+from __future__ import annotations
+
+import heapq
+import logging
+import math
+import os
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"[a-z0-9_]+")
+# Same minimum term length as the former keyword-overlap scorer (drops "a", "is", "of", ...)
+_MIN_TOKEN_LEN = 3
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercased alphanumeric terms of at least _MIN_TOKEN_LEN characters."""
+    return [t for t in _TOKEN_RE.findall(text.lower()) if len(t) >= _MIN_TOKEN_LEN]
+
+
+class Retriever:
+    """
+    Ranked retrieval over a fixed list of chunks. Subclasses implement search(); batch and
+    chunk-text helpers derive from it. search_batch may be overridden with a shared-pass version.
+    """
+
+    name = "retriever"
+    chunks: list[str]
+
+    def __len__(self) -> int:
+        return len(self.chunks)
+
+    def search(self, question: str, top_k: int = 5) -> list[tuple[int, float]]:
+        """Top-k (chunk_id, score) by descending score; ties keep document order; no zero scores."""
+        raise NotImplementedError
+
+    def search_batch(self, questions: list[str], top_k: int = 5) -> list[list[tuple[int, float]]]:
+        return [self.search(q, top_k) for q in questions]
+
+    def top_chunks(self, question: str, top_k: int = 5) -> list[str]:
+        return [self.chunks[chunk_id] for chunk_id, _ in self.search(question, top_k)]
+
+    def top_chunks_batch(self, questions: list[str], top_k: int = 5) -> list[list[str]]:
+        return [[self.chunks[chunk_id] for chunk_id, _ in hits] for hits in self.search_batch(questions, top_k)]
+
+
+class BM25Index(Retriever):
+    """
+    Inverted index over a fixed list of chunks with Okapi BM25 ranking.
+    postings: term -> [(chunk_id, term frequency)]; idf and length norms precomputed.
+    """
+
+    name = "bm25"
+
+    def __init__(self, chunks: list[str], k1: float = 1.5, b: float = 0.75):
+        self.chunks = chunks
+        self.k1 = k1
+        self.b = b
+        self.postings: dict[str, list[tuple[int, int]]] = {}
+        lengths: list[int] = []
+        for chunk_id, chunk in enumerate(chunks):
+            terms = tokenize(chunk)
+            lengths.append(len(terms))
+            for term, tf in Counter(terms).items():
+                self.postings.setdefault(term, []).append((chunk_id, tf))
+        n = len(chunks)
+        avgdl = (sum(lengths) / n) if n else 0.0
+        self.idf = {
+            term: math.log(1 + (n - len(plist) + 0.5) / (len(plist) + 0.5)) for term, plist in self.postings.items()
+        }
+        # Per-chunk BM25 length normalization: k1 * (1 - b + b * len / avgdl)
+        self._norm = [k1 * (1 - b + b * (length / avgdl if avgdl else 0.0)) for length in lengths]
+
+    def to_dict(self) -> dict:
+        """JSON-serializable index state (postings, idf, length norms); chunks are stored by the caller."""
+        return {"k1": self.k1, "b": self.b, "postings": self.postings, "idf": self.idf, "norm": self._norm}
+
+    @classmethod
+    def from_dict(cls, chunks: list[str], data: dict) -> BM25Index:
+        """Rebuild an index from to_dict() output without re-tokenizing the chunks."""
+        index = cls.__new__(cls)
+        index.chunks = chunks
+        index.k1 = data["k1"]
+        index.b = data["b"]
+        index.postings = {term: [(c, tf) for c, tf in plist] for term, plist in data["postings"].items()}
+        index.idf = data["idf"]
+        index._norm = data["norm"]
+        return index
+
+    def scores(self, question: str) -> dict[int, float]:
+        """BM25 score per chunk that contains at least one query term (accumulated over postings)."""
+        acc: dict[int, float] = {}
+        for term in set(tokenize(question)):
+            plist = self.postings.get(term)
+            if not plist:
+                continue
+            idf = self.idf[term]
+            k1 = self.k1
+            norm = self._norm
+            for chunk_id, tf in plist:
+                acc[chunk_id] = acc.get(chunk_id, 0.0) + idf * tf * (k1 + 1) / (tf + norm[chunk_id])
+        return acc
+
+    def search(self, question: str, top_k: int = 5) -> list[tuple[int, float]]:
+        """Top-k (chunk_id, score) by descending score; ties keep document order."""
+        acc = self.scores(question)
+        return heapq.nsmallest(top_k, acc.items(), key=lambda item: (-item[1], item[0]))
+
+    def search_batch(self, questions: list[str], top_k: int = 5) -> list[list[tuple[int, float]]]:
+        """
+        search() for many questions in one pass over the index: each distinct term's posting list
+        is read and weighted once, then added to every question that contains the term.
+        """
+        term_questions: dict[str, list[int]] = {}
+        for qi, question in enumerate(questions):
+            for term in set(tokenize(question)):
+                term_questions.setdefault(term, []).append(qi)
+        accs: list[dict[int, float]] = [{} for _ in questions]
+        k1 = self.k1
+        norm = self._norm
+        for term, qids in term_questions.items():
+            plist = self.postings.get(term)
+            if not plist:
+                continue
+            idf = self.idf[term]
+            weights = [(chunk_id, idf * tf * (k1 + 1) / (tf + norm[chunk_id])) for chunk_id, tf in plist]
+            for qi in qids:
+                acc = accs[qi]
+                for chunk_id, weight in weights:
+                    acc[chunk_id] = acc.get(chunk_id, 0.0) + weight
+        return [heapq.nsmallest(top_k, acc.items(), key=lambda item: (-item[1], item[0])) for acc in accs]
+
+
+# Character n-gram length for TfidfRetriever (within words, with boundary markers)
+_NGRAM = 4
+
+
+def tfidf_features(text: str) -> Counter[str]:
+    """Counts of word terms (as tokenize) plus character n-grams of each word ("<red", ..., "ers>")."""
+    features: Counter[str] = Counter()
+    for word, count in Counter(_TOKEN_RE.findall(text.lower())).items():
+        for feature in _word_features(word):
+            features[feature] += count
+    return features
+
+
+@lru_cache(maxsize=65536)
+def _word_features(word: str) -> tuple[str, ...]:
+    marked = f"<{word}>"
+    grams = tuple(marked[i : i + _NGRAM] for i in range(len(marked) - _NGRAM + 1))
+    return (word, *grams) if len(word) >= _MIN_TOKEN_LEN else grams
+
+
+class TfidfRetriever(Retriever):
+    """
+    TF-IDF with cosine similarity, vectorized with NumPy. Chunk vectors (sublinear tf, smoothed
+    idf, L2-normalized rows) are stored as a sparse term-major matrix (CSC: indptr / rows / vals),
+    so a query is one sparse matrix-vector product over its features' columns (np.bincount) and
+    a batch of queries one sparse matrix-matrix product (search_batch).
+    """
+
+    name = "tfidf"
+
+    def __init__(self, chunks: list[str]):
+        np = _numpy()
+        self.chunks = chunks
+        n = len(chunks)
+        # Word counts per chunk, then each word expanded to its features in NumPy: features of
+        # distinct words are generated once, not once per occurrence
+        word_ids: dict[str, int] = {}
+        entry_chunks: list[int] = []
+        entry_words: list[int] = []
+        entry_counts: list[int] = []
+        for chunk_id, chunk in enumerate(chunks):
+            for word, count in Counter(_TOKEN_RE.findall(chunk.lower())).items():
+                entry_chunks.append(chunk_id)
+                entry_words.append(word_ids.setdefault(word, len(word_ids)))
+                entry_counts.append(count)
+        vocab: dict[str, int] = {}
+        word_features = [[vocab.setdefault(f, len(vocab)) for f in _word_features(w)] for w in word_ids]
+        self.vocab = vocab
+        feature_lens = np.array([len(fs) for fs in word_features], dtype=np.int64)
+        feature_flat = np.fromiter(
+            (f for fs in word_features for f in fs), dtype=np.int64, count=int(feature_lens.sum())
+        )
+        feature_ptr = np.concatenate(([0], np.cumsum(feature_lens)))
+        words = np.array(entry_words, dtype=np.int64)
+        lengths = feature_lens[words]
+        features = feature_flat[_gather(np, feature_ptr[words], lengths)]
+        chunk_col = np.repeat(np.array(entry_chunks, dtype=np.int64), lengths)
+        # Sum duplicate (feature, chunk) pairs; keys sort term-major, which is CSC order
+        keys, inverse = np.unique(features * max(n, 1) + chunk_col, return_inverse=True)
+        tfs = np.bincount(inverse, weights=np.repeat(np.array(entry_counts, dtype=np.float64), lengths))
+        terms, rows = keys // max(n, 1), keys % max(n, 1)
+        df = np.bincount(terms, minlength=len(vocab))
+        self.idf = np.log((1 + n) / (1 + df)) + 1.0
+        vals = (1.0 + np.log(tfs)) * self.idf[terms]
+        norms = np.sqrt(np.bincount(rows, weights=vals * vals, minlength=n))
+        self.vals = vals / np.where(norms > 0, norms, 1.0)[rows]
+        self.rows = rows
+        self.indptr = np.concatenate(([0], np.cumsum(df)))
+
+    def scores(self, question: str) -> Any:
+        """Cosine similarity of every chunk to the question (dense float array, one per chunk)."""
+        np = _numpy()
+        term_ids, weights = self._query_vector(question)
+        starts = self.indptr[term_ids]
+        lengths = self.indptr[term_ids + 1] - starts
+        offsets = _gather(np, starts, lengths)
+        return np.bincount(
+            self.rows[offsets], weights=self.vals[offsets] * np.repeat(weights, lengths), minlength=len(self.chunks)
+        )
+
+    def search(self, question: str, top_k: int = 5) -> list[tuple[int, float]]:
+        return _top_k(_numpy(), self.scores(question), top_k)
+
+    def search_batch(self, questions: list[str], top_k: int = 5) -> list[list[tuple[int, float]]]:
+        """
+        search() for many questions with one sparse matrix product: the questions' vectors form a
+        query matrix (COO: question / term / weight) that is multiplied against the chunk matrix in
+        a single gather + np.bincount into a questions x chunks score matrix; top-k is taken per row.
+        """
+        np = _numpy()
+        n = len(self.chunks)
+        vectors = [self._query_vector(question) for question in questions]
+        term_ids = np.concatenate([t for t, _ in vectors] or [np.zeros(0, dtype=np.int64)])
+        weights = np.concatenate([w for _, w in vectors] or [np.zeros(0)])
+        question_ids = np.repeat(np.arange(len(questions)), [len(t) for t, _ in vectors])
+        starts = self.indptr[term_ids]
+        lengths = self.indptr[term_ids + 1] - starts
+        offsets = _gather(np, starts, lengths)
+        scores = np.bincount(
+            np.repeat(question_ids, lengths) * n + self.rows[offsets],
+            weights=self.vals[offsets] * np.repeat(weights, lengths),
+            minlength=len(questions) * n,
+        ).reshape(len(questions), n)
+        return [_top_k(np, row, top_k) for row in scores]
+
+    def _query_vector(self, question: str) -> tuple[Any, Any]:
+        """(term ids, L2-normalized tf-idf weights) of the question's features that are in the vocabulary."""
+        np = _numpy()
+        counts = {f: c for f, c in tfidf_features(question).items() if f in self.vocab}
+        term_ids = np.fromiter((self.vocab[f] for f in counts), dtype=np.int64, count=len(counts))
+        if not counts:
+            return term_ids, np.zeros(0)
+        weights = (1.0 + np.log(np.fromiter(counts.values(), dtype=np.float64, count=len(counts)))) * self.idf[term_ids]
+        return term_ids, weights / np.linalg.norm(weights)
+
+
+RETRIEVERS: dict[str, type[Retriever]] = {"bm25": BM25Index, "tfidf": TfidfRetriever}
+DEFAULT_RETRIEVER = "bm25"
+
+
+def retriever_name(name: str | None = None) -> str:
+    """
+    Resolved retriever name: name, else AUDITOR_RETRIEVER, else bm25. Raises ValueError for an
+    unknown explicit name; an unknown AUDITOR_RETRIEVER, or tfidf without numpy, logs a warning
+    and falls back to bm25 so a misconfigured environment never fails an audit.
+    """
+    if name:
+        name = name.strip().lower()
+        if name not in RETRIEVERS:
+            raise ValueError(f"Unknown retriever {name!r}; expected one of {sorted(RETRIEVERS)}")
+    else:
+        name = (os.environ.get("AUDITOR_RETRIEVER") or DEFAULT_RETRIEVER).strip().lower()
+        if name not in RETRIEVERS:
+            logger.warning("Unknown AUDITOR_RETRIEVER %r (expected one of %s); using bm25", name, sorted(RETRIEVERS))
+            return DEFAULT_RETRIEVER
+    if name == "tfidf" and not _numpy_available():
+        logger.warning("The tfidf retriever requires numpy (extra 'vector'); using bm25")
+        return DEFAULT_RETRIEVER
+    return name
+
+
+def build_retriever(chunks: list[str], name: str | None = None) -> Retriever:
+    """Build the named retriever (see retriever_name) over chunks."""
+    return RETRIEVERS[retriever_name(name)](chunks)
+
+
+def _top_k(np: Any, scores: Any, top_k: int) -> list[tuple[int, float]]:
+    """Top-k (chunk_id, score) of the positive entries of a dense score row; ties keep document order."""
+    if top_k <= 0:
+        return []
+    candidates = np.flatnonzero(scores > 0)
+    if len(candidates) > top_k:
+        # Keep everything tied with the k-th best score so the tie-break below stays deterministic
+        kth = np.partition(scores[candidates], len(candidates) - top_k)[len(candidates) - top_k]
+        candidates = candidates[scores[candidates] >= kth]
+    ranked = sorted(candidates.tolist(), key=lambda chunk_id: (-scores[chunk_id], chunk_id))[:top_k]
+    return [(chunk_id, float(scores[chunk_id])) for chunk_id in ranked]
+
+
+def _gather(np: Any, starts: Any, lengths: Any) -> Any:
+    """Concatenated index ranges starts[i] .. starts[i] + lengths[i] (CSR/CSC slice gather)."""
+    return np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+
+
+@lru_cache(maxsize=1)
+def _numpy_available() -> bool:
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _numpy() -> Any:
+    try:
+        import numpy
+    except ImportError as e:
+        raise ImportError(
+            "The tfidf retriever requires numpy: install the 'vector' extra (automaton-auditor[vector])."
+        ) from e
+    return numpy
@@ -0,0 +1,30 @@
+import pytest
+
+from src.tools import llm_cache, llm_scheduler, pdf_cache, repo_cache, repo_tools
+
+
+@pytest.fixture(autouse=True)
+def _bypass_llm_cache(monkeypatch):
+    """Mocked-LLM tests must never replay responses cached by other tests or real runs."""
+    monkeypatch.setenv("AUDITOR_LLM_CACHE", "0")
+
+
+@pytest.fixture(autouse=True)
+def _isolate_caches(monkeypatch, tmp_path_factory):
+    """
+    Point every on-disk cache (clones, mirrors, analysis results, PDF text, LLM responses) at a
+    per-test directory and drop the process-wide singletons, so no test reads results left by
+    another test or a real audit, nor writes to ~/.cache/automaton_auditor.
+    """
+    root = tmp_path_factory.mktemp("auditor_cache")
+    monkeypatch.setenv("AUDITOR_REPO_CACHE_DIR", str(root / "repos"))
+    monkeypatch.setenv("AUDITOR_REPO_MIRROR_DIR", str(root / "mirrors"))
+    for name in ("AUDITOR_ANALYSIS_CACHE_DIR", "AUDITOR_PDF_TEXT_STORE_DIR", "AUDITOR_LLM_CACHE_DIR"):
+        monkeypatch.setenv(name, str(root))
+    monkeypatch.setattr(repo_cache, "_default_cache", None)
+    monkeypatch.setattr(repo_cache, "_default_pool", None)
+    monkeypatch.setattr(repo_tools, "_default_analysis_cache", None)
+    monkeypatch.setattr(pdf_cache, "_default_cache", None)
+    monkeypatch.setattr(pdf_cache, "_default_text_store", None)
+    monkeypatch.setattr(llm_cache, "_default_cache", None)
+    monkeypatch.setattr(llm_scheduler, "_default_scheduler", None)
@@ -0,0 +1,74 @@
+# Local OpenAI-compatible chat completions server (http.server) with scripted rate-limit/error replies
+from __future__ import annotations
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class FakeLLMServer:
+    """
+    Serves POST /v1/chat/completions on 127.0.0.1. Each request pops the next scripted
+    (status, headers) failure; once the script is empty it answers 200 with `content` as the
+    assistant message. Records the monotonic arrival time and status of every request.
+    """
+
+    def __init__(self, content: str = "ok", script: list[tuple[int, dict[str, str]]] | None = None):
+        self.content = content
+        self.script = list(script or [])
+        self.requests: list[tuple[float, int]] = []
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_address[1]}/v1"
+
+    def __enter__(self) -> FakeLLMServer:
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _reply(self) -> tuple[int, dict[str, str], dict]:
+        with self._lock:
+            status, headers = self.script.pop(0) if self.script else (200, {})
+            self.requests.append((time.monotonic(), status))
+        if status != 200:
+            return status, headers, {"error": {"message": f"scripted {status}", "type": "requests", "code": None}}
+        body = {
+            "id": "chatcmpl-fake",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": "gpt-4o-mini",
+            "choices": [
+                {"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": self.content}}
+            ],
+            "usage": {"prompt_tokens": 10, "completion_tokens": 10, "total_tokens": 20},
+        }
+        return status, headers, body
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                status, headers, body = server._reply()
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
@@ -0,0 +1,78 @@
+# Synthetic image PDFs and report-like images for vision/image tests (pypdf, Pillow, numpy)
+from __future__ import annotations
+
+import io
+import zlib
+
+from pypdf import PdfWriter
+from pypdf.generic import (
+    DecodedStreamObject,
+    DictionaryObject,
+    NameObject,
+    NumberObject,
+    StreamObject,
+)
+
+
+def _image_xobject(image) -> StreamObject:
+    """DCTDecode stream for "JPEG" images (bytes kept as-is), FlateDecode RGB rows otherwise."""
+    stream = StreamObject()
+    if image.format == "JPEG":
+        buf = io.BytesIO()
+        image.save(buf, format="JPEG", quality=90)
+        stream._data = buf.getvalue()
+        stream[NameObject("/Filter")] = NameObject("/DCTDecode")
+    else:
+        stream._data = zlib.compress(image.convert("RGB").tobytes())
+        stream[NameObject("/Filter")] = NameObject("/FlateDecode")
+    stream[NameObject("/Type")] = NameObject("/XObject")
+    stream[NameObject("/Subtype")] = NameObject("/Image")
+    stream[NameObject("/Width")] = NumberObject(image.width)
+    stream[NameObject("/Height")] = NumberObject(image.height)
+    stream[NameObject("/ColorSpace")] = NameObject("/DeviceRGB")
+    stream[NameObject("/BitsPerComponent")] = NumberObject(8)
+    return stream
+
+
+def write_image_pdf(path, pages: list[list]) -> str:
+    """
+    Write a PDF whose page i draws the PIL images pages[i] (stacked, at native size). Set
+    image.format = "JPEG" to embed an image as a DCT (JPEG) stream, else it is Flate RGB.
+    """
+    writer = PdfWriter()
+    for images in pages:
+        page = writer.add_blank_page(612, 792)
+        xobjects = DictionaryObject()
+        ops, y = [], 792
+        for i, image in enumerate(images, start=1):
+            name = f"/Im{i}"
+            xobjects[NameObject(name)] = writer._add_object(_image_xobject(image))
+            y -= image.height
+            ops.append(f"q {image.width} 0 0 {image.height} 0 {y} cm {name} Do Q")
+        content = DecodedStreamObject()
+        content.set_data("\n".join(ops).encode())
+        page[NameObject("/Contents")] = writer._add_object(content)
+        page[NameObject("/Resources")] = DictionaryObject({NameObject("/XObject"): xobjects})
+    with open(path, "wb") as f:
+        writer.write(f)
+    return str(path)
+
+
+def synthetic_report_images():
+    """(architecture diagram, noisy photo, gradient cover, wide banner), offline stand-ins for report images."""
+    import numpy as np
+    from PIL import Image, ImageDraw
+
+    diagram = Image.new("RGB", (800, 500), "white")
+    draw = ImageDraw.Draw(diagram)
+    for i, (x, y) in enumerate([(50, 50), (300, 50), (550, 50), (300, 300)]):
+        draw.rectangle((x, y, x + 180, y + 100), outline="black", width=3, fill=(220, 235, 255))
+        draw.text((x + 20, y + 40), f"Node {i}", fill="black")
+    draw.line((390, 150, 390, 300), fill="black", width=3)
+    rng = np.random.default_rng(0)
+    photo = Image.fromarray(rng.integers(0, 255, (40, 60, 3), dtype=np.uint8)).resize((600, 400), Image.NEAREST)
+    cover = np.zeros((500, 700, 3), dtype=np.uint8)
+    cover[..., 0] = np.linspace(30, 200, 700, dtype=np.uint8)
+    banner = Image.new("RGB", (1200, 150), (20, 40, 90))
+    ImageDraw.Draw(banner).text((20, 60), "ACME UNIVERSITY", fill="white")
+    return diagram, photo, Image.fromarray(cover), banner
@@ -0,0 +1,45 @@
+# Synthetic text PDF builder for doc tools tests and PDF benchmarks (pypdf only, no extra deps)
+from __future__ import annotations
+
+from pypdf import PdfWriter
+from pypdf.generic import DecodedStreamObject, DictionaryObject, NameObject
+
+
+def _escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def write_text_pdf(path, pages: list[str], lines_per_page: int = 40) -> str:
+    """Write a PDF whose page i shows pages[i] (Helvetica, wrapped to ~90 chars per line)."""
+    writer = PdfWriter()
+    font = DictionaryObject(
+        {
+            NameObject("/Type"): NameObject("/Font"),
+            NameObject("/Subtype"): NameObject("/Type1"),
+            NameObject("/BaseFont"): NameObject("/Helvetica"),
+        }
+    )
+    font_ref = writer._add_object(font)
+    for text in pages:
+        page = writer.add_blank_page(612, 792)
+        words, lines, line = text.split(), [], ""
+        for word in words:
+            if len(line) + len(word) + 1 > 90:
+                lines.append(line)
+                line = ""
+            line = f"{line} {word}".strip()
+        if line:
+            lines.append(line)
+        ops = ["BT", "/F1 10 Tf", "12 TL", "50 750 Td"]
+        for ln in lines[:lines_per_page]:
+            ops.append(f"({_escape(ln)}) Tj T*")
+        ops.append("ET")
+        stream = DecodedStreamObject()
+        stream.set_data("\n".join(ops).encode("latin-1", errors="replace"))
+        page[NameObject("/Contents")] = writer._add_object(stream)
+        page[NameObject("/Resources")] = DictionaryObject(
+            {NameObject("/Font"): DictionaryObject({NameObject("/F1"): font_ref})}
+        )
+    with open(path, "wb") as f:
+        writer.write(f)
+    return str(path)
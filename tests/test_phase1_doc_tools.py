@@ -3,6 +3,8 @@ Phase 1 tests: doc tools — ingest_pdf, query_doc, extract_images_from_pdf, ana
 RAG-like interface, page chunks, and robust error handling (PDFParseError).
 """
 
+import re
+
 import pytest
 from pypdf import PdfWriter
 
@@ -160,3 +162,467 @@ def test_analyze_diagram_returns_string():
     result = analyze_diagram(b"fake-image-bytes", "Describe the flow.")
     assert isinstance(result, str)
     assert len(result) >= 1
+
+
+def _blank_pdf(path, pages=1):
+    w = PdfWriter()
+    for _ in range(pages):
+        w.add_blank_page(612, 792)
+    with open(path, "wb") as f:
+        w.write(f)
+    return str(path)
+
+
+def test_pdf_artifact_cache_parses_once_across_nodes(tmp_path, monkeypatch):
+    """ingest_pdf (DocAnalyst, EvidenceAggregator) and extract_images_from_pdf (VisionInspector) share one parse."""
+    from src.tools import doc_tools
+    from src.tools.pdf_cache import PDFArtifactCache
+
+    cache = PDFArtifactCache()
+    monkeypatch.setattr(doc_tools, "default_pdf_cache", lambda: cache)
+    pdf = _blank_pdf(tmp_path / "report.pdf", pages=3)
+    copy = tmp_path / "copy.pdf"
+    copy.write_bytes((tmp_path / "report.pdf").read_bytes())  # same content, different path
+
+    first = ingest_pdf(pdf)
+    assert ingest_pdf(str(copy)).segments == first.segments
+    assert extract_images_from_pdf(pdf) == []
+    pages = ingest_pdf(pdf, chunk_by="page")
+    assert [s.page_no for s in pages.segments] == [1, 2, 3]
+    stats = cache.stats()
+    assert stats["parses"] == 1 and stats["parses_avoided"] == 3 and stats["entries"] == 1
+
+    bad = tmp_path / "bad.pdf"
+    bad.write_text("not a pdf")
+    with pytest.raises(PDFParseError):
+        ingest_pdf(str(bad))
+    assert cache.stats()["entries"] == 1  # failures are not cached
+
+
+def test_pdf_artifact_cache_memory_bound(tmp_path, monkeypatch):
+    from src.tools import doc_tools
+    from src.tools.pdf_cache import PDFArtifactCache
+    from tests.fixtures.text_pdf import write_text_pdf
+
+    monkeypatch.setenv("AUDITOR_PDF_TEXT_STORE", "0")
+    paths = [write_text_pdf(tmp_path / f"doc{i}.pdf", [f"Paragraph {i} " * 60 * (i + 1)]) for i in range(3)]
+    unbounded = PDFArtifactCache(max_bytes=None)
+    monkeypatch.setattr(doc_tools, "default_pdf_cache", lambda: unbounded)
+    sizes = [ingest_pdf(p) and unbounded.get(p).estimated_bytes() for p in paths]
+    budget = sizes[2] + sizes[1] // 2
+    cache = PDFArtifactCache(max_bytes=budget)
+    monkeypatch.setattr(doc_tools, "default_pdf_cache", lambda: cache)
+    for p in paths:
+        ingest_pdf(p)
+    assert cache.stats()["evictions"] >= 1
+    assert cache.stats()["parses"] == 3 and cache.get(paths[2]).page_texts  # most recent entry survives
+    assert cache.stats()["size_bytes"] <= budget
+
+
+def test_pdf_artifacts_read_lazily_from_file_handle(tmp_path, monkeypatch):
+    """The PDF is hashed in blocks and paged from an open handle: its bytes are never loaded whole."""
+    import gc
+    import hashlib
+    from pathlib import Path
+
+    from src.tools.pdf_cache import PDFArtifactCache
+
+    pdf = _blank_pdf(tmp_path / "report.pdf", pages=2)
+    expected = hashlib.sha256(Path(pdf).read_bytes()).hexdigest()
+    monkeypatch.setattr(Path, "read_bytes", lambda self: pytest.fail("PDF read into memory"))
+    cache = PDFArtifactCache()
+    entry = cache.get(pdf)
+    assert entry.sha256 == expected
+    assert len(entry.reader.pages) == 2
+    handle = entry.reader.stream
+    assert handle.name == pdf and not handle.closed
+    cache.clear()
+    del entry
+    gc.collect()
+    assert handle.closed
+
+
+def test_bm25_index_ranks_by_term_rarity_and_touches_only_postings():
+    from src.tools.retrieval import BM25Index, tokenize
+
+    chunks = [
+        "The StateGraph wires detectives in parallel with a fan-in aggregator.",
+        "Judges: prosecutor, defense and tech lead produce structured opinions.",
+        "The report discusses the report and the report again.",
+        "Unrelated appendix about fonts.",
+    ]
+    index = BM25Index(chunks)
+    assert tokenize("The Fan-in of StateGraph!") == ["the", "fan", "stategraph"]
+    assert index.top_chunks("How does the StateGraph fan-in work?", top_k=2)[0] == chunks[0]
+    assert index.top_chunks("structured opinions from judges", top_k=1) == [chunks[1]]
+    assert index.search("nonexistent zzz") == []
+    # Only chunks on the query terms' posting lists are scored
+    assert set(index.scores("prosecutor fonts")) == {1, 3}
+    # Repeated terms saturate (k1) rather than grow linearly
+    report = index.scores("report")[2]
+    assert 0 < report < 3 * index.idf["report"] * (index.k1 + 1)
+
+
+def test_ingest_pdf_builds_index_and_doc_store_uses_it(tmp_path):
+    pdf = _blank_pdf(tmp_path / "idx.pdf", pages=2)
+    result = ingest_pdf(pdf, chunk_by="page")
+    assert result.index is not None and len(result.index) == len(result.segments)
+    assert result.search_index() is result.index
+    store = DocStore(chunks=["graph wiring notes", "judicial opinions", "graph reducers"], source_path="")
+    # Same term frequency: the shorter chunk ranks first (BM25 length normalization)
+    assert store.search_chunks("graph", top_k=5) == ["graph reducers", "graph wiring notes"]
+    assert store.index is not None
+
+
+@pytest.mark.parametrize("retriever", ["bm25", "tfidf"])
+def test_query_batch_matches_individual_queries(retriever):
+    from src.tools.doc_tools import query_doc_batch
+    from src.tools.retrieval import Retriever, build_retriever
+
+    if retriever == "tfidf":
+        pytest.importorskip("numpy")
+    chunks = [f"section {i} covers {'graph wiring' if i % 3 == 0 else 'judicial opinions'} topic{i}" for i in range(30)]
+    questions = ["graph wiring", "judicial opinions", "topic7 graph", "zzzz qqqq", "graph wiring"]
+    index = build_retriever(chunks, retriever)
+    # Each retriever overrides the per-question loop of the base class
+    assert type(index).search_batch is not Retriever.search_batch
+    assert index.search_batch(questions, top_k=4) == [index.search(q, top_k=4) for q in questions]
+    result = PDFIngestionResult(segments=[ChunkSegment(text=c) for c in chunks], source_path="", retriever=retriever)
+    batch = query_doc_batch(result, questions)
+    assert batch == [result.query(q) for q in questions]
+    assert batch[3] == "No relevant excerpts found."
+    assert result.index.name == retriever
+    store = DocStore(chunks=chunks, source_path="", retriever=retriever)
+    assert store.query_batch(questions[:2]) == [store.query(q) for q in questions[:2]]
+    assert store.index.name == retriever
+
+
+def test_parallel_page_extraction_matches_serial(tmp_path, monkeypatch):
+    from src.tools import doc_tools
+    from tests.fixtures.text_pdf import write_text_pdf
+
+    monkeypatch.setattr(doc_tools, "default_pdf_cache", lambda: None)
+    monkeypatch.setattr(doc_tools, "default_pdf_text_store", lambda: None)
+    pages = [f"page marker{i:03d} discusses the graph wiring" for i in range(70)]
+    pdf = write_text_pdf(tmp_path / "large.pdf", pages)
+    serial = ingest_pdf(pdf, chunk_by="page", workers=1)
+    parallel = ingest_pdf(pdf, chunk_by="page", workers=3)
+    assert parallel.segments == serial.segments
+    assert [s.page_no for s in parallel.segments] == list(range(1, 71))
+    assert "marker069" in parallel.segments[-1].text
+    assert ingest_pdf(pdf, workers=3).segments == ingest_pdf(pdf, workers=1).segments
+    # Small PDFs never start a pool
+    assert doc_tools._extraction_workers(10, 8) == 1
+    assert doc_tools._extraction_workers(70, 8) == 4
+
+
+def test_parallel_page_extraction_reports_bad_page(tmp_path):
+    from src.tools import doc_tools
+    from tests.fixtures.text_pdf import write_text_pdf
+
+    pdf = write_text_pdf(tmp_path / "ok.pdf", ["alpha", "beta", "gamma"])
+    texts, error = doc_tools._extract_page_range(pdf, 0, 3)
+    assert [p for p, _ in texts] == [1, 2, 3] and error is None
+    texts, error = doc_tools._extract_page_range(pdf, 1, 5)  # page 4 does not exist
+    assert [p for p, _ in texts] == [2, 3]
+    assert error is not None and error[0] == 4 and error[1] == "IndexError"
+
+
+def test_iter_pdf_segments_streams_same_segments_and_stops_early(tmp_path, monkeypatch):
+    from src.tools import doc_tools
+    from src.tools.doc_tools import _CHUNK_OVERLAP, _CHUNK_SIZE, _split_into_chunks, iter_pdf_segments
+    from tests.fixtures.text_pdf import write_text_pdf
+
+    monkeypatch.setattr(doc_tools, "default_pdf_cache", lambda: None)
+    monkeypatch.setattr(doc_tools, "default_pdf_text_store", lambda: None)
+    pages = [" ".join(f"p{i}w{j}" for j in range(120 + 37 * (i % 4))) for i in range(12)]
+    pdf = write_text_pdf(tmp_path / "stream.pdf", pages)
+    for chunk_by in ("char", "page"):
+        assert list(iter_pdf_segments(pdf, chunk_by)) == ingest_pdf(pdf, chunk_by=chunk_by, workers=1).segments
+    # Rolling-buffer chunking cuts the same windows as splitting the joined text
+    texts = [(i + 1, t) for i, t in enumerate(["a" * 1700, "b " * 900, "c", "d" * 3100])]
+    expected = _split_into_chunks("\n\n".join(t for _, t in texts), _CHUNK_SIZE, _CHUNK_OVERLAP)
+    assert [s.text for s in doc_tools._segments_from_pages(texts, "char")] == expected
+
+    extracted = []
+    real = doc_tools._iter_page_texts
+
+    def counting(artifacts, path):
+        for item in real(artifacts, path):
+            extracted.append(item[0])
+            yield item
+
+    monkeypatch.setattr(doc_tools, "_iter_page_texts", counting)
+    first = next(iter(iter_pdf_segments(pdf, "page")))
+    assert first.page_no == 1 and extracted == [1]  # later pages never extracted
+
+
+def test_iter_pdf_images_missing_file_yields_nothing(tmp_path):
+    from src.tools.doc_tools import iter_pdf_images
+
+    assert list(iter_pdf_images(str(tmp_path / "missing.pdf"))) == []
+    pdf = _blank_pdf(tmp_path / "blank.pdf", pages=2)
+    assert list(iter_pdf_images(pdf)) == extract_images_from_pdf(pdf) == []
+
+
+def test_pdf_text_store_skips_extraction_on_reaudit(tmp_path, monkeypatch):
+    from src.tools import doc_tools
+    from src.tools.kv_cache import KVCache
+    from tests.fixtures.text_pdf import write_text_pdf
+
+    store = KVCache(tmp_path / "pdf_text.sqlite", version="1-test")
+    monkeypatch.setattr(doc_tools, "default_pdf_cache", lambda: None)
+    monkeypatch.setattr(doc_tools, "default_pdf_text_store", lambda: store)
+    pdf = write_text_pdf(tmp_path / "report.pdf", [f"page {i} covers the graph wiring and reducers" for i in range(5)])
+    first = ingest_pdf(pdf, chunk_by="page")
+
+    extractions = []
+    real = doc_tools._page_texts
+    monkeypatch.setattr(doc_tools, "_page_texts", lambda *a, **kw: extractions.append(a[1]) or real(*a, **kw))
+    again = ingest_pdf(pdf, chunk_by="page")
+    assert extractions == []
+    assert again.segments == first.segments
+    assert again.index.search("reducers wiring") == first.index.search("reducers wiring")
+    assert list(doc_tools.iter_pdf_segments(pdf, "page")) == first.segments
+    # Char mode for the same content reuses the stored page text, then stores its own segments
+    chars = ingest_pdf(pdf)
+    assert extractions == [pdf] and "page 4" in chars.segments[-1].text
+    assert store.stats()["hits"] >= 3
+
+    # A new extractor version drops stored entries
+    store.close()
+    bumped = KVCache(tmp_path / "pdf_text.sqlite", version="2-test")
+    assert bumped.stats()["entries"] == 0
+
+
+def test_tfidf_retriever_cosine_scores_and_pluggable_interface(tmp_path):
+    np = pytest.importorskip("numpy")
+    from src.tools.retrieval import BM25Index, TfidfRetriever, build_retriever, tfidf_features
+
+    chunks = [
+        "State reducers merge parallel detective outputs at the fan-in.",
+        "Judges produce structured opinions per criterion.",
+        "An appendix about fonts and margins.",
+        "The reducer reducer reducer section.",
+    ]
+    tfidf = TfidfRetriever(chunks)
+    # Sparse matrix-vector scores equal dense cosine similarity
+    vocab = sorted(tfidf.vocab, key=tfidf.vocab.get)
+
+    def dense(text):
+        counts = {f: c for f, c in tfidf_features(text).items() if f in tfidf.vocab}
+        v = np.zeros(len(vocab))
+        for f, c in counts.items():
+            v[tfidf.vocab[f]] = (1 + np.log(c)) * tfidf.idf[tfidf.vocab[f]]
+        n = np.linalg.norm(v)
+        return v / n if n else v
+
+    matrix = np.array([dense(c) for c in chunks])
+    question = "How do reducers handle the parallel fan-in?"
+    assert np.allclose(tfidf.scores(question), matrix @ dense(question))
+    # Inflected forms match through character n-grams; BM25 needs the exact term
+    assert BM25Index(chunks).search("opinion criteria judge") == []
+    assert tfidf.top_chunks("opinion criteria judge", top_k=1) == [chunks[1]]
+    assert tfidf.search("zzzz qqqq") == []
+    assert all(0 < score <= 1 + 1e-9 for _, score in tfidf.search(question))
+
+    assert build_retriever(chunks).name == "bm25"
+    with pytest.raises(ValueError):
+        build_retriever(chunks, "embeddings")
+    store = DocStore(chunks=chunks, source_path="", retriever="tfidf")
+    assert store.search_chunks("opinion criteria", top_k=1) == [chunks[1]] and store.index.name == "tfidf"
+    result = PDFIngestionResult(segments=[ChunkSegment(text=c) for c in chunks], source_path="")
+    assert result.search_index().name == "bm25"
+    result.retriever = "tfidf"
+    assert result.search_index().name == "tfidf"
+    pdf = _blank_pdf(tmp_path / "r.pdf", pages=2)
+    assert ingest_pdf(pdf, chunk_by="page", retriever="tfidf").index.name == "tfidf"
+
+
+def test_tfidf_search_batch_matches_individual_searches(monkeypatch):
+    pytest.importorskip("numpy")
+    from src.tools.retrieval import TfidfRetriever
+
+    # Repeated chunks give tied scores at the top-k boundary
+    chunks = [f"section {i} covers {'graph wiring' if i % 3 == 0 else 'judicial opinions'} topic{i}" for i in range(30)]
+    chunks += ["graph wiring"] * 4
+    questions = ["graph wiring", "judicial opinion", "topic7 graphs", "nothing matches zzz", "graph wiring", ""]
+    tfidf = TfidfRetriever(chunks)
+    expected = {top_k: [tfidf.search(q, top_k=top_k) for q in questions] for top_k in (1, 4, 50)}
+    # One query-matrix product, not a scores() call per question
+    monkeypatch.setattr(tfidf, "scores", lambda question: pytest.fail("search_batch scored a single question"))
+    for top_k, per_question in expected.items():
+        assert tfidf.search_batch(questions, top_k=top_k) == per_question
+    assert [chunk_id for chunk_id, _ in tfidf.search_batch(questions, top_k=3)[0]] == [30, 31, 32]
+    assert tfidf.search_batch([], top_k=3) == [] and tfidf.search_batch(questions, top_k=0) == [[]] * len(questions)
+
+
+def test_retriever_env_misconfiguration_falls_back_to_bm25(tmp_path, monkeypatch, caplog):
+    """An unknown AUDITOR_RETRIEVER, or tfidf without numpy, warns and uses bm25 instead of failing the audit."""
+    from src.tools import retrieval
+
+    monkeypatch.setenv("AUDITOR_RETRIEVER", "embeddings")
+    with caplog.at_level("WARNING", logger="src.tools.retrieval"):
+        assert retrieval.retriever_name() == "bm25"
+    assert "embeddings" in caplog.text
+    monkeypatch.setenv("AUDITOR_RETRIEVER", "tfidf")
+    monkeypatch.setattr(retrieval, "_numpy_available", lambda: False)
+    assert retrieval.build_retriever(["alpha beta gamma"]).name == "bm25"
+    assert ingest_pdf(_blank_pdf(tmp_path / "r.pdf", pages=1), chunk_by="page").index.name == "bm25"
+
+
+def test_structure_chunker_respects_headings_budget_and_pages():
+    from src.tools.chunking import _normalize_layout, estimate_tokens, structure_chunks
+
+    sentence = "The reducer merges evidence lists from parallel detectives into shared state. "
+    pages = [
+        (1, "1. Introduction\nThe auditor runs detectives in parallel and aggregates\nevidence for the judges, "
+            "who read it per rubric criterion and\nwrite structured opinions that the chief justice synthesizes.\n"
+            "2. Architecture\n" + sentence * 3),
+        (2, "Each segment records its pages.\n\n" + sentence * 40 + "\n\nGraph Wiring and State\nFan-out and fan-in edges are declared in\nsrc/graph.py."),
+    ]
+    chunks = list(structure_chunks(pages, max_tokens=120))
+    # A heading closes the running chunk once it holds a quarter of the budget
+    assert chunks[0][0].startswith("1. Introduction") and "2. Architecture" not in chunks[0][0]
+    assert chunks[1][0].startswith("2. Architecture")
+    assert all(estimate_tokens(text) <= 120 for text, _, _ in chunks)
+    assert not any(text.endswith("Graph Wiring and State") for text, _, _ in chunks)
+    assert chunks[-1][0].startswith("Graph Wiring and State") and chunks[-1][1:] == (2, 2)
+    assert any(first == 1 and last == 2 for _, first, last in chunks)  # paragraph packed across the page break
+    # No text lost or duplicated (no overlap)
+    assert " ".join(t for t, _, _ in chunks).split() == " ".join(t for _, t in pages).split()
+    # "One word per line" extraction is rebuilt into paragraphs
+    words = [f"word{i}" for i in range(30)]
+    fragmented = "\n \n".join(words) + "\n \n \n" + "\n \n".join(["Next", "paragraph."] * 10)
+    assert _normalize_layout(fragmented).split("\n\n")[0] == " ".join(words)
+
+
+def test_chunks_carry_page_provenance_and_excerpts_fit_token_budget(tmp_path, monkeypatch):
+    from src.tools import doc_tools
+    from src.tools.chunking import estimate_tokens
+    from tests.fixtures.text_pdf import write_text_pdf
+
+    monkeypatch.setattr(doc_tools, "default_pdf_cache", lambda: None)
+    monkeypatch.setattr(doc_tools, "default_pdf_text_store", lambda: None)
+    pages = [" ".join(f"pg{i}w{j}" for j in range(200)) for i in range(1, 6)]
+    pdf = write_text_pdf(tmp_path / "prov.pdf", pages)
+    for chunk_by in ("char", "structure"):
+        segments = ingest_pdf(pdf, chunk_by=chunk_by).segments
+        assert segments[0].page_no == 1 and segments[-1].page_end == 5
+        for seg in segments:
+            # Char windows may start or end mid-word; whole words pin the page range
+            on_pages = {int(p) for p in re.findall(r"\bpg(\d+)w\d+\b", seg.text)}
+            assert seg.page_no <= min(on_pages) and max(on_pages) <= seg.page_end
+            assert seg.page_end - seg.page_no <= max(on_pages) - min(on_pages) + 1
+    store = DocStore(chunks=["alpha " * 300, "alpha beta " * 50, "alpha gamma"], source_path="")
+    assert estimate_tokens(store.query("alpha", max_tokens=120)) <= 120
+    excerpt = store.query("alpha", top_k=3, max_tokens=10_000)
+    assert excerpt.count("---") == 2
+
+
+def test_pdf_image_refs_filter_by_declared_size_and_pass_through_encoding(tmp_path, monkeypatch):
+    import io
+
+    from PIL import Image
+    from pypdf import PageObject
+
+    from src.tools.doc_tools import _vision_payload, extract_image_refs, iter_pdf_image_refs
+    from src.tools.pdf_images import encode_image
+    from tests.fixtures.image_pdf import write_image_pdf
+
+    photo = Image.linear_gradient("L").convert("RGB").resize((320, 240))
+    photo.format = "JPEG"
+    chart = Image.new("RGB", (400, 300), "white")
+    chart.paste((200, 30, 30), (50, 50, 350, 250))
+    icon = Image.new("RGB", (32, 32), "blue")
+    pdf = write_image_pdf(tmp_path / "images.pdf", [[icon], [photo, chart]])
+
+    # Refs come from declared sizes only: no image is decoded while listing
+    monkeypatch.setattr(PageObject, "images", property(lambda self: pytest.fail("decoded")))
+    refs = extract_image_refs(pdf)
+    assert [(r.page_no, r.width, r.height, r.format) for r in refs] == [(2, 320, 240, "jpeg"), (2, 400, 300, "png")]
+    assert len(extract_image_refs(pdf, min_pixels=0)) == 3  # the 32x32 icon is filtered by default
+    assert list(iter_pdf_image_refs(str(tmp_path / "missing.pdf"))) == []
+
+    jpeg, png = refs
+    data, mime = jpeg.encoded()
+    assert mime == "image/jpeg" and data == jpeg._stream.get_data()  # original JPEG bytes, not re-encoded
+    data, mime = png.encoded()
+    assert mime == "image/png" and Image.open(io.BytesIO(data)).tobytes() == chart.tobytes()
+
+    # Over the pixel budget: downscaled with the aspect ratio kept
+    data, mime = png.encoded(max_pixels=100 * 75)
+    small = Image.open(io.BytesIO(data))
+    assert mime == "image/png" and small.size == (100, 75)
+    assert encode_image(chart, 10_000, jpeg=True)[1] == "image/jpeg"
+    monkeypatch.setenv("AUDITOR_VISION_MAX_PIXELS", str(160 * 120))
+    data, mime = _vision_payload(jpeg)
+    assert mime == "image/jpeg" and Image.open(io.BytesIO(data)).size == (160, 120)
+    assert _vision_payload(b"not an image") is None
+
+
+def test_rank_diagram_candidates_prefers_diagrams_and_caps_top_k(tmp_path, monkeypatch):
+    import sys
+
+    from PIL import ImageOps
+
+    from src.tools.diagram_ranking import aspect_score, rank_diagram_candidates
+    from src.tools.doc_tools import extract_image_refs
+    from tests.fixtures.image_pdf import synthetic_report_images, write_image_pdf
+
+    pytest.importorskip("numpy")
+    diagram, photo, cover, banner = synthetic_report_images()
+    ranked = rank_diagram_candidates([photo, cover, banner, diagram])
+    assert ranked[0].image is diagram and ranked[0].score > 0.8
+    assert all(c.score < 0.5 for c in ranked[1:])
+    assert set(ranked[0].signals) == {"palette", "whitespace", "edges", "aspect"}
+    # Dark-theme diagrams count their dark canvas as whitespace
+    dark = rank_diagram_candidates([photo, ImageOps.invert(diagram)], top_k=1)
+    assert dark[0].score > 0.8 and len(dark) == 1
+    assert aspect_score(1200, 150) == 0.0 and aspect_score(800, 500) == 1.0
+
+    # PDFImageRefs are ranked from a downsampled copy; the diagram is not the first image in the PDF
+    photo.format = "JPEG"
+    pdf = write_image_pdf(tmp_path / "report.pdf", [[photo], [cover, diagram]])
+    refs = extract_image_refs(pdf)
+    top = rank_diagram_candidates(refs, top_k=2)
+    assert (top[0].image.page_no, top[0].image.width) == (2, 800) and len(top) == 2
+
+    # Without numpy: declared shape only, still capped
+    monkeypatch.setitem(sys.modules, "numpy", None)
+    fallback = rank_diagram_candidates([banner, diagram], top_k=1)
+    assert fallback[0].image is diagram and len(fallback) == 1
+
+
+def test_analyze_diagram_answers_come_from_llm_cache(tmp_path, monkeypatch):
+    import langchain_openai
+
+    from tests.fixtures.image_pdf import synthetic_report_images
+
+    invocations = []
+
+    class _FakeVision:
+        def __init__(self, **kwargs):
+            self.kwargs = kwargs
+
+        def invoke(self, messages):
+            invocations.append(messages)
+            if len(invocations) == 1:
+                raise ValueError("invalid request")  # not retried by the LLM scheduler
+
+            class _Response:
+                content = "Fan-out to three detectives, fan-in at the aggregator."
+
+            return _Response()
+
+    monkeypatch.setattr(langchain_openai, "ChatOpenAI", _FakeVision)
+    monkeypatch.setenv("AUDITOR_LLM_CACHE", "1")
+    monkeypatch.setenv("AUDITOR_LLM_CACHE_DIR", str(tmp_path))
+    diagram = synthetic_report_images()[0]
+
+    assert "failed" in analyze_diagram(diagram, "Describe the flow.")  # stubs are not cached
+    answer = analyze_diagram(diagram, "Describe the flow.")
+    assert answer.startswith("Fan-out") and len(invocations) == 2
+    assert analyze_diagram(diagram, "Describe the flow.") == answer and len(invocations) == 2
+    analyze_diagram(diagram, "Another question?")
+    assert len(invocations) == 3
@@ -92,6 +92,18 @@ def test_analyze_graph_structure_with_fixture():
         shutil.rmtree(fixture_dir / "minimal_repo", ignore_errors=True)
 
 
+def test_graph_fan_out_and_fan_in_in_first_seen_order(tmp_path):
+    edges = [("start", f"detective{i}") for i in range(200)] + [(f"detective{i}", "aggregator") for i in range(200)]
+    edges += [("aggregator", "judge"), ("aggregator", "end"), ("judge", "end")]
+    (tmp_path / "graph.py").write_text(
+        "g = StateGraph(dict)\n" + "".join(f"g.add_edge({src!r}, {tgt!r})\n" for src, tgt in edges)
+    )
+    result = analyze_graph_structure(str(tmp_path))
+    assert result["has_parallelism"] is True
+    assert result["parallel_sources"] == ["start", "aggregator"]
+    assert result["fan_in_targets"] == ["aggregator", "end"]
+
+
 def test_analyze_graph_structure_no_graph_safe():
     """Repo with no graph file returns safe structure (file_found False)."""
     import tempfile
@@ -127,3 +139,674 @@ def test_analyze_state_schema_no_state_file():
         result = analyze_state_schema(tmp)
     assert result["file_found"] is False
     assert result.get("has_evidence") is False
+
+
+def _git(cwd, *args):
+    import subprocess
+    subprocess.run(
+        ["git", "-c", "user.name=t", "-c", "user.email=t@example.com", *args],
+        cwd=cwd, check=True, capture_output=True,
+    )
+
+
+def _make_origin(root: Path, name: str = "origin") -> Path:
+    """Local origin repo with one commit, for offline clone/cache tests (file:// URL)."""
+    origin = root / name
+    origin.mkdir(parents=True)
+    _git(origin, "init", "-q", "-b", "main")
+    (origin / "README.md").write_text("hello\n")
+    _git(origin, "add", "-A")
+    _git(origin, "commit", "-q", "-m", "initial commit")
+    return origin
+
+
+def test_normalize_repo_url_equivalences():
+    from src.tools.repo_cache import normalize_repo_url
+
+    expected = "https://github.com/org/repo"
+    assert normalize_repo_url("https://github.com/org/repo") == expected
+    assert normalize_repo_url("https://GitHub.com/org/repo.git") == expected
+    assert normalize_repo_url("https://github.com/org/repo/") == expected
+    assert normalize_repo_url("git@github.com:org/repo.git") == expected
+
+
+def test_repo_cache_miss_then_hit_fetches_new_head(tmp_path):
+    """First checkout clones (miss); later checkout fetches delta and sees the new commit (hit)."""
+    from src.tools.repo_cache import RepoCache
+
+    origin = _make_origin(tmp_path)
+    url = origin.as_uri()
+    cache = RepoCache(root=tmp_path / "cache", max_bytes=1024 * 1024 * 1024)
+
+    first = clone_repo(url, cache=cache)
+    assert (Path(first) / "README.md").is_file()
+    assert cache.stats()["misses"] == 1 and cache.stats()["hits"] == 0
+
+    (origin / "new.py").write_text("x = 1\n")
+    _git(origin, "add", "-A")
+    _git(origin, "commit", "-q", "-m", "add new.py")
+
+    second = clone_repo(url, cache=cache)
+    assert second != first
+    assert (Path(second) / "new.py").is_file()
+    assert "new.py" in list_repo_files(second)
+    stats = cache.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1
+    assert stats["entries"] == 1
+
+
+def test_repo_cache_hands_out_private_copies(tmp_path):
+    """Each checkout is an isolated copy: edits in one never reach the entry or a concurrent checkout."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    from src.tools.repo_cache import RepoCache
+
+    origin = _make_origin(tmp_path)
+    cache = RepoCache(root=tmp_path / "cache")
+    first = clone_repo(origin.as_uri(), cache=cache)
+    (Path(first) / "scratch.txt").write_text("only in first")
+    (Path(first) / "README.md").write_text("edited\n")
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        paths = list(pool.map(lambda _: clone_repo(origin.as_uri(), cache=cache), range(4)))
+    assert len({first, *paths}) == 5
+    for path in paths:
+        assert (Path(path) / "README.md").read_text() == "hello\n"
+        assert not (Path(path) / "scratch.txt").exists()
+        assert "README.md" in list_repo_files(path)
+    assert (Path(first) / "scratch.txt").is_file()
+    assert cache.stats()["hits"] == 4
+
+
+def test_repo_cache_lru_eviction(tmp_path):
+    """With a budget smaller than two entries, the least recently used entry is evicted."""
+    from src.tools.repo_cache import RepoCache
+
+    a = _make_origin(tmp_path, "a")
+    b = _make_origin(tmp_path, "b")
+    cache = RepoCache(root=tmp_path / "cache", max_bytes=1)
+
+    path_a = clone_repo(a.as_uri(), cache=cache)
+    path_b = clone_repo(b.as_uri(), cache=cache)
+    assert not (cache.root / cache.key_for(a.as_uri())).exists()
+    assert Path(path_a).is_dir() and Path(path_b).is_dir()  # handed-out copies outlive eviction
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["entries"] == 1
+
+
+def test_repo_cache_never_evicts_locked_entry(tmp_path):
+    """An entry locked by another audit (or process) is skipped by eviction until it is released."""
+    from src.tools.repo_cache import RepoCache, _file_lock
+
+    a = _make_origin(tmp_path, "a")
+    b = _make_origin(tmp_path, "b")
+    cache = RepoCache(root=tmp_path / "cache", max_bytes=1)
+    clone_repo(a.as_uri(), cache=cache)
+    key_a = cache.key_for(a.as_uri())
+    with _file_lock(cache._lock_path(key_a)):
+        clone_repo(b.as_uri(), cache=cache)
+        assert (cache.root / key_a / ".git").is_dir()
+        assert cache.stats()["evictions"] == 0
+    clone_repo(b.as_uri(), cache=cache)
+    assert not (cache.root / key_a).exists()
+    assert cache.stats()["evictions"] == 1
+
+
+def test_mirror_pool_concurrent_worktrees_share_one_mirror(tmp_path):
+    """Two acquisitions of one repo share a single bare mirror; each gets an isolated worktree."""
+    from src.tools.repo_cache import MirrorPool
+
+    origin = _make_origin(tmp_path)
+    pool = MirrorPool(root=tmp_path / "mirrors")
+
+    first = pool.acquire(origin.as_uri())
+    second = pool.acquire(origin.as_uri())
+    try:
+        assert first != second
+        assert (Path(first) / "README.md").is_file()
+        (Path(first) / "scratch.txt").write_text("only in first")
+        assert not (Path(second) / "scratch.txt").exists()
+        assert list(pool.root.glob("*.git")) == [pool.mirror_path(origin.as_uri())]
+        assert pool.stats() == {"hits": 1, "misses": 1, "active_worktrees": 2}
+        assert "README.md" in list_repo_files(second)
+    finally:
+        pool.release(first)
+        pool.release(second)
+    assert not Path(first).exists() and not Path(second).exists()
+    assert pool.stats()["active_worktrees"] == 0
+
+
+def test_mirror_pool_workspace_context_releases(tmp_path):
+    from src.tools.repo_cache import MirrorPool
+
+    origin = _make_origin(tmp_path)
+    pool = MirrorPool(root=tmp_path / "mirrors")
+    with pool.workspace(origin.as_uri()) as path:
+        assert (Path(path) / "README.md").is_file()
+    assert not Path(path).exists()
+    with pytest.raises(RepoCloneError):
+        pool.acquire((tmp_path / "missing").as_uri())
+
+
+def _make_large_origin(root: Path) -> Path:
+    """Origin with analyzer files plus a bulky data directory; partial-clone filters allowed."""
+    origin = _make_origin(root)
+    (origin / "src").mkdir()
+    (origin / "src" / "graph.py").write_text(
+        "from langgraph.graph import StateGraph\n"
+        "builder = StateGraph({})\n"
+        "builder.add_node('a', lambda s: s)\n"
+        "builder.add_node('b', lambda s: s)\n"
+        "builder.add_edge('a', 'b')\n"
+    )
+    (origin / "data").mkdir()
+    for i in range(3):
+        (origin / "data" / f"blob{i}.bin").write_bytes(os.urandom(64 * 1024))
+    _git(origin, "add", "-A")
+    _git(origin, "commit", "-q", "-m", "add graph and data")
+    _git(origin, "config", "uploadpack.allowFilter", "true")
+    return origin
+
+
+def test_sparse_paths_for_dimensions():
+    from src.tools.repo_tools import ANALYZER_CHECKOUT_PATHS, sparse_paths_for_dimensions
+
+    dims = [
+        {"id": "graph_orchestration", "target_artifact": "github_repo"},
+        {"id": "swarm_visual", "target_artifact": "pdf_images", "checkout_paths": ["/docs/diagrams/"]},
+    ]
+    paths = sparse_paths_for_dimensions(dims, extra=["reports/final_report.pdf"])
+    assert all(p in paths for p in ANALYZER_CHECKOUT_PATHS)
+    assert "docs/diagrams" in paths
+    assert "reports/final_report.pdf" in paths
+    assert "src/graph.py" not in sparse_paths_for_dimensions([{"target_artifact": "pdf_report"}])
+
+
+def test_sparse_clone_materializes_only_requested_paths(tmp_path):
+    """Sparse clone checks out only analyzer paths; file list is complete; other blobs load on demand."""
+    from src.tools.repo_tools import read_repo_file
+
+    origin = _make_large_origin(tmp_path)
+    repo_path = clone_repo(origin.as_uri(), sparse_paths=["src/graph.py", "src/state.py"])
+    try:
+        assert (Path(repo_path) / "src" / "graph.py").is_file()
+        assert not (Path(repo_path) / "data").exists()
+        files = list_repo_files(repo_path)
+        assert "data/blob0.bin" in files and "README.md" in files
+        assert read_repo_file(repo_path, "README.md") == "hello\n"
+        assert read_repo_file(repo_path, "missing.txt") is None
+        result = analyze_graph_structure(repo_path)
+        assert result["file_found"] is True
+        assert ("a", "b") in result["edges"]
+    finally:
+        shutil.rmtree(repo_path, ignore_errors=True)
+
+
+def test_repo_cache_sparse_entry_separate_from_full(tmp_path):
+    from src.tools.repo_cache import RepoCache
+
+    origin = _make_large_origin(tmp_path)
+    cache = RepoCache(root=tmp_path / "cache")
+    full = clone_repo(origin.as_uri(), cache=cache)
+    sparse = clone_repo(origin.as_uri(), cache=cache, sparse_paths=["src/graph.py"])
+    assert full != sparse
+    assert (Path(full) / "data").is_dir()
+    assert not (Path(sparse) / "data").exists()
+    again = clone_repo(origin.as_uri(), cache=cache, sparse_paths=["src/graph.py", "README.md"])
+    assert again != sparse and (Path(again) / "README.md").is_file()
+    assert cache.stats()["hits"] == 1
+
+
+def test_treeless_clone_sees_full_history(tmp_path):
+    """Shallow clone sees one commit; treeless and full clones see every commit."""
+    origin = _make_large_origin(tmp_path)
+    for i in range(3):
+        (origin / "README.md").write_text(f"hello {i}\n")
+        _git(origin, "commit", "-q", "-am", f"edit {i}")
+    expected = len(extract_git_history(str(origin)))
+    assert expected == 5
+
+    paths = {mode: clone_repo(origin.as_uri(), history=mode) for mode in ("shallow", "treeless", "full")}
+    try:
+        assert len(extract_git_history(paths["shallow"])) == 1
+        assert len(extract_git_history(paths["treeless"])) == expected
+        assert len(extract_git_history(paths["full"])) == expected
+        assert (Path(paths["treeless"]) / "src" / "graph.py").is_file()
+    finally:
+        for p in paths.values():
+            shutil.rmtree(p, ignore_errors=True)
+    with pytest.raises(RepoCloneError):
+        clone_repo(origin.as_uri(), history="everything")
+
+
+def test_repo_cache_treeless_entry_fetches_new_commits(tmp_path):
+    from src.tools.repo_cache import RepoCache
+
+    origin = _make_large_origin(tmp_path)
+    cache = RepoCache(root=tmp_path / "cache")
+    path = clone_repo(origin.as_uri(), cache=cache, history="treeless")
+    assert len(extract_git_history(path)) == 2
+    (origin / "README.md").write_text("changed\n")
+    _git(origin, "commit", "-q", "-am", "third")
+    path = clone_repo(origin.as_uri(), cache=cache, history="treeless")
+    history = extract_git_history(path)
+    assert len(history) == 3 and history[-1]["message"] == "third"
+
+
+def _fast_import_commits(repo: Path, count: int) -> None:
+    """Append `count` single-file commits to a fresh repo quickly via git fast-import."""
+    import subprocess
+    stream = []
+    for i in range(1, count + 1):
+        msg = f"commit {i}".encode()
+        body = f"line {i}\n".encode()
+        stream += [
+            b"commit refs/heads/main\n", f"mark :{i}\n".encode(),
+            f"committer T <t@example.com> {1_700_000_000 + i} +0000\n".encode(),
+            f"data {len(msg)}\n".encode(), msg, b"\n",
+        ]
+        if i > 1:
+            stream.append(f"from :{i - 1}\n".encode())
+        stream += [b"M 100644 inline f.txt\n", f"data {len(body)}\n".encode(), body, b"\n"]
+    subprocess.run(["git", "fast-import", "--quiet"], cwd=repo, input=b"".join(stream), check=True)
+
+
+def test_iter_git_history_numstat_and_renames(tmp_path):
+    """numstat yields per-commit added/deleted counts; -z rename records do not break parsing."""
+    from src.tools.repo_tools import iter_git_history
+
+    origin = _make_origin(tmp_path)
+    (origin / "a.txt").write_text("1\n2\n3\n")
+    _git(origin, "add", "-A")
+    _git(origin, "commit", "-q", "-m", "add a: three lines")
+    _git(origin, "mv", "a.txt", "b.txt")
+    _git(origin, "commit", "-q", "-m", "rename a to b")
+    (origin / "b.txt").write_text("1\n")
+    _git(origin, "commit", "-q", "-am", "trim b")
+
+    history = list(iter_git_history(str(origin), numstat=True))
+    assert [h["message"] for h in history] == ["initial commit", "add a: three lines", "rename a to b", "trim b"]
+    assert (history[1]["added"], history[1]["deleted"], history[1]["files"]) == (3, 0, 1)
+    assert (history[2]["added"], history[2]["deleted"], history[2]["files"]) == (0, 0, 1)
+    assert (history[3]["added"], history[3]["deleted"]) == (0, 2)
+    assert history[0]["timestamp"][:4].isdigit()
+    assert "added" not in extract_git_history(str(origin))[0]
+    assert list(iter_git_history(str(tmp_path / "missing"))) == []
+
+
+def test_iter_git_history_streams_with_flat_memory(tmp_path):
+    """Consumers can stop early; peak Python memory does not grow with commit count."""
+    import subprocess
+    import tracemalloc
+
+    from src.tools.repo_tools import iter_git_history
+
+    peaks = []
+    for count in (2000, 8000):
+        repo = tmp_path / f"r{count}"
+        subprocess.run(["git", "init", "-q", "-b", "main", str(repo)], check=True)
+        _fast_import_commits(repo, count)
+        tracemalloc.start()
+        seen = sum(1 for _ in iter_git_history(str(repo)))
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+        assert seen == count
+    assert peaks[1] < peaks[0] * 1.5
+
+    gen = iter_git_history(str(tmp_path / "r8000"))
+    assert next(gen)["message"] == "commit 1"
+    gen.close()
+
+
+def test_git_session_answers_queries_over_one_batch_process(tmp_path):
+    """GitSession: ls-files/log match the standalone tools; blob reads share one cat-file process."""
+    import subprocess
+
+    from src.tools.git_session import GitSession
+
+    origin = _make_large_origin(tmp_path)
+    head = subprocess.run(["git", "rev-parse", "HEAD"], cwd=origin, capture_output=True, text=True).stdout.strip()
+    with GitSession(str(origin)) as session:
+        assert session.ls_files() == list_repo_files(str(origin))
+        assert session.log() == extract_git_history(str(origin))
+        assert session.rev_parse("HEAD") == head
+        assert session.rev_parse("no-such-ref") is None
+        assert session.read_text("README.md") == "hello\n"
+        for _ in range(5):
+            assert "StateGraph" in session.read_text("src/graph.py")
+        assert session.read_blob("missing.txt") is None
+        assert session.read_blob("src") is None  # a tree, not a file
+        assert session.read_text("README.md", rev="HEAD~1") == "hello\n"
+        stats = session.stats()
+        assert stats["blob_hits"] == 4
+        # ls-files, log, and a single cat-file --batch for every object query
+        assert stats["processes_spawned"] == 3
+        assert extract_git_history(str(origin), session=session) == session.log()
+        assert analyze_graph_structure(str(origin), session=session)["file_found"] is True
+    assert GitSession(str(tmp_path / "missing")).ls_files() == []
+
+
+def test_git_session_reads_blobs_outside_sparse_checkout(tmp_path):
+    from src.tools.git_session import GitSession
+    from src.tools.repo_tools import read_repo_file
+
+    origin = _make_large_origin(tmp_path)
+    repo_path = clone_repo(origin.as_uri(), sparse_paths=["README.md"])
+    try:
+        assert not (Path(repo_path) / "src").exists()
+        with GitSession(repo_path) as session:
+            assert "add_edge" in read_repo_file(repo_path, "src/graph.py", session)
+            assert ("a", "b") in analyze_graph_structure(repo_path, session=session)["edges"]
+            assert "data/blob1.bin" in list_repo_files(repo_path, session=session)
+    finally:
+        shutil.rmtree(repo_path, ignore_errors=True)
+
+
+def test_build_ast_index_parses_once_and_records_failures(tmp_path):
+    from src.tools.ast_index import build_ast_index
+
+    (tmp_path / "src").mkdir()
+    (tmp_path / ".venv" / "lib").mkdir(parents=True)
+    (tmp_path / "src" / "graph.py").write_text(
+        "from langgraph.graph import StateGraph\ng = StateGraph(dict)\ng.add_node('a', f)\ng.add_edge('a', 'b')\n"
+    )
+    (tmp_path / "src" / "state.py").write_text("class Evidence:\n    pass\n")
+    (tmp_path / "broken.py").write_text("def f(:\n")
+    (tmp_path / "big.py").write_text("x = 1\n" * 200)
+    (tmp_path / ".venv" / "lib" / "vendored.py").write_text("y = 2\n")
+    _git(tmp_path, "init", "-q")
+    _git(tmp_path, "add", "-A")
+    index = build_ast_index(str(tmp_path), max_file_bytes=1000)
+    assert index.paths() == ["src/graph.py", "src/state.py"]
+    assert index.errors["broken.py"].startswith("syntax error")
+    assert "big.py" in index.skipped
+    assert ".venv/lib/vendored.py" not in index and ".venv/lib/vendored.py" not in index.skipped
+
+    # Analyzers answer from the index: removing the files from disk changes nothing
+    (tmp_path / "src" / "graph.py").unlink()
+    (tmp_path / "src" / "state.py").unlink()
+    graph = analyze_graph_structure(str(tmp_path), index=index)
+    assert graph["file_found"] is True and ("a", "b") in graph["edges"]
+    assert analyze_state_schema(str(tmp_path), index=index)["has_evidence"] is True
+    (tmp_path / "graph.py").write_text("def f(:\n")
+    _git(tmp_path, "add", "graph.py")
+    broken = build_ast_index(str(tmp_path))
+    assert analyze_graph_structure(str(tmp_path), index=broken)["error"].startswith("syntax error")
+
+
+def test_kv_cache_lru_eviction_ttl_and_version_stamp(tmp_path, monkeypatch):
+    from src.tools import kv_cache
+    from src.tools.kv_cache import KVCache
+
+    db = tmp_path / "kv.sqlite"
+    cache = KVCache(db, max_bytes=250, version=1)
+    clock = [1000.0]
+    monkeypatch.setattr(kv_cache.time, "time", lambda: clock[0])
+    for key in ("a", "b"):
+        cache.set(key, b"x" * 100)
+        clock[0] += 1
+    assert cache.get("a") == b"x" * 100  # a is now most recently used
+    clock[0] += 1
+    cache.set("c", b"y" * 100)  # over budget: evicts b, the LRU entry
+    assert cache.get("b") is None and cache.get("c") == b"y" * 100
+    cache.set_json("short", {"k": [1, 2]}, ttl=5)
+    assert cache.get_json("short") == {"k": [1, 2]}
+    clock[0] += 10
+    assert cache.get_json("short") is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"]) == (3, 2, 1)
+    cache.close()
+
+    assert KVCache(db, max_bytes=250, version=1).get("a") == b"x" * 100
+    assert KVCache(db, max_bytes=250, version=2).stats()["entries"] == 0  # new version drops old results
+
+
+def test_analysis_cache_hits_for_unchanged_blob(tmp_path, monkeypatch):
+    """analyze_repo keys on git blob shas: an unchanged repo is answered without reading or parsing files."""
+    import subprocess
+
+    from src.tools import ast_index, repo_tools
+    from src.tools.git_session import GitSession
+    from src.tools.kv_cache import KVCache
+
+    (tmp_path / "src").mkdir()
+    graph = tmp_path / "src" / "graph.py"
+    graph.write_text("g = StateGraph(dict)\ng.add_node('a', f)\ng.add_edge('a', 'b')\n")
+    (tmp_path / "src" / "state.py").write_text("class AgentState(TypedDict):\n    x: int\n")
+    (tmp_path / "tool.py").write_bytes(b"import os\r\nos.system('ls')  # caf\xe9\r\n")  # CRLF, not UTF-8
+    _git(tmp_path, "init", "-q")
+    _git(tmp_path, "add", "-A")
+    _git(tmp_path, "commit", "-q", "-m", "init")
+    cache = KVCache(tmp_path / "analysis.sqlite", version=repo_tools.ANALYSIS_CACHE_VERSION)
+    first = repo_tools.analyze_repo(str(tmp_path), cache=cache)
+    assert ("a", "b") in first["graph_structure"]["edges"]
+    assert first["state_schema"]["has_agent_state"] is True
+    assert [f["path"] for f in first["security"]["findings"]] == ["tool.py"]
+
+    def fail(*args, **kwargs):
+        raise AssertionError("unchanged repo must not be read or parsed")
+
+    monkeypatch.setattr(ast_index, "build_ast_index", fail)
+    monkeypatch.setattr(repo_tools, "read_repo_file", fail)
+    with GitSession(str(tmp_path)) as session:
+        assert repo_tools.analyze_repo(str(tmp_path), session=session, cache=cache) == first
+    assert cache.stats()["hits"] == 1
+    monkeypatch.undo()
+
+    # Keys are git's own blob shas, also for CRLF / non-UTF-8 files
+    hashed = subprocess.run(["git", "hash-object", "tool.py"], cwd=tmp_path, capture_output=True, text=True)
+    assert repo_tools.tracked_blob_shas(str(tmp_path))["tool.py"] == hashed.stdout.strip()
+    assert repo_tools.git_blob_sha((tmp_path / "tool.py").read_bytes()) == hashed.stdout.strip()
+
+    graph.write_text(graph.read_text() + "g.add_edge('b', 'c')\n")  # unstaged edit -> new key, recomputed
+    assert ("b", "c") in repo_tools.analyze_repo(str(tmp_path), cache=cache)["graph_structure"]["edges"]
+    assert repo_tools.git_blob_sha(b"hello\n") == "ce013625030ba8dba906f756967f9e9ca394464a"
+
+
+def test_ast_engine_dispatches_each_node_once_to_every_analyzer():
+    import ast
+
+    from src.tools.ast_engine import (
+        GraphWiringAnalyzer,
+        NodeAnalyzer,
+        SecurityCallAnalyzer,
+        StateSchemaAnalyzer,
+        run_analyzers,
+    )
+
+    source = (
+        "import os, subprocess\n"
+        "class Evidence(BaseModel):\n    x: int\n"
+        "class AgentState(TypedDict):\n    evidences: Annotated[dict, operator.ior]\n"
+        "def outer():\n    def middle():\n        def inner():\n            return operator.add(a, b)\n"
+        "        g.add_edge('b', 'c')\n    return middle\n"
+        "g = StateGraph(AgentState)\ng.add_node('a', outer)\ng.add_edge('a', 'b')\n"
+        "os.system('ls ' + url)\nsubprocess.run(cmd, shell=True)\nsubprocess.run(['git', 'log'], shell=False)\n"
+    )
+    tree = ast.parse(source)
+
+    class Counter(NodeAnalyzer):
+        name = "counter"
+
+        def __init__(self):
+            self.calls = 0
+            self.max_depth = 0
+
+        def visit_Call(self, node, ctx):
+            self.calls += 1
+            self.max_depth = max(self.max_depth, ctx.function_depth)
+
+        def result(self):
+            return (self.calls, self.max_depth)
+
+    results = run_analyzers(
+        tree, [GraphWiringAnalyzer(), StateSchemaAnalyzer(), SecurityCallAnalyzer(), Counter()], path="m.py"
+    )
+    assert results["counter"] == (sum(isinstance(n, ast.Call) for n in ast.walk(tree)), 3)
+    graph = results["graph"]
+    assert graph["has_state_graph"] and graph["reducers_seen"]
+    assert graph["nodes"] == ["a"] and graph["edges"] == [("b", "c"), ("a", "b")]
+    assert results["state"]["pydantic_models"] == ["Evidence"]
+    assert results["state"]["reducer_keys"] == ["evidences"]
+    findings = results["security"]["findings"]
+    assert [(f["call"], f["line"]) for f in findings] == [("os.system", 15), ("subprocess.run", 16)]
+    assert results["security"]["subprocess_calls"] == 2
+
+
+def test_scan_security_calls_over_index(tmp_path):
+    from src.tools.ast_index import build_ast_index
+    from src.tools.repo_tools import scan_security_calls
+
+    (tmp_path / "safe.py").write_text("import subprocess\nsubprocess.run(['git', 'status'])\n")
+    (tmp_path / "unsafe.py").write_text("import os\n\ndef clone(url):\n    os.system(f'git clone {url}')\n")
+    _git(tmp_path, "init", "-q")
+    _git(tmp_path, "add", "-A")
+    result = scan_security_calls(build_ast_index(str(tmp_path)))
+    assert result["modules_scanned"] == 2 and result["subprocess_calls"] == 1
+    assert result["findings"] == [{"call": "os.system", "issue": "shell command", "path": "unsafe.py", "line": 4}]
+
+
+def test_analyze_repo_traverses_each_module_once(tmp_path, monkeypatch):
+    """analyze_repo runs one engine pass per module carrying every analyzer it needs; same results as separately."""
+    from src.tools import repo_tools
+    from src.tools.ast_index import build_ast_index
+
+    files = {
+        "src/graph.py": (
+            "import os\nfrom langgraph.graph import StateGraph\nfrom src.wiring import wire\n"
+            "def build():\n    g = StateGraph(dict)\n    g.add_node('a', run)\n    wire(g)\n    return g.compile()\n"
+        ),
+        "src/wiring.py": "def wire(g):\n    g.add_edge('a', 'b')\n    g.add_edge('a', 'c')\n",
+        "src/state.py": (
+            "class Evidence(BaseModel):\n    x: int\nclass AgentState(TypedDict):\n    e: Annotated[dict, ior]\n"
+        ),
+        "src/tools.py": "import subprocess\nsubprocess.run(cmd, shell=True)\n",
+    }
+    for rel, text in files.items():
+        (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / rel).write_text(text)
+    _git(tmp_path, "init", "-q")
+    _git(tmp_path, "add", "-A")
+    index = build_ast_index(str(tmp_path))
+    separate = {
+        "graph_structure": analyze_graph_structure(str(tmp_path), index=index),
+        "state_schema": analyze_state_schema(str(tmp_path), index=index),
+        "security": repo_tools.scan_security_calls(index),
+    }
+
+    passes: list[tuple[str, list[str]]] = []
+    run_analyzers = repo_tools.run_analyzers
+
+    def counting(tree, analyzers, path=""):
+        passes.append((path, sorted(a.name for a in analyzers)))
+        return run_analyzers(tree, analyzers, path=path)
+
+    monkeypatch.setattr(repo_tools, "run_analyzers", counting)
+    result = repo_tools.analyze_repo(str(tmp_path))
+    assert sorted(passes) == [
+        ("src/graph.py", ["graph", "security"]),
+        ("src/state.py", ["security", "state"]),
+        ("src/tools.py", ["security"]),
+        ("src/wiring.py", ["graph", "security"]),
+    ]
+    assert result == separate
+    assert result["graph_structure"]["edges"] == [("a", "b"), ("a", "c")]
+    assert result["state_schema"]["reducer_keys"] == ["e"]
+    assert [f["path"] for f in result["security"]["findings"]] == ["src/tools.py"]
+
+
+def test_graph_locator_follows_helpers_across_modules(tmp_path):
+    from src.tools.ast_index import build_ast_index
+    from src.tools.import_graph import build_import_graph, locate_graph_files
+
+    files = {
+        "app/__init__.py": "",
+        "app/workflow.py": (
+            "from langgraph.graph import StateGraph\n"
+            "from app.wiring import wire_judges\n"
+            "from . import nodes\n"
+            "def build():\n"
+            "    g = StateGraph(dict)\n"
+            "    g.add_node('start', nodes.start)\n"
+            "    g.add_edge('start', 'prosecutor')\n"
+            "    wire_judges(g)\n"
+            "    return g\n"
+        ),
+        "app/wiring.py": (
+            "def wire_judges(g):\n"
+            "    for judge in ('prosecutor', 'defense'):\n"
+            "        g.add_node(judge, run)\n"
+            "    g.add_edge('prosecutor', 'chief')\n"
+            "    g.add_edge('defense', 'chief')\n"
+        ),
+        "app/nodes.py": "def start(state):\n    return state\n",
+        "tests/test_graph.py": "from langgraph.graph import StateGraph\nStateGraph(dict)\n",
+        "unrelated.py": "import os\n",
+    }
+    for rel, text in files.items():
+        (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / rel).write_text(text)
+    _git(tmp_path, "init", "-q")
+    _git(tmp_path, "add", "-A")
+    index = build_ast_index(str(tmp_path))
+    imports = build_import_graph(index)
+    assert imports.imports["app/workflow.py"] == {"app/wiring.py", "app/nodes.py", "app/__init__.py"}
+    assert imports.imported_by("app/wiring.py") == {"app/workflow.py"}
+    assert locate_graph_files(index, imports) == ["app/workflow.py", "app/wiring.py"]
+
+    result = analyze_graph_structure(str(tmp_path), index=index)
+    assert result["file_found"] is True
+    assert result["graph_files"] == ["app/workflow.py", "app/wiring.py"]
+    assert ("start", "prosecutor") in result["edges"] and ("defense", "chief") in result["edges"]
+    assert result["fan_in_targets"] == ["chief"]
+    # Without an index only the conventional locations are checked
+    assert analyze_graph_structure(str(tmp_path))["file_found"] is False
+
+
+def test_graph_locator_ignores_unrelated_graphs_and_unused_helpers(tmp_path):
+    """Only the primary (compiled) graph and the helpers it calls are analyzed; demo graphs stay out."""
+    from src.tools.ast_index import build_ast_index
+    from src.tools.import_graph import locate_graph_files
+
+    files = {
+        "app/__init__.py": "",
+        "app/workflow.py": (
+            "from langgraph.graph import StateGraph\n"
+            "from app import legacy, wiring\n"
+            "def build():\n"
+            "    g = StateGraph(dict)\n"
+            "    g.add_node('start', legacy.start)\n"
+            "    wiring.wire_judges(g)\n"
+            "    return g.compile()\n"
+        ),
+        "app/wiring.py": (
+            "def wire_judges(g):\n"
+            "    _wire(g)\n"
+            "def _wire(g):\n"
+            "    g.add_node('prosecutor', run)\n"
+            "    g.add_edge('start', 'prosecutor')\n"
+        ),
+        "app/legacy.py": (
+            "def start(state):\n    return state\n"
+            "def old_wiring(g):\n    g.add_node('old', start)\n    g.add_edge('old', 'start')\n"
+        ),
+        "batch.py": (
+            "from langgraph.graph import StateGraph\n"
+            "b = StateGraph(dict)\nb.add_node('extract', print)\nb.add_edge('extract', 'load')\n"
+        ),
+        "scripts/demo_graph.py": (
+            "from langgraph.graph import StateGraph\n"
+            "d = StateGraph(dict)\nd.add_node('demo', print)\nd.add_edge('demo', 'end')\nd.compile()\n"
+        ),
+    }
+    for rel, text in files.items():
+        (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / rel).write_text(text)
+    _git(tmp_path, "init", "-q")
+    _git(tmp_path, "add", "-A")
+    index = build_ast_index(str(tmp_path))
+    assert locate_graph_files(index) == ["app/workflow.py", "app/wiring.py"]
+
+    result = analyze_graph_structure(str(tmp_path), index=index)
+    assert result["graph_files"] == ["app/workflow.py", "app/wiring.py"]
+    assert ("start", "prosecutor") in result["edges"]
+    assert not {("extract", "load"), ("demo", "end"), ("old", "start")} & set(result["edges"])
@@ -39,6 +39,21 @@ def test_repo_investigator_node_returns_evidences():
             assert isinstance(e, Evidence)
 
 
+
+def test_repo_investigator_analyzes_repo_path_without_url(tmp_path):
+    """A pre-cloned repo_path with an empty repo_url is analyzed (no clone), including the security scan."""
+    import subprocess
+
+    (tmp_path / "tool.py").write_text("import os\nos.system('ls')\n")
+    for args in (["init", "-q"], ["add", "-A"]):
+        subprocess.run(["git", *args], cwd=tmp_path, check=True, capture_output=True)
+    dims = [{"id": "safe_tool_engineering", "name": "Safe tools", "target_artifact": "github_repo",
+             "forensic_instruction": "Scan for os.system calls."}]
+    state: AgentState = {"repo_url": "", "repo_path": str(tmp_path), "pdf_path": "", "rubric_dimensions": dims,
+                         "evidences": {}, "opinions": [], "final_report": None}
+    (evidence,) = repo_investigator_node(state)["evidences"]["safe_tool_engineering"]
+    assert evidence.found is False and "os.system" in evidence.content and "1 modules" in evidence.content
+
 def test_doc_analyst_node_returns_evidences(tmp_path):
     """Doc analyst with a minimal PDF and one pdf_report dimension returns evidences."""
     from pypdf import PdfWriter
@@ -119,3 +134,25 @@ def test_full_detective_graph_evidences_populated(tmp_path):
         assert isinstance(ev_list, list)
         for e in ev_list:
             assert isinstance(e, Evidence)
+
+
+def test_vision_inspector_sends_only_top_ranked_images(tmp_path, monkeypatch):
+    """Every image is ranked locally; only AUDITOR_VISION_TOP_K go to analyze_diagram, once each for all dimensions."""
+    from src.nodes import detectives
+    from tests.fixtures.image_pdf import synthetic_report_images, write_image_pdf
+
+    pytest.importorskip("numpy")
+    diagram, photo, cover, banner = synthetic_report_images()
+    pdf = write_image_pdf(tmp_path / "report.pdf", [[photo, cover], [banner], [diagram]])
+    calls = []
+    monkeypatch.setattr(detectives, "analyze_diagram", lambda image, q: calls.append(image) or "Parallel fan-out.")
+    monkeypatch.setenv("AUDITOR_VISION_TOP_K", "1")
+    dims = [
+        {"id": dim_id, "target_artifact": "pdf_images", "forensic_instruction": "Analyze diagram flow."}
+        for dim_id in ("swarm_visual", "graph_diagram")
+    ]
+    out = vision_inspector_node({"pdf_path": pdf, "rubric_dimensions": dims, "evidences": {}, "opinions": []})
+    assert [(ref.page_no, ref.width) for ref in calls] == [(3, 800)]
+    for dim_id in ("swarm_visual", "graph_diagram"):
+        (evidence,) = out["evidences"][dim_id]
+        assert evidence.found and "Page 3" in evidence.content and "Parallel fan-out." in evidence.content
@@ -104,7 +104,7 @@ def test_parse_failure_does_not_append_invalid_opinion(mock_state_with_evidence)
     for o in out["opinions"]:
         assert o.judge == "Prosecutor"
         assert 1 <= o.score <= 5
-        assert "parse failure" in o.argument.lower() or "retries" in o.argument.lower()
+        assert "after 3 attempts" in o.argument
         assert o.cited_evidence == []
 
 
@@ -162,3 +162,494 @@ def test_full_judicial_graph_opinions_populated_with_mocked_llm(tmp_path, mock_s
         assert o.judge in ("Prosecutor", "Defense", "TechLead")
         assert 1 <= o.score <= 5
         assert o.criterion_id
+
+
+class _FakeAsyncJudgeLLM:
+    """Structured-output stand-in with a native ainvoke: fixed latency, records peak concurrency."""
+
+    def __init__(self, delay: float = 0.05, fail_on: str | None = None):
+        self.delay, self.fail_on = delay, fail_on
+        self.in_flight = self.peak = 0
+
+    def invoke(self, messages):
+        raise AssertionError("the concurrent path must await ainvoke")
+
+    async def ainvoke(self, messages):
+        import asyncio
+
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+        criterion = messages[1].content.split("id: ")[1].split(",")[0]
+        if criterion == self.fail_on:
+            raise ValueError("rate limited")
+        return JudicialOpinion(
+            judge="Defense", criterion_id="ignored", score=int(criterion[-1]) % 5 + 1, argument="ok", cited_evidence=[]
+        )
+
+
+def test_judge_node_judges_criteria_concurrently_in_dimension_order(monkeypatch):
+    import time
+
+    dims = [{"id": f"crit_{i}", "name": f"Criterion {i}"} for i in range(8)]
+    state = {"rubric_dimensions": dims, "evidences": {}, "rubric_path": "missing.json"}
+    fake = _FakeAsyncJudgeLLM(delay=0.05, fail_on="crit_5")
+    monkeypatch.setenv("AUDITOR_JUDGE_CONCURRENCY", "4")
+    with patch("src.nodes.judges._get_llm", return_value=fake):
+        t0 = time.perf_counter()
+        out = prosecutor_node(state)
+        elapsed = time.perf_counter() - t0
+
+    assert [o.criterion_id for o in out["opinions"]] == [d["id"] for d in dims]
+    assert all(o.judge == "Prosecutor" for o in out["opinions"])
+    assert fake.peak == 4  # bounded by the limit
+    # 8 criteria + 3 retries of crit_5 at 50 ms, 4 at a time: ~4 rounds, not 10 sequential calls
+    assert elapsed < 10 * 0.05
+    assert out["opinions"][5].score == 3 and "after 3 attempts" in out["opinions"][5].argument
+    assert [o.score for o in out["opinions"][:5]] == [1, 2, 3, 4, 5]
+
+
+def test_judge_node_sequential_when_concurrency_is_one(monkeypatch, mock_state_with_evidence):
+    state = dict(mock_state_with_evidence, rubric_dimensions=mock_state_with_evidence["rubric_dimensions"] * 3)
+    monkeypatch.setenv("AUDITOR_JUDGE_CONCURRENCY", "1")
+    with patch("src.nodes.judges._get_llm") as mock_get_llm:
+        mock_get_llm.return_value.invoke.return_value = JudicialOpinion(
+            judge="Defense", criterion_id="x", score=4, argument="ok", cited_evidence=[]
+        )
+        out = prosecutor_node(state)
+    assert [o.score for o in out["opinions"]] == [4, 4, 4]
+    assert mock_get_llm.return_value.invoke.call_count == 3
+
+
+def test_audit_graph_fans_out_one_task_per_judge_and_dimension(monkeypatch):
+    """Judging is a Send map step: 3 personas x N dimensions tasks, reduced by merge_opinions; tasks retry alone."""
+    from src import graph as graph_module
+
+    dims = [{"id": f"crit_{i}", "name": f"Criterion {i}", "target_artifact": "github_repo"} for i in range(4)]
+    evidence = Evidence(goal="g", found=True, content="c", location="l", rationale="r", confidence=0.9)
+    monkeypatch.setattr(
+        graph_module, "repo_investigator_node", lambda state: {"evidences": {d["id"]: [evidence] for d in dims}}
+    )
+    monkeypatch.setattr(graph_module, "doc_analyst_node", lambda state: {"evidences": {}})
+    monkeypatch.setattr(graph_module, "vision_inspector_node", lambda state: {"evidences": {}})
+    monkeypatch.setenv("AUDITOR_JUDGE_CONCURRENCY", "1")
+
+    calls = {"get_llm": 0}
+
+    class _LLM:
+        def invoke(self, messages):
+            criterion = messages[1].content.split("id: ")[1].split(",")[0]
+            return JudicialOpinion(judge="Defense", criterion_id="x", score=2, argument=criterion, cited_evidence=[])
+
+    def flaky_get_llm():
+        calls["get_llm"] += 1
+        if calls["get_llm"] == 1:
+            raise ConnectionError("connection reset")  # transient: only this task is retried by the graph
+        return _LLM()
+
+    state = {"repo_url": "r", "pdf_path": "", "rubric_path": "missing.json", "rubric_dimensions": dims,
+             "evidences": {}, "opinions": [], "final_report": None}
+    with patch("src.nodes.judges._get_llm", side_effect=flaky_get_llm):
+        graph = graph_module.build_audit_graph().compile()
+        updates = list(graph.stream(state, stream_mode="updates"))
+
+    judged = [u["judge_criterion"]["opinions"][0] for u in updates if "judge_criterion" in u]
+    pairs = sorted((o.judge, o.criterion_id) for o in judged)
+    assert pairs == sorted((j, d["id"]) for j in ("Prosecutor", "Defense", "TechLead") for d in dims)
+    assert all(o.argument == o.criterion_id for o in judged)
+    assert calls["get_llm"] == 3 * len(dims) + 1
+    report = next(u["chief_justice"]["final_report"] for u in updates if "chief_justice" in u)
+    assert [c.dimension_id for c in report.criteria] == [d["id"] for d in dims]
+    assert all(len(c.judge_opinions) == 3 for c in report.criteria)
+
+
+
+def test_audit_graph_retries_transient_judge_errors_then_falls_back(monkeypatch):
+    """Transient LLM errors reach the judge task's RetryPolicy; only the final attempt falls back to score 3."""
+    import threading
+    import time
+
+    from src import graph as graph_module
+    from src.nodes.judges import JUDGE_NODE_ATTEMPTS
+
+    dims = [{"id": f"crit_{i}", "name": f"Criterion {i}", "target_artifact": "github_repo"} for i in range(3)]
+    evidence = Evidence(goal="g", found=True, content="c", location="l", rationale="r", confidence=0.9)
+    monkeypatch.setattr(
+        graph_module, "repo_investigator_node", lambda state: {"evidences": {d["id"]: [evidence] for d in dims}}
+    )
+    monkeypatch.setattr(graph_module, "doc_analyst_node", lambda state: {"evidences": {}})
+    monkeypatch.setattr(graph_module, "vision_inspector_node", lambda state: {"evidences": {}})
+    monkeypatch.setenv("AUDITOR_LLM_MAX_RETRIES", "0")  # no scheduler backoff: errors go straight to the graph
+    monkeypatch.setenv("AUDITOR_JUDGE_CONCURRENCY", "2")
+
+    class Unavailable(Exception):
+        status_code = 503
+
+    lock = threading.Lock()
+    calls: dict[tuple[str, str], int] = {}
+    live = {"now": 0, "peak": 0}
+
+    class _LLM:
+        def invoke(self, messages):
+            judge = messages[0].content.split("You are the ")[1].split(" ")[0]
+            criterion = messages[1].content.split("id: ")[1].split(",")[0]
+            with lock:
+                calls[judge, criterion] = calls.get((judge, criterion), 0) + 1
+                attempt = calls[judge, criterion]
+                live["now"] += 1
+                live["peak"] = max(live["peak"], live["now"])
+            time.sleep(0.02)
+            with lock:
+                live["now"] -= 1
+            if criterion == "crit_1" and (judge == "Defense" or attempt == 1):
+                raise Unavailable("service unavailable")  # Defense: every attempt; others: first only
+            return JudicialOpinion(judge="Defense", criterion_id="x", score=5, argument="ok", cited_evidence=[])
+
+    state = {"repo_url": "r", "pdf_path": "", "rubric_path": "missing.json", "rubric_dimensions": dims,
+             "evidences": {}, "opinions": [], "final_report": None}
+    with patch("src.nodes.judges._get_llm", return_value=_LLM()):
+        graph = graph_module.build_audit_graph().compile()
+        final = graph.invoke(state, config=graph_module.audit_run_config())
+
+    scores = {(o.judge, o.criterion_id): o.score for o in final["opinions"]}
+    assert len(scores) == 9
+    assert scores.pop(("Defense", "crit_1")) == 3 and calls["Defense", "crit_1"] == JUDGE_NODE_ATTEMPTS
+    assert set(scores.values()) == {5}  # retried transient failures recovered, no fallback
+    assert calls["Prosecutor", "crit_1"] == calls["Tech", "crit_1"] == 2
+    assert live["peak"] <= 2  # AUDITOR_JUDGE_CONCURRENCY bounds the graph's judge tasks
+
+
+def test_batched_graph_recovers_from_one_transient_error(monkeypatch):
+    """Batched mode: a transient error on the first batch call is retried by the graph; the real opinions are kept."""
+    from src import graph as graph_module
+    from src.nodes.judges import BatchOpinionItem, JudicialOpinionBatch
+
+    dims = [{"id": f"crit_{i}", "name": f"Criterion {i}", "target_artifact": "github_repo"} for i in range(2)]
+    evidence = Evidence(goal="g", found=True, content="c", location="l", rationale="r", confidence=0.9)
+    monkeypatch.setattr(
+        graph_module, "repo_investigator_node", lambda state: {"evidences": {d["id"]: [evidence] for d in dims}}
+    )
+    monkeypatch.setattr(graph_module, "doc_analyst_node", lambda state: {"evidences": {}})
+    monkeypatch.setattr(graph_module, "vision_inspector_node", lambda state: {"evidences": {}})
+    monkeypatch.setenv("AUDITOR_LLM_MAX_RETRIES", "0")
+    monkeypatch.setenv("AUDITOR_JUDGE_MODE", "batched")
+
+    class Unavailable(Exception):
+        status_code = 503
+
+    calls: list[str] = []
+
+    class _BatchLLM:
+        def invoke(self, messages):
+            judge = messages[0].content.split("You are the ")[1].split(" ")[0]
+            calls.append(judge)
+            if calls.count(judge) == 1:
+                raise Unavailable("service unavailable")
+            return JudicialOpinionBatch(opinions=[
+                BatchOpinionItem(criterion_id=c, score=4, argument="real", cited_evidence=[])
+                for c in _criterion_ids(messages[1])
+            ])
+
+    state = {"repo_url": "r", "pdf_path": "", "rubric_path": "missing.json", "rubric_dimensions": dims,
+             "evidences": {}, "opinions": [], "final_report": None}
+    with patch("src.nodes.judges._get_llm", return_value=_BatchLLM()):
+        final = graph_module.build_audit_graph().compile().invoke(state, config=graph_module.audit_run_config())
+
+    assert len(final["opinions"]) == 6
+    assert {(o.score, o.argument) for o in final["opinions"]} == {(4, "real")}
+    assert sorted(calls) == sorted(["Prosecutor", "Defense", "Tech"] * 2)  # one retry per judge, no fallback
+
+
+def test_fallback_opinion_reports_actual_attempts(monkeypatch):
+    from src.nodes.judges import _invoke_judge_for_dimension
+
+    class Unavailable(Exception):
+        status_code = 503
+
+    class _LLM:
+        def invoke(self, messages):
+            raise Unavailable("down")
+
+    monkeypatch.setenv("AUDITOR_LLM_MAX_RETRIES", "0")
+    with patch("src.nodes.judges._get_llm", return_value=_LLM()):
+        first = _invoke_judge_for_dimension({"id": "c"}, [], "Defense", "You are the Defense")
+        last = _invoke_judge_for_dimension({"id": "c"}, [], "Defense", "You are the Defense", prior_attempts=2)
+    assert first.score == 3 and first.argument.startswith("No valid opinion after 1 attempt;")
+    assert last.argument.startswith("No valid opinion after 3 attempts;")
+
+
+def _criterion_ids(message) -> list[str]:
+    return [part.split(",")[0] for part in message.content.split("id: ")[1:]]
+
+
+def test_batched_judging_one_call_per_judge_with_per_criterion_fallback(monkeypatch):
+    """Batched mode: one structured call for all criteria; only missing/duplicated/empty opinions are re-judged."""
+    from src.nodes.judges import JudicialOpinionBatch
+
+    dims = [{"id": f"crit_{i}", "name": f"Criterion {i}"} for i in range(5)]
+    state = {"rubric_dimensions": dims, "evidences": {}, "rubric_path": "missing.json"}
+    calls = {"batch": [], "single": []}
+
+    def opinion(criterion, score, argument="ok"):
+        return JudicialOpinion(judge="Defense", criterion_id=criterion, score=score, argument=argument, cited_evidence=[])
+
+    class _BatchLLM:
+        def __init__(self, respond):
+            self.respond = respond
+
+        def invoke(self, messages):
+            ids = _criterion_ids(messages[1])
+            calls["batch"].append(ids)
+            return self.respond(ids)
+
+    class _SingleLLM:
+        def invoke(self, messages):
+            (criterion,) = _criterion_ids(messages[1])
+            calls["single"].append(criterion)
+            return opinion(criterion, 1, "re-judged")
+
+    def run(respond):
+        calls["batch"].clear()
+        calls["single"].clear()
+
+        def get_llm(schema=JudicialOpinion):
+            return _BatchLLM(respond) if schema is JudicialOpinionBatch else _SingleLLM()
+
+        with patch("src.nodes.judges._get_llm", side_effect=get_llm):
+            return prosecutor_node(state)["opinions"]
+
+    monkeypatch.setenv("AUDITOR_JUDGE_MODE", "batched")
+    # Complete batch: one call, no fallback, dimension order even when the response is shuffled
+    out = run(lambda ids: JudicialOpinionBatch(opinions=[opinion(c, 4) for c in reversed(ids)]))
+    assert calls["batch"] == [[d["id"] for d in dims]] and calls["single"] == []
+    assert [(o.judge, o.criterion_id, o.score) for o in out] == [("Prosecutor", d["id"], 4) for d in dims]
+
+    # Incomplete batch: crit_1 missing, crit_2 duplicated, crit_3 empty argument, plus an unknown id
+    def partial(ids):
+        return JudicialOpinionBatch(
+            opinions=[opinion("crit_0", 5), opinion("crit_2", 2), opinion("crit_2", 3), opinion("crit_3", 4, " "),
+                      opinion("crit_4", 5), opinion("bogus", 5)]
+        )
+
+    out = run(partial)
+    assert sorted(calls["single"]) == ["crit_1", "crit_2", "crit_3"]
+    assert [o.criterion_id for o in out] == [d["id"] for d in dims]
+    assert [o.score for o in out] == [5, 1, 1, 1, 5]
+
+    # Invalid items (out-of-range or malformed score) parse as a batch; only their criteria are re-judged
+    def invalid_items(ids):
+        items = [{"criterion_id": c, "score": 4, "argument": "ok", "cited_evidence": "[1]"} for c in ids]
+        items[1]["score"], items[3]["score"] = 7, "high"
+        return JudicialOpinionBatch.model_validate({"opinions": items})
+
+    out = run(invalid_items)
+    assert sorted(calls["single"]) == ["crit_1", "crit_3"]
+    assert [o.score for o in out] == [4, 1, 4, 1, 4] and out[0].cited_evidence == ["[1]"]
+
+    # Failed batch call: every criterion falls back to its own call
+    def fail(ids):
+        raise ValueError("invalid JSON")
+
+    out = run(fail)
+    assert sorted(calls["single"]) == [d["id"] for d in dims] and all(o.argument == "re-judged" for o in out)
+
+    monkeypatch.setenv("AUDITOR_JUDGE_MODE", "bogus")
+    with pytest.raises(ValueError, match="AUDITOR_JUDGE_MODE"):
+        prosecutor_node(state)
+
+
+def test_audit_graph_batched_mode_sends_one_task_per_judge(monkeypatch):
+    from src import graph as graph_module
+    from src.nodes.judges import JudicialOpinionBatch
+
+    dims = [{"id": f"crit_{i}", "name": f"Criterion {i}"} for i in range(3)]
+    state = {"rubric_dimensions": dims, "evidences": {}, "rubric_path": "missing.json"}
+    monkeypatch.setenv("AUDITOR_JUDGE_MODE", "batched")
+    sends = graph_module._fan_out_judges(state)
+    assert [(s.node, s.arg["judge"], len(s.arg["dimensions"])) for s in sends] == [
+        ("judge_batch", judge, 3) for judge in ("Prosecutor", "Defense", "TechLead")
+    ]
+    assert graph_module._fan_out_judges({"rubric_dimensions": []}) == "judge_collector"
+
+    class _BatchLLM:
+        def invoke(self, messages):
+            return JudicialOpinionBatch(
+                opinions=[
+                    JudicialOpinion(judge="Defense", criterion_id=c, score=4, argument="ok", cited_evidence=[])
+                    for c in _criterion_ids(messages[1])
+                ]
+            )
+
+    with patch("src.nodes.judges._get_llm", return_value=_BatchLLM()):
+        out = graph_module.judge_batch_node(sends[1].arg)
+    assert [(o.judge, o.criterion_id) for o in out["opinions"]] == [("Defense", d["id"]) for d in dims]
+
+
+def test_llm_response_cache_replays_judge_calls(tmp_path, monkeypatch, mock_state_with_evidence):
+    """Persistent cache: a re-audit on unchanged evidence makes no LLM call; prompt/schema/TTL changes miss."""
+    import time
+
+    from src.nodes.judges import JudicialOpinionBatch
+    from src.nodes.justice import _report_metadata, audit_report_to_markdown, llm_stats_snapshot
+    from src.state import AuditReport
+    from src.tools.llm_cache import llm_cache_key
+
+    monkeypatch.setenv("AUDITOR_LLM_CACHE", "1")
+    monkeypatch.setenv("AUDITOR_LLM_CACHE_DIR", str(tmp_path))
+    answer = JudicialOpinion(judge="Defense", criterion_id="x", score=4, argument="cached?", cited_evidence=["[1]"])
+
+    def run(state):
+        with patch("src.nodes.judges._get_llm") as mock_get_llm:
+            mock_get_llm.return_value.invoke.return_value = answer
+            out = prosecutor_node(state)
+        return out["opinions"], mock_get_llm.return_value.invoke.call_count
+
+    first, calls = run(mock_state_with_evidence)
+    assert calls == 1
+    baseline = llm_stats_snapshot()
+    again, calls = run(mock_state_with_evidence)
+    assert calls == 0 and again == first and again[0].judge == "Prosecutor" and again[0].score == 4
+    # Process-wide counters, unless the audit's baseline is subtracted
+    metadata = _report_metadata()
+    assert (metadata["llm_cache"]["hits"], metadata["llm_cache"]["misses"]) == (1, 1)
+    audit = _report_metadata({"llm_stats_baseline": baseline})["llm_cache"]
+    assert (audit["hits"], audit["misses"], audit["hit_rate"]) == (1, 0, 1.0)
+    report = AuditReport(repo_url="r", executive_summary="s", overall_score=3.0, criteria=[], remediation_plan="p",
+                         metadata=metadata)
+    assert "**LLM response cache:** 1 hits, 1 misses" in audit_report_to_markdown(report)
+
+    # Changed evidence, bypass flag and expired entries all call the model
+    changed = dict(mock_state_with_evidence, evidences={})
+    assert run(changed)[1] == 1
+    monkeypatch.setenv("AUDITOR_LLM_CACHE", "0")
+    assert run(mock_state_with_evidence)[1] == 1 and _report_metadata()["llm_cache"] == {"enabled": False}
+    monkeypatch.setenv("AUDITOR_LLM_CACHE", "1")
+    monkeypatch.setenv("AUDITOR_LLM_CACHE_TTL_HOURS", "0.000001")  # 3.6 ms
+    (dim,) = mock_state_with_evidence["rubric_dimensions"]
+    short_lived = dict(mock_state_with_evidence, rubric_dimensions=[dict(dim, name="Short-lived")])
+    assert run(short_lived)[1] == 1
+    time.sleep(0.01)
+    assert run(short_lived)[1] == 1
+
+    # Fallback opinions are never cached
+    monkeypatch.delenv("AUDITOR_LLM_CACHE_TTL_HOURS")
+    failing = dict(mock_state_with_evidence, rubric_dimensions=[dict(dim, name="Failing")])
+    with patch("src.nodes.judges._get_llm") as mock_get_llm:
+        mock_get_llm.return_value.invoke.side_effect = ValueError("Parse error")
+        prosecutor_node(failing)
+    assert run(failing)[1] == 1
+
+    # Key covers model, temperature, messages and output schema
+    msgs = ["system", "user"]
+    base = llm_cache_key("gpt-4o-mini", 0.1, msgs, JudicialOpinion)
+    assert base == llm_cache_key("gpt-4o-mini", 0.1, list(msgs), JudicialOpinion)
+    assert len({
+        base,
+        llm_cache_key("gpt-4o", 0.1, msgs, JudicialOpinion),
+        llm_cache_key("gpt-4o-mini", 0.2, msgs, JudicialOpinion),
+        llm_cache_key("gpt-4o-mini", 0.1, ["system", "user!"], JudicialOpinion),
+        llm_cache_key("gpt-4o-mini", 0.1, msgs, JudicialOpinionBatch),
+        llm_cache_key("gpt-4o-mini", 0.1, msgs),
+    }) == 6
+
+
+def test_llm_scheduler_retries_rate_limits_from_local_server(monkeypatch):
+    """Judge calls go through the LLM scheduler: 429/503 replies are retried after Retry-After, not immediately."""
+    pytest.importorskip("langchain_openai")
+    import json
+    import time
+
+    from src.nodes.judges import _invoke_judge_for_dimension
+    from src.tools import llm_scheduler
+    from tests.fixtures.fake_llm_server import FakeLLMServer
+
+    opinion = {"judge": "Defense", "criterion_id": "d1", "score": 4, "argument": "served", "cited_evidence": ["[1]"]}
+    script = [(429, {"Retry-After": "0.2"}), (503, {"retry-after-ms": "100"})]
+    with FakeLLMServer(json.dumps(opinion), script) as server:
+        monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+        monkeypatch.setenv("OPENAI_BASE_URL", server.base_url)
+        monkeypatch.setenv("OPENAI_API_BASE", server.base_url)
+        scheduler = llm_scheduler.LLMScheduler(base_delay=0.05)
+        monkeypatch.setattr(llm_scheduler, "_default_scheduler", scheduler)
+        got = _invoke_judge_for_dimension({"id": "d1", "name": "D1"}, [], "TechLead", _TECH_LEAD_SYSTEM)
+        assert (got.judge, got.criterion_id, got.score, got.argument) == ("TechLead", "d1", 4, "served")
+        (t0, s0), (t1, s1), (t2, s2) = server.requests
+        assert (s0, s1, s2) == (429, 503, 200)
+        assert t1 - t0 >= 0.2 and t2 - t1 >= 0.1
+        assert scheduler.stats()["retries"] == 2 and scheduler.stats()["rate_limited"] == 1
+
+        # Exhausted retries fall back once; the judge does not re-ask on top of the scheduler
+        server.script = [(429, {"Retry-After": "0"})] * 3
+        monkeypatch.setattr(llm_scheduler, "_default_scheduler", llm_scheduler.LLMScheduler(max_retries=1))
+        monkeypatch.setenv("AUDITOR_LLM_MAX_RETRIES", "1")
+        before = len(server.requests)
+        got = _invoke_judge_for_dimension({"id": "d1", "name": "D1"}, [], "TechLead", _TECH_LEAD_SYSTEM)
+        assert got.score == 3 and len(server.requests) - before == 2
+
+        # Non-retryable client errors are not retried
+        server.script = [(400, {})]
+        before = len(server.requests)
+        _invoke_judge_for_dimension({"id": "d2", "name": "D2"}, [], "TechLead", _TECH_LEAD_SYSTEM)
+        assert [s for _, s in server.requests[before:]] == [400, 200]  # second ask: judge's parse-failure retry
+
+
+def test_llm_scheduler_admits_by_priority_within_rate_budget():
+    """Token buckets gate admission; queued requests are admitted highest priority first, FIFO within one."""
+    import threading
+    import time
+
+    from src.tools.llm_scheduler import PRIORITY_HIGH, PRIORITY_LOW, LLMScheduler, retry_after_seconds
+
+    now = [0.0]
+    scheduler = LLMScheduler(rpm=600, tpm=0, burst_seconds=0.1, clock=lambda: now[0])  # one request per 0.1 s
+    scheduler.acquire()
+    admitted: list[str] = []
+    requests = [("low-a", PRIORITY_LOW), ("low-b", PRIORITY_LOW), ("high", PRIORITY_HIGH)]
+    for queued, (name, priority) in enumerate(requests):
+        threading.Thread(target=lambda n=name, p=priority: (scheduler.acquire(priority=p), admitted.append(n))).start()
+        while scheduler.pending() <= queued:
+            time.sleep(0.005)
+    time.sleep(0.2)
+    assert admitted == []  # bucket empty until the clock advances
+    for expected in range(1, 4):
+        now[0] += 0.1
+        while len(admitted) < expected:
+            time.sleep(0.005)
+        time.sleep(0.05)
+        assert len(admitted) == expected  # one per refill
+    assert admitted == ["high", "low-a", "low-b"]
+
+    class Limited(Exception):
+        def __init__(self, headers):
+            self.status_code, self.headers = 429, headers
+
+    assert retry_after_seconds(Limited({"retry-after": "1.5"})) == 1.5
+    assert retry_after_seconds(Limited({"retry-after-ms": "250"})) == 0.25
+    assert retry_after_seconds(Limited({"retry-after": "Thu, 01 Jan 1970 00:00:00 GMT"})) == 0.0
+    assert retry_after_seconds(Limited({})) is None
+
+
+def test_llm_scheduler_cancelled_waiter_does_not_block_queue():
+    """A waiter cancelled before admission leaves the queue, so later requests are still admitted."""
+    import asyncio
+
+    from src.tools.llm_scheduler import LLMScheduler
+
+    now = [0.0]
+    scheduler = LLMScheduler(rpm=600, tpm=0, burst_seconds=0.1, clock=lambda: now[0])
+    scheduler.acquire()  # bucket now empty until the clock advances
+
+    async def scenario():
+        waiter = asyncio.create_task(scheduler.aacquire())
+        await asyncio.sleep(0.05)
+        assert scheduler.pending() == 1
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert scheduler.pending() == 0
+        now[0] += 0.1
+        await asyncio.wait_for(scheduler.aacquire(), timeout=2)
+
+    asyncio.run(scenario())
+    assert scheduler.pending() == 0 and scheduler.requests == 2
@@ -57,6 +57,24 @@ def test_chief_justice_node_returns_final_report(mock_state_with_opinions):
     assert len(c.judge_opinions) == 3
 
 
+def test_report_metadata_counts_only_this_audit(mock_state_with_opinions):
+    """LLM counters are process-wide; the report subtracts the snapshot create_initial_state took."""
+    from src.tools.llm_scheduler import default_llm_scheduler
+
+    scheduler = default_llm_scheduler()
+    scheduler.requests, scheduler.retries = 7, 3  # an earlier audit in this process
+    state = create_initial_state(repo_url="https://github.com/example/repo")
+    scheduler.requests += 2
+    scheduler.retries += 1
+    out = chief_justice_node({**mock_state_with_opinions, "llm_stats_baseline": state["llm_stats_baseline"]})
+    stats = out["final_report"].metadata["llm_scheduler"]
+    assert (stats["requests"], stats["retries"], stats["rate_limited"]) == (2, 1, 0)
+    # A scheduler rebuilt mid-audit (counters reset) counts from zero instead of going negative
+    scheduler.requests = 1
+    out = chief_justice_node({**mock_state_with_opinions, "llm_stats_baseline": state["llm_stats_baseline"]})
+    assert out["final_report"].metadata["llm_scheduler"]["requests"] == 1
+
+
 def test_chief_justice_applies_security_cap():
     """When evidence suggests security issue, final score capped at 3."""
     state = {
@@ -85,6 +85,28 @@ def test_evidence_aggregator_injects_placeholder_for_missing():
     assert "placeholder" in out["evidences"]["dim_b"][0].rationale.lower() or "no evidence" in out["evidences"]["dim_b"][0].rationale.lower()
 
 
+def test_evidence_aggregator_reuses_doc_analyst_segments(tmp_path, monkeypatch):
+    """report_accuracy cross-reference reads DocAnalyst's structure chunks instead of re-chunking the PDF."""
+    from src.nodes.detectives import doc_analyst_node
+    from src.tools import doc_tools
+    from tests.fixtures.text_pdf import write_text_pdf
+
+    pdf = write_text_pdf(tmp_path / "report.pdf", ["The graph lives in src/graph.py and src/missing.py."])
+    monkeypatch.setenv("AUDITOR_PDF_TEXT_STORE", "0")
+    modes = []
+    chunk = doc_tools._segments_from_pages
+    monkeypatch.setattr(doc_tools, "_segments_from_pages", lambda pages, by: modes.append(by) or chunk(pages, by))
+    dims = [
+        {"id": "theoretical_depth", "target_artifact": "pdf_report", "forensic_instruction": "Check concepts."},
+        {"id": "report_accuracy", "target_artifact": "pdf_report", "forensic_instruction": "Cross-reference paths."},
+    ]
+    state = {"pdf_path": pdf, "rubric_dimensions": dims, "evidences": {}, "repo_file_list": ["src/graph.py"]}
+    state["evidences"] = doc_analyst_node(state)["evidences"]
+    (evidence,) = evidence_aggregator_node(state)["evidences"]["report_accuracy"]
+    assert modes == ["structure"]
+    assert "src/graph.py" in evidence.content and "src/missing.py" in evidence.content
+
+
 def test_default_output_path():
     """Default output path uses repo slug."""
     p = _default_output_path("https://github.com/octocat/Hello-World")
@@ -108,3 +130,34 @@ def test_conditional_edge_degraded_path_when_critical_failure():
     report = final["final_report"]
     summary = report.executive_summary if hasattr(report, "executive_summary") else str(report)
     assert "degraded" in summary.lower() or "re-run" in summary.lower() or "unavailable" in summary.lower()
+
+
+def test_run_audit_worktree_released_after_graph(tmp_path):
+    """With AUDITOR_REPO_WORKTREES=1 the graph gets a per-audit worktree via repo_path, removed afterwards."""
+    import subprocess
+
+    from src.state import AuditReport
+
+    origin = tmp_path / "origin"
+    origin.mkdir()
+    git = ["git", "-c", "user.name=t", "-c", "user.email=t@example.com"]
+    subprocess.run([*git, "init", "-q"], cwd=origin, check=True)
+    (origin / "README.md").write_text("hello\n")
+    subprocess.run([*git, "add", "-A"], cwd=origin, check=True)
+    subprocess.run([*git, "commit", "-q", "-m", "init"], cwd=origin, check=True)
+
+    env = {"AUDITOR_REPO_WORKTREES": "1", "AUDITOR_REPO_MIRROR_DIR": str(tmp_path / "mirrors")}
+    with patch.dict(os.environ, env), patch("src.run._require_llm_key"):
+        with patch("src.run.build_audit_graph") as mock_build:
+            mock_graph = mock_build.return_value.compile.return_value
+            mock_graph.invoke.return_value = {"final_report": AuditReport(
+                repo_url=origin.as_uri(),
+                executive_summary="Test.",
+                overall_score=3.0,
+                criteria=[],
+                remediation_plan="",
+            )}
+            run_audit(origin.as_uri(), "", output_path=str(tmp_path / "report.md"))
+            state = mock_graph.invoke.call_args[0][0]
+    assert state.get("repo_path")
+    assert not Path(state["repo_path"]).exists()